@@ -1,2 +1,2 @@
 #!/usr/bin/env bash
-exec poetry run python -m thenewboston.manage order_processing_engine
+exec poetry run python -m thenewboston.manage order_processing_engine "$@"
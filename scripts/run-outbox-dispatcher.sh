@@ -0,0 +1,2 @@
+#!/usr/bin/env bash
+exec poetry run python -m thenewboston.manage dispatch_outbox_events "$@"
@@ -1,12 +1,18 @@
 import json
+import logging
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 
-import requests
+from django.conf import settings
 from nacl.encoding import HexEncoder
 from nacl.signing import SigningKey, VerifyKey
 
 from thenewboston.general.constants import TRANSACTION_FEE
 
+from .client import request
+
+logger = logging.getLogger(__name__)
+
 
 def encode_verify_key(*, verify_key):
     """Return the hexadecimal representation of the binary account number data"""
@@ -17,7 +23,7 @@ def encode_verify_key(*, verify_key):
 
 
 def fetch_balance(*, account_number, domain):
-    response = requests.get(f'https://{domain}/api/accounts/{account_number}')
+    response = request('GET', domain=domain, path=f'accounts/{account_number}')
 
     if response.status_code == 200:
         data = response.json()
@@ -30,6 +36,29 @@ def fetch_balance(*, account_number, domain):
     return balance
 
 
+def fetch_balances(*, account_numbers, domain) -> dict[str, int]:
+    """
+    Fetch balances of many accounts concurrently (over the connection pool of the domain). Return
+    `{account_number: balance}`, accounts the balance could not be fetched for are logged and omitted.
+    """
+    account_numbers = list(account_numbers)
+    if not account_numbers:
+        return {}
+
+    def fetch(account_number):
+        try:
+            return fetch_balance(account_number=account_number, domain=domain)
+        except Exception:
+            logger.warning('Could not fetch balance of %s at %s', account_number, domain, exc_info=True)
+            return None
+
+    max_workers = min(len(account_numbers), settings.EXTERNAL_NETWORK_POOL_SIZE)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='fetch_balances') as executor:
+        balances = dict(zip(account_numbers, executor.map(fetch, account_numbers)))
+
+    return {account_number: balance for account_number, balance in balances.items() if balance is not None}
+
+
 def generate_signature(*, message, signing_key):
     """Sign message using signing key and return signature"""
     return signing_key.sign(message).signature.hex()
@@ -43,9 +72,15 @@ def get_verify_key(*, signing_key):
     return signing_key.verify_key
 
 
-def post(*, url, body):
-    """Send a POST request and return response as Python object"""
-    response = requests.post(url, json=body)
+def post(*, domain, path, body):
+    """
+    Send a POST request and return response as Python object. Server errors are raised as `requests.HTTPError`,
+    because the request may have been processed anyway (unlike client errors, which reject it)
+    """
+    response = request('POST', domain=domain, path=path, json=body)
+    if response.status_code >= 500:
+        response.raise_for_status()
+
     return response.json()
 
 
@@ -54,13 +89,13 @@ def sort_and_encode(dictionary):
     return json.dumps(dictionary, separators=(',', ':'), sort_keys=True).encode('utf-8')
 
 
-def wire_funds(*, amount, domain, recipient_account_number_str, sender_signing_key_str):
+def wire_funds(*, amount, domain, recipient_account_number_str, sender_signing_key_str, block_id=None):
     signing_key = SigningKey(sender_signing_key_str.encode('utf-8'), encoder=HexEncoder)
     account_number = get_verify_key(signing_key=signing_key)
 
     signed_data = {
         'amount': amount,
-        'id': str(uuid.uuid4()),
+        'id': str(block_id or uuid.uuid4()),
         'payload': {},
         'recipient': recipient_account_number_str,
         'sender': encode_verify_key(verify_key=account_number),
@@ -70,6 +105,4 @@ def wire_funds(*, amount, domain, recipient_account_number_str, sender_signing_k
     signature = generate_signature(message=sort_and_encode(signed_data), signing_key=signing_key)
     request_data = {**signed_data, 'signature': signature}
 
-    server_address = f'https://{domain}/api'
-    url = f'{server_address}/blocks'
-    return post(url=url, body=request_data)
+    return post(domain=domain, path='blocks', body=request_data)
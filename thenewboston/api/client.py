@@ -0,0 +1,63 @@
+"""
+HTTP client for external currency networks. Every domain gets its own session with a connection pool, so
+connections are reused across requests (and threads), requests have timeouts and idempotent ones are retried
+with exponential backoff.
+"""
+
+import threading
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_sessions: dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def make_session() -> requests.Session:
+    retry = Retry(
+        total=settings.EXTERNAL_NETWORK_RETRIES,
+        backoff_factor=settings.EXTERNAL_NETWORK_RETRY_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUSES,
+        # POST (wiring funds) is retried on connection errors only, because the request has not been sent then
+        allowed_methods=frozenset({'GET'}),
+        raise_on_status=False,  # the last response is returned, so the caller handles the status
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings.EXTERNAL_NETWORK_POOL_SIZE, max_retries=retry)
+
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_session(domain) -> requests.Session:
+    if (session := _sessions.get(domain)) is None:
+        with _sessions_lock:
+            if (session := _sessions.get(domain)) is None:
+                session = _sessions[domain] = make_session()
+
+    return session
+
+
+def close_sessions():
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+
+        _sessions.clear()
+
+
+def get_url(domain, path):
+    return f'{settings.EXTERNAL_NETWORK_SCHEME}://{domain}/api/{path}'
+
+
+def request(method, *, domain, path, **kwargs) -> requests.Response:
+    kwargs.setdefault(
+        'timeout',
+        (settings.EXTERNAL_NETWORK_CONNECT_TIMEOUT_SECONDS, settings.EXTERNAL_NETWORK_READ_TIMEOUT_SECONDS),
+    )
+    return get_session(domain).request(method, get_url(domain, path), **kwargs)
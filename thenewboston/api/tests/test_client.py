@@ -0,0 +1,72 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from django.test import override_settings
+
+from thenewboston.api.accounts import fetch_balance, fetch_balances
+from thenewboston.api.client import close_sessions
+
+BALANCES = {'a' * 64: 100, 'b' * 64: 200}
+FLAKY_ACCOUNT_NUMBER = 'c' * 64
+
+
+class StubNetworkHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, so connections are pooled
+    flaky_requests_count = 0
+
+    def do_GET(self):
+        cls = type(self)
+        account_number = self.path.removeprefix('/api/accounts/')
+        if account_number == FLAKY_ACCOUNT_NUMBER:
+            cls.flaky_requests_count += 1
+            if cls.flaky_requests_count == 1:
+                return self.send_json(503, {})
+
+            return self.send_json(200, {'balance': 300})
+
+        if (balance := BALANCES.get(account_number)) is None:
+            return self.send_json(404, {})
+
+        self.send_json(200, {'balance': balance})
+
+    def send_json(self, status, data):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_network_domain():
+    StubNetworkHandler.flaky_requests_count = 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubNetworkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with override_settings(EXTERNAL_NETWORK_SCHEME='http', EXTERNAL_NETWORK_RETRY_BACKOFF_FACTOR=0):
+            yield f'127.0.0.1:{server.server_address[1]}'
+    finally:
+        close_sessions()
+        server.shutdown()
+        server.server_close()
+
+
+def test_fetch_balance(stub_network_domain):
+    assert fetch_balance(account_number='a' * 64, domain=stub_network_domain) == 100
+    assert fetch_balance(account_number='d' * 64, domain=stub_network_domain) == 0  # not found
+    # Server errors are retried
+    assert fetch_balance(account_number=FLAKY_ACCOUNT_NUMBER, domain=stub_network_domain) == 300
+    assert StubNetworkHandler.flaky_requests_count == 2
+
+
+def test_fetch_balances(stub_network_domain):
+    account_numbers = [*BALANCES, 'd' * 64]
+    assert fetch_balances(account_numbers=account_numbers, domain=stub_network_domain) == {**BALANCES, 'd' * 64: 0}
+    assert fetch_balances(account_numbers=[], domain=stub_network_domain) == {}
@@ -2,6 +2,8 @@ from asgiref.sync import async_to_sync
 from channels.generic.websocket import JsonWebsocketConsumer
 from channels.layers import get_channel_layer
 
+from thenewboston.general.utils.stream_buffer import send_group_event
+
 
 class ConnectFiveChatConsumer(JsonWebsocketConsumer):
     def connect(self):
@@ -19,9 +21,8 @@ class ConnectFiveChatConsumer(JsonWebsocketConsumer):
 
     @classmethod
     def stream_message(cls, *, message_type, message_data, match_id):
-        channel_layer = get_channel_layer()
         event = {'payload': message_data, 'type': message_type.value}
-        async_to_sync(channel_layer.group_send)(cls.get_group_name(match_id), event)
+        send_group_event(cls.get_group_name(match_id), event)
 
     def create_connect_five_chat_message(self, event):
         self.send_json({'chat_message': event['payload'], 'type': event['type']})
@@ -2,6 +2,8 @@ from asgiref.sync import async_to_sync
 from channels.generic.websocket import JsonWebsocketConsumer
 from channels.layers import get_channel_layer
 
+from thenewboston.general.utils.stream_buffer import send_group_event
+
 
 class ConnectFiveConsumer(JsonWebsocketConsumer):
     def connect(self):
@@ -40,10 +42,9 @@ class ConnectFiveConsumer(JsonWebsocketConsumer):
 
     @classmethod
     def stream_to_users(cls, *, message_type, payload, user_ids):
-        channel_layer = get_channel_layer()
         event = {'payload': payload, 'type': message_type.value}
         for user_id in set(user_ids):
-            async_to_sync(channel_layer.group_send)(cls.get_group_name(user_id), event)
+            send_group_event(cls.get_group_name(user_id), event)
 
     def update_connect_five_challenge(self, event):
         """
@@ -72,9 +73,8 @@ class ConnectFivePublicConsumer(JsonWebsocketConsumer):
 
     @classmethod
     def stream_match(cls, *, message_type, match_data):
-        channel_layer = get_channel_layer()
         event = {'payload': match_data, 'type': message_type.value}
-        async_to_sync(channel_layer.group_send)(cls.group_name, event)
+        send_group_event(cls.group_name, event)
 
     def update_connect_five_match(self, event):
         self.send_json({'match': event['payload'], 'type': event['type']})
@@ -1,8 +1,7 @@
-from django.conf import settings
 from rest_framework.exceptions import ValidationError
 
-from thenewboston.currencies.models import Currency
-from thenewboston.wallets.models import Wallet
+from thenewboston.currencies.currency_cache import currency_cache
+from thenewboston.wallets.models import Wallet, WalletLedgerReason
 
 from ..enums import EscrowStatus, LedgerAction, LedgerDirection
 from ..models import ConnectFiveEscrow, ConnectFiveLedgerEntry
@@ -13,11 +12,12 @@ class EscrowAlreadySettledError(ValidationError):
 
 
 def get_default_currency():
-    return Currency.objects.get(ticker=settings.DEFAULT_CURRENCY_TICKER)
+    return currency_cache.get_default()
 
 
-def get_wallet_for_update(*, user, currency):
-    wallet = Wallet.objects.select_for_update().filter(owner=user, currency=currency).first()
+def get_wallet(*, user, currency):
+    # The wallet is not selected for update, because the balance is changed atomically (see `debit_wallet()`)
+    wallet = Wallet.objects.filter(owner=user, currency=currency).first()
     if not wallet:
         raise ValidationError({'detail': 'Wallet not found for default currency.'})
     return wallet
@@ -33,7 +33,7 @@ def create_escrow(*, challenge):
 
 
 def debit_wallet(*, wallet, escrow, amount, action):
-    wallet.change_balance(-amount, should_stream=True)
+    wallet.change_balance(-amount, should_stream=True, reason=WalletLedgerReason.ESCROW, reference=escrow)
     ConnectFiveLedgerEntry.objects.create(
         escrow=escrow,
         wallet=wallet,
@@ -44,7 +44,7 @@ def debit_wallet(*, wallet, escrow, amount, action):
 
 
 def credit_wallet(*, wallet, escrow, amount, action):
-    wallet.change_balance(amount, should_stream=True)
+    wallet.change_balance(amount, should_stream=True, reason=WalletLedgerReason.ESCROW, reference=escrow)
     ConnectFiveLedgerEntry.objects.create(
         escrow=escrow,
         wallet=wallet,
@@ -3,13 +3,13 @@ from django.utils import timezone
 from ..enums import MatchEventType, MatchStatus
 from ..models import ConnectFiveEscrow, ConnectFiveMatchEvent
 from ..services.elo import apply_match_result
-from ..services.escrow import get_wallet_for_update, settle_win
+from ..services.escrow import get_wallet, settle_win
 
 
 def finish_match_connect5(*, match, winner):
     now = timezone.now()
     escrow = ConnectFiveEscrow.objects.select_for_update().get(challenge=match.challenge)
-    winner_wallet = get_wallet_for_update(user=winner, currency=match.challenge.currency)
+    winner_wallet = get_wallet(user=winner, currency=match.challenge.currency)
     settle_win(escrow=escrow, wallet=winner_wallet, amount=escrow.total)
     rating_snapshot = _apply_match_elo(match=match, winner=winner)
     match.status = MatchStatus.FINISHED_CONNECT5
@@ -50,7 +50,7 @@ def finish_match_connect5(*, match, winner):
 def finish_match_timeout(*, match, winner):
     now = timezone.now()
     escrow = ConnectFiveEscrow.objects.select_for_update().get(challenge=match.challenge)
-    winner_wallet = get_wallet_for_update(user=winner, currency=match.challenge.currency)
+    winner_wallet = get_wallet(user=winner, currency=match.challenge.currency)
     settle_win(escrow=escrow, wallet=winner_wallet, amount=escrow.total)
     rating_snapshot = _apply_match_elo(match=match, winner=winner)
     match.status = MatchStatus.FINISHED_TIMEOUT
@@ -91,7 +91,7 @@ def finish_match_timeout(*, match, winner):
 def finish_match_resign(*, match, resigning_player, winner):
     now = timezone.now()
     escrow = ConnectFiveEscrow.objects.select_for_update().get(challenge=match.challenge)
-    winner_wallet = get_wallet_for_update(user=winner, currency=match.challenge.currency)
+    winner_wallet = get_wallet(user=winner, currency=match.challenge.currency)
     settle_win(escrow=escrow, wallet=winner_wallet, amount=escrow.total)
     rating_snapshot = _apply_match_elo(match=match, winner=winner)
     match.status = MatchStatus.FINISHED_RESIGN
@@ -132,7 +132,7 @@ def finish_match_resign(*, match, resigning_player, winner):
 def finish_match_full_board(*, match, winner):
     now = timezone.now()
     escrow = ConnectFiveEscrow.objects.select_for_update().get(challenge=match.challenge)
-    winner_wallet = get_wallet_for_update(user=winner, currency=match.challenge.currency)
+    winner_wallet = get_wallet(user=winner, currency=match.challenge.currency)
     settle_win(escrow=escrow, wallet=winner_wallet, amount=escrow.total)
     rating_snapshot = _apply_match_elo(match=match, winner=winner)
     match.status = MatchStatus.FINISHED_FULL_BOARD
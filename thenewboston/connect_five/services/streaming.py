@@ -1,4 +1,5 @@
 from thenewboston.general.enums import MessageType
+from thenewboston.general.utils.stream_buffer import stream_on_commit
 
 from ..consumers import ConnectFiveChatConsumer, ConnectFiveConsumer, ConnectFivePublicConsumer
 from ..serializers import (
@@ -12,10 +13,11 @@ def stream_challenge_update(*, challenge, request=None, challenge_data=None):
     if challenge_data is None:
         challenge_data = ConnectFiveChallengeReadSerializer(challenge, context={'request': request}).data
 
-    ConnectFiveConsumer.stream_challenge(
-        message_type=MessageType.UPDATE_CONNECT_FIVE_CHALLENGE,
-        challenge_data=challenge_data,
-        user_ids=[challenge.challenger_id, challenge.opponent_id],
+    stream_on_commit(
+        lambda user_ids=(challenge.challenger_id, challenge.opponent_id): ConnectFiveConsumer.stream_challenge(
+            message_type=MessageType.UPDATE_CONNECT_FIVE_CHALLENGE, challenge_data=challenge_data, user_ids=user_ids
+        ),
+        dedupe_key=('connect_five_challenge', challenge.pk),
     )
 
     return challenge_data
@@ -25,15 +27,12 @@ def stream_match_update(*, match, request=None, match_data=None):
     if match_data is None:
         match_data = ConnectFiveMatchReadSerializer(match, context={'request': request}).data
 
-    ConnectFiveConsumer.stream_match(
-        message_type=MessageType.UPDATE_CONNECT_FIVE_MATCH,
-        match_data=match_data,
-        user_ids=[match.player_a_id, match.player_b_id],
-    )
-    ConnectFivePublicConsumer.stream_match(
-        message_type=MessageType.UPDATE_CONNECT_FIVE_MATCH,
-        match_data=match_data,
-    )
+    def stream(user_ids=(match.player_a_id, match.player_b_id)):
+        message_type = MessageType.UPDATE_CONNECT_FIVE_MATCH
+        ConnectFiveConsumer.stream_match(message_type=message_type, match_data=match_data, user_ids=user_ids)
+        ConnectFivePublicConsumer.stream_match(message_type=message_type, match_data=match_data)
+
+    stream_on_commit(stream, dedupe_key=('connect_five_match', match.pk))
 
     return match_data
 
@@ -42,10 +41,10 @@ def stream_chat_message(*, message, request=None, message_data=None):
     if message_data is None:
         message_data = ConnectFiveChatMessageReadSerializer(message, context={'request': request}).data
 
-    ConnectFiveChatConsumer.stream_message(
-        message_type=MessageType.CREATE_CONNECT_FIVE_CHAT_MESSAGE,
-        message_data=message_data,
-        match_id=message.match_id,
+    stream_on_commit(
+        lambda match_id=message.match_id: ConnectFiveChatConsumer.stream_message(
+            message_type=MessageType.CREATE_CONNECT_FIVE_CHAT_MESSAGE, message_data=message_data, match_id=match_id
+        )
     )
 
     return message_data
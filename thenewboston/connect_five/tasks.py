@@ -6,7 +6,7 @@ from thenewboston.project.celery import app
 from .enums import ChallengeStatus, MatchStatus
 from .models import ConnectFiveChallenge, ConnectFiveEloSnapshot, ConnectFiveEscrow, ConnectFiveMatch, ConnectFiveStats
 from .services.clocks import apply_elapsed_time
-from .services.escrow import get_wallet_for_update, refund_challenge
+from .services.escrow import get_wallet, refund_challenge
 from .services.match import finish_match_timeout
 from .services.streaming import stream_challenge_update, stream_match_update
 
@@ -38,7 +38,7 @@ def expire_connect_five_challenges_task():
             challenge.status = ChallengeStatus.EXPIRED
             challenge.save(update_fields=['status', 'modified_date'])
 
-            wallet = get_wallet_for_update(user=challenge.challenger, currency=challenge.currency)
+            wallet = get_wallet(user=challenge.challenger, currency=challenge.currency)
             refund_challenge(escrow=escrow, wallet=wallet)
             stream_challenge_update(challenge=challenge)
 
@@ -32,7 +32,7 @@ from ..services.escrow import (
     accept_stake,
     create_escrow,
     get_default_currency,
-    get_wallet_for_update,
+    get_wallet,
     lock_stake,
     refund_challenge,
 )
@@ -87,7 +87,7 @@ class ConnectFiveChallengeViewSet(CreateModelMixin, ListModelMixin, RetrieveMode
                 raise ConflictError({'detail': 'Invalid time limit.'})
 
             currency = get_default_currency()
-            wallet = get_wallet_for_update(user=request.user, currency=currency)
+            wallet = get_wallet(user=request.user, currency=currency)
 
             challenge = ConnectFiveChallenge.objects.create(
                 challenger=request.user,
@@ -145,7 +145,7 @@ class ConnectFiveChallengeViewSet(CreateModelMixin, ListModelMixin, RetrieveMode
                 raise PermissionDenied({'detail': 'Only the opponent can accept this challenge.'})
 
             if challenge.rematch_for_id is None and timezone.now() >= challenge.expires_at:
-                wallet = get_wallet_for_update(user=challenge.challenger, currency=challenge.currency)
+                wallet = get_wallet(user=challenge.challenger, currency=challenge.currency)
                 challenge.status = ChallengeStatus.EXPIRED
                 challenge.save(update_fields=['status', 'modified_date'])
                 refund_challenge(escrow=escrow, wallet=wallet)
@@ -153,7 +153,7 @@ class ConnectFiveChallengeViewSet(CreateModelMixin, ListModelMixin, RetrieveMode
                 raise GoneError({'detail': 'Challenge has expired.'})
 
             try:
-                wallet = get_wallet_for_update(user=request.user, currency=challenge.currency)
+                wallet = get_wallet(user=request.user, currency=challenge.currency)
                 accept_stake(
                     escrow=escrow,
                     wallet=wallet,
@@ -222,7 +222,7 @@ class ConnectFiveChallengeViewSet(CreateModelMixin, ListModelMixin, RetrieveMode
             challenge.status = ChallengeStatus.CANCELLED
             challenge.save(update_fields=['status', 'modified_date'])
 
-            wallet = get_wallet_for_update(user=challenge.challenger, currency=challenge.currency)
+            wallet = get_wallet(user=challenge.challenger, currency=challenge.currency)
             refund_challenge(escrow=escrow, wallet=wallet)
 
             response_data = ConnectFiveChallengeReadSerializer(challenge, context={'request': request}).data
@@ -251,7 +251,7 @@ class ConnectFiveChallengeViewSet(CreateModelMixin, ListModelMixin, RetrieveMode
             challenge.status = ChallengeStatus.DECLINED
             challenge.save(update_fields=['status', 'modified_date'])
 
-            wallet = get_wallet_for_update(user=challenge.challenger, currency=challenge.currency)
+            wallet = get_wallet(user=challenge.challenger, currency=challenge.currency)
             refund_challenge(escrow=escrow, wallet=wallet)
 
             response_data = ConnectFiveChallengeReadSerializer(challenge, context={'request': request}).data
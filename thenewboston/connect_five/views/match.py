@@ -36,7 +36,7 @@ from ..serializers import (
     ConnectFivePurchaseSerializer,
 )
 from ..services.clocks import apply_elapsed_time, switch_turn, touch_turn
-from ..services.escrow import create_escrow, get_wallet_for_update, lock_stake, purchase_special
+from ..services.escrow import create_escrow, get_wallet, lock_stake, purchase_special
 from ..services.match import finish_match_connect5, finish_match_full_board, finish_match_resign, finish_match_timeout
 from ..services.rules import apply_move, check_win, is_board_full
 from ..services.streaming import stream_challenge_update, stream_chat_message, stream_match_update
@@ -213,7 +213,7 @@ class ConnectFiveMatchViewSet(ListModelMixin, RetrieveModelMixin, CustomGenericV
             if match_player.spent_total + cost > match.max_spend_amount:
                 raise ValidationError({'detail': 'Max spend exceeded.'})
 
-            wallet = get_wallet_for_update(user=request.user, currency=match.challenge.currency)
+            wallet = get_wallet(user=request.user, currency=match.challenge.currency)
             purchase_special(
                 escrow=escrow,
                 wallet=wallet,
@@ -328,8 +328,8 @@ class ConnectFiveMatchViewSet(ListModelMixin, RetrieveModelMixin, CustomGenericV
             stake_amount = match.challenge.stake_amount
 
             try:
-                challenger_wallet = get_wallet_for_update(user=request.user, currency=currency)
-                opponent_wallet = get_wallet_for_update(user=opponent, currency=currency)
+                challenger_wallet = get_wallet(user=request.user, currency=currency)
+                opponent_wallet = get_wallet(user=opponent, currency=currency)
             except ValidationError as error:
                 raise ConflictError({'detail': 'Insufficient funds for rematch.'}) from error
 
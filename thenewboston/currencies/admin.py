@@ -1,7 +1,8 @@
 from django.contrib import admin
 
-from .models import Currency, Mint, Whitepaper
+from .models import Currency, CurrencyHolder, Mint, Whitepaper
 
 admin.site.register(Currency)
+admin.site.register(CurrencyHolder)
 admin.site.register(Mint)
 admin.site.register(Whitepaper)
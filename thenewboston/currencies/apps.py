@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class CurrenciesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'thenewboston.currencies'
+
+    def ready(self):
+        from .currency_cache import connect_signals
+
+        connect_signals()
@@ -0,0 +1,95 @@
+"""
+Process-local cache of currencies (reference data): the default currency, currencies by id and by ticker.
+
+Currencies are rarely changed, so the cache is invalidated by `post_save` / `post_delete` signals in the process that
+made the change (right away and once again on commit), while other processes pick up the change when the cache
+expires (see `CURRENCY_CACHE_TTL_SECONDS`). Currencies that are not found are not cached, so newly created currencies
+are available immediately. Copies of the cached instances are returned, so callers may modify them.
+"""
+
+import copy
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models.signals import post_delete, post_save
+
+logger = logging.getLogger(__name__)
+
+
+class CurrencyCache:
+    FIELD_NAMES = ('id', 'ticker')  # both are unique
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._caches: dict[str, dict] = {field_name: {} for field_name in self.FIELD_NAMES}
+        self._expires_at = 0.0
+        self._generation = 0  # incremented on invalidation, so currencies read before it are not cached after it
+
+    def _clear(self):
+        self._caches = {field_name: {} for field_name in self.FIELD_NAMES}
+        self._generation += 1
+
+    def _get(self, field_name, value):
+        from .models import Currency
+
+        now = time.monotonic()
+        with self._lock:
+            if now >= self._expires_at:
+                self._clear()
+                self._expires_at = now + settings.CURRENCY_CACHE_TTL_SECONDS
+
+            if (currency := self._caches[field_name].get(value)) is not None:
+                return copy.copy(currency)
+
+            generation = self._generation
+
+        if (currency := Currency.objects.filter(**{field_name: value}).first()) is not None:
+            with self._lock:
+                if generation == self._generation:
+                    for name, cache in self._caches.items():
+                        cache[getattr(currency, name)] = currency
+
+                    logger.debug('Cached %s currency', currency.ticker)
+
+            currency = copy.copy(currency)
+
+        return currency
+
+    def get_by_id(self, currency_id):
+        return self._get('id', currency_id)
+
+    def get_by_ticker(self, ticker):
+        return self._get('ticker', ticker)
+
+    def get_default(self):
+        from .models import Currency
+
+        if (currency := self.get_by_ticker(settings.DEFAULT_CURRENCY_TICKER)) is None:
+            raise Currency.DoesNotExist(f'Default currency {settings.DEFAULT_CURRENCY_TICKER} does not exist')
+
+        return currency
+
+    def invalidate(self):
+        with self._lock:
+            self._clear()
+            self._expires_at = 0.0
+
+
+currency_cache = CurrencyCache()
+
+
+def invalidate_currency_cache(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    # Right away, so the change is seen within the transaction, and on commit, because until then other threads may
+    # cache the previous state
+    currency_cache.invalidate()
+    transaction.on_commit(currency_cache.invalidate, using=using)
+
+
+def connect_signals():
+    from .models import Currency
+
+    post_save.connect(invalidate_currency_cache, sender=Currency, dispatch_uid='currency_cache_save')
+    post_delete.connect(invalidate_currency_cache, sender=Currency, dispatch_uid='currency_cache_delete')
@@ -1,11 +1,11 @@
 import django_filters
 
-from thenewboston.wallets.models import Wallet
+from ..models import CurrencyHolder
 
 
 class CurrencyBalanceFilter(django_filters.FilterSet):
     currency = django_filters.NumberFilter(field_name='currency', required=True)
 
     class Meta:
-        model = Wallet
+        model = CurrencyHolder
         fields = ('currency',)
@@ -5,14 +5,17 @@ from thenewboston.currencies.models import Currency, Mint
 
 class MintChartDataFilter(django_filters.FilterSet):
     currency = django_filters.NumberFilter(method='filter_currency', required=True)
+    # Applied by `Mint.objects.get_chart_data()`, not a queryset filter
+    max_points = django_filters.NumberFilter(method='filter_max_points', min_value=1, decimal_places=0)
 
     class Meta:
         model = Mint
-        fields = ('currency',)
+        fields = ('currency', 'max_points')
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.currency_obj = None
+        self.max_points_value = None
 
     def filter_currency(self, queryset, name, value):
         try:
@@ -22,3 +25,7 @@ class MintChartDataFilter(django_filters.FilterSet):
         except Currency.DoesNotExist:
             self.currency_obj = None
             return queryset.none()
+
+    def filter_max_points(self, queryset, name, value):
+        self.max_points_value = int(value)
+        return queryset
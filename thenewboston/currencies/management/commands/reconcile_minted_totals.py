@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from thenewboston.currencies.models import Currency
+
+
+class Command(BaseCommand):
+    help = 'Recalculate denormalized mint totals of currencies from the mints'  # noqa: A003
+
+    def handle(self, *args, **options):
+        currency_ids = Currency.objects.reconcile_minted_totals()
+        if currency_ids:
+            self.stdout.write(self.style.WARNING(f'Fixed mint totals of currencies with IDs: {currency_ids}'))
+        else:
+            self.stdout.write('Mint totals are consistent')
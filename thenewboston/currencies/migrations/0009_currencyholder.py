@@ -0,0 +1,72 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('currencies', '0008_whitepaper'),
+        ('wallets', '0004_walletledgerentry_walletbalancesnapshot'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CurrencyHolder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('balance', models.PositiveBigIntegerField()),
+                ('rank', models.PositiveIntegerField()),
+                ('position', models.PositiveIntegerField()),
+                ('percentage', models.DecimalField(decimal_places=4, max_digits=10)),
+                ('refreshed_date', models.DateTimeField()),
+                (
+                    'currency',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name='holders', to='currencies.currency'
+                    ),
+                ),
+                (
+                    'owner',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='currency_holdings',
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                'constraints': [
+                    models.UniqueConstraint(fields=('currency', 'owner'), name='unique_currency_holder'),
+                    models.UniqueConstraint(fields=('currency', 'position'), name='unique_currency_holder_position'),
+                ],
+            },
+        ),
+        # The existing wallets are ranked right away, so leaderboards are not empty until the first refresh
+        migrations.RunSQL(
+            """
+            WITH minted AS (
+                SELECT currency_id, sum(amount) AS total
+                FROM currencies_mint
+                GROUP BY currency_id
+            )
+            INSERT INTO currencies_currencyholder (
+                currency_id, owner_id, balance, rank, position, percentage, refreshed_date
+            )
+            SELECT
+                wallet.currency_id,
+                wallet.owner_id,
+                wallet.balance,
+                rank() OVER (PARTITION BY wallet.currency_id ORDER BY wallet.balance DESC),
+                row_number() OVER (PARTITION BY wallet.currency_id ORDER BY wallet.balance DESC, wallet.owner_id),
+                CASE WHEN minted.total > 0 THEN round(wallet.balance * 100.0 / minted.total, 4) ELSE 0 END,
+                now()
+            FROM wallets_wallet AS wallet
+            LEFT JOIN minted ON minted.currency_id = wallet.currency_id
+            WHERE wallet.balance > 0
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.1 on 2026-10-18 15:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('currencies', '0009_currencyholder'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='currency',
+            name='mint_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='currency',
+            name='total_minted',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.RunSQL(
+            'UPDATE currencies_currency AS currency SET total_minted = minted.total, mint_count = minted.count '
+            'FROM (SELECT currency_id, sum(amount) AS total, count(*) AS count '
+            'FROM currencies_mint GROUP BY currency_id) AS minted '
+            'WHERE minted.currency_id = currency.id',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
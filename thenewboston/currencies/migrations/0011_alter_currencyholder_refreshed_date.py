@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-18 16:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('currencies', '0010_currency_mint_count_currency_total_minted'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='currencyholder',
+            name='refreshed_date',
+            field=models.DateTimeField(db_index=True),
+        ),
+    ]
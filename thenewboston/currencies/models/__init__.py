@@ -1,3 +1,4 @@
 from .currency import Currency  # noqa: F401
+from .currency_holder import CurrencyHolder  # noqa: F401
 from .mint import Mint  # noqa: F401
 from .whitepaper import Whitepaper  # noqa: F401
@@ -1,14 +1,44 @@
-from django.db import models
-from django.db.models import Sum
+from django.db import connections, models, transaction
 
+from thenewboston.general.managers import CustomManager
 from thenewboston.general.models import CreatedModified, SocialMediaMixin
 
-from .mint import Mint
+# Currencies are locked first, so the totals are computed by a later statement that sees all the mints committed
+# before the locks were acquired, while mints committed later increment the reconciled totals
+RECONCILE_MINTED_TOTALS_SQL = """
+WITH minted AS (
+    SELECT currency.id, coalesce(sum(mint.amount), 0) AS total, count(mint.id) AS count
+    FROM currencies_currency AS currency
+    LEFT JOIN currencies_mint AS mint ON mint.currency_id = currency.id
+    GROUP BY currency.id
+)
+UPDATE currencies_currency AS currency
+SET total_minted = minted.total, mint_count = minted.count
+FROM minted
+WHERE minted.id = currency.id
+  AND (currency.total_minted, currency.mint_count) IS DISTINCT FROM (minted.total, minted.count)
+RETURNING currency.id
+"""
+
+MINTED_TOTALS_FIELD_NAMES = ('total_minted', 'mint_count')
 
 
 def get_total_amount_minted(currency_id):
     # So we do not have to select `Currency` just to get the total amount minted
-    return Mint.objects.filter(currency_id=currency_id).aggregate(total=Sum('amount'))['total'] or 0
+    return Currency.objects.filter(id=currency_id).values_list('total_minted', flat=True).first() or 0
+
+
+class CurrencyManager(CustomManager):
+    def reconcile_minted_totals(self) -> list[int]:
+        """
+        Recalculate the denormalized mint totals from the mints and fix the ones that differ. Return IDs of the
+        fixed currencies.
+        """
+        with transaction.atomic(using=self.db):
+            list(self.select_for_update().order_by('id').values_list('id', flat=True))
+            with connections[self.db].cursor() as cursor:
+                cursor.execute(RECONCILE_MINTED_TOTALS_SQL)
+                return sorted(row[0] for row in cursor.fetchall())
 
 
 class Currency(CreatedModified, SocialMediaMixin):
@@ -18,11 +48,29 @@ class Currency(CreatedModified, SocialMediaMixin):
     owner = models.ForeignKey('users.User', on_delete=models.CASCADE)
     ticker = models.CharField(max_length=5, unique=True)
 
+    # Denormalized from mints (see `Mint.save()`), they are updated in the database only (never by `save()`), so the
+    # currencies cached by `currency_cache` are not invalidated and may have outdated values
+    total_minted = models.PositiveBigIntegerField(default=0)
+    mint_count = models.PositiveIntegerField(default=0)
+
+    objects = CurrencyManager()
+
     class Meta:
         verbose_name_plural = 'Currencies'
 
     def __str__(self):
         return self.ticker
 
+    def save(self, *args, **kwargs):
+        if not self.is_adding():
+            # The totals are changed with atomic increments only, so saving an outdated instance must not overwrite them
+            update_fields = kwargs.get('update_fields')
+            if update_fields is None:
+                update_fields = [field.name for field in self._meta.concrete_fields if not field.primary_key]
+
+            kwargs['update_fields'] = [name for name in update_fields if name not in MINTED_TOTALS_FIELD_NAMES]
+
+        return super().save(*args, **kwargs)
+
     def get_total_amount_minted(self):
-        return get_total_amount_minted(self.id)
+        return self.total_minted
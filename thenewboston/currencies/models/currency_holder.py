@@ -0,0 +1,105 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, models, transaction
+
+from thenewboston.general.managers import CustomManager
+
+# Holders are ranked by balance (wallets with equal balances share the rank), while `position` breaks the ties by
+# owner to give holders a unique order for keyset pagination
+REFRESH_SQL = """
+INSERT INTO currencies_currencyholder (currency_id, owner_id, balance, rank, position, percentage, refreshed_date)
+SELECT
+    wallet.currency_id,
+    wallet.owner_id,
+    wallet.balance,
+    rank() OVER (PARTITION BY wallet.currency_id ORDER BY wallet.balance DESC),
+    row_number() OVER (PARTITION BY wallet.currency_id ORDER BY wallet.balance DESC, wallet.owner_id),
+    CASE WHEN currency.total_minted > 0 THEN round(wallet.balance * 100.0 / currency.total_minted, 4) ELSE 0 END,
+    now()
+FROM wallets_wallet AS wallet
+JOIN currencies_currency AS currency ON currency.id = wallet.currency_id
+WHERE wallet.balance > 0 {currency_filter}
+"""
+
+# Every balance change is recorded in the ledger, so the currencies of the wallets with ledger entries are the ones
+# whose holders may have changed (`wallets_walletledgerentry.created_date` is indexed)
+CHANGED_CURRENCY_IDS_SQL = """
+SELECT DISTINCT wallet.currency_id
+FROM wallets_walletledgerentry AS entry
+JOIN wallets_wallet AS wallet ON wallet.id = entry.wallet_id
+WHERE entry.created_date > %(since)s
+"""
+
+
+class CurrencyHolderManager(CustomManager):
+    def refresh(self, currency_ids=None) -> int:
+        """
+        Rebuild the holders of the currencies (all of them if `currency_ids` is `None`) from the wallet balances in
+        one transaction, so readers see either the previous or the new ranking. Return the number of holders.
+        """
+        delete_queryset = self.all()
+        currency_filter = ''
+        params = {}
+        if currency_ids is not None:
+            delete_queryset = delete_queryset.filter(currency_id__in=currency_ids)
+            currency_filter = 'AND wallet.currency_id = ANY(%(currency_ids)s::bigint[])'
+            params['currency_ids'] = list(currency_ids)
+
+        with transaction.atomic(using=self.db), connections[self.db].cursor() as cursor:
+            delete_queryset.delete()  # a single fast `DELETE`, because nothing references holders
+            cursor.execute(REFRESH_SQL.format(currency_filter=currency_filter), params)
+            return cursor.rowcount
+
+    def get_changed_currency_ids(self) -> list[int] | None:
+        """
+        Return IDs of the currencies whose wallet balances have changed since the last refresh (`None` if holders have
+        never been refreshed). Ledger entries are created (and get `created_date`) before they are committed, so the
+        changes are looked up since a bit earlier than the last refresh to include those that became visible later.
+        """
+        last_refreshed_date = self.order_by('-refreshed_date').values_list('refreshed_date', flat=True).first()
+        if last_refreshed_date is None:
+            return None
+
+        since = last_refreshed_date - timedelta(seconds=settings.CURRENCY_HOLDERS_REFRESH_LAG_SECONDS)
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(CHANGED_CURRENCY_IDS_SQL, {'since': since})
+            return [currency_id for (currency_id,) in cursor]
+
+    def refresh_changed(self) -> int:
+        """
+        Refresh the holders of the currencies whose wallet balances have changed since the last refresh (all of them
+        for the first refresh). Return the number of refreshed holders.
+        """
+        currency_ids = self.get_changed_currency_ids()
+        if currency_ids is not None and not currency_ids:
+            return 0
+
+        return self.refresh(currency_ids)
+
+
+class CurrencyHolder(models.Model):
+    """
+    Materialized ranking of currency holders (wallets with positive balances) for leaderboards. Holders of the
+    currencies with changed balances are refreshed periodically (see `refresh_currency_holders` task), so they may lag
+    behind the wallet balances.
+    """
+
+    currency = models.ForeignKey('currencies.Currency', on_delete=models.CASCADE, related_name='holders')
+    owner = models.ForeignKey('users.User', on_delete=models.CASCADE, related_name='currency_holdings')
+    balance = models.PositiveBigIntegerField()
+    rank = models.PositiveIntegerField()
+    position = models.PositiveIntegerField()
+    percentage = models.DecimalField(max_digits=10, decimal_places=4)  # of the total amount minted
+    refreshed_date = models.DateTimeField(db_index=True)  # the latest one is the last refresh time
+
+    objects = CurrencyHolderManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=('currency', 'owner'), name='unique_currency_holder'),
+            models.UniqueConstraint(fields=('currency', 'position'), name='unique_currency_holder_position'),
+        ]
+
+    def __str__(self):
+        return f'Currency holder | Currency ID: {self.currency_id} | Owner ID: {self.owner_id} | Rank: {self.rank}'
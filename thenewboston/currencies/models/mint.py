@@ -1,12 +1,79 @@
-from django.db import models
+from django.db import connections, models, transaction
+from django.db.models import F
 
+from thenewboston.general.managers import CustomManager, CustomQuerySet
 from thenewboston.general.models import CreatedModified
 
+from .currency import Currency
+
+# Mints are split into (at most) `max_points` buckets of consecutive mints of about the same size, every bucket becomes
+# a data point at its last mint, so the cumulative total is exact at every data point. Without `max_points` every
+# mint is a bucket of its own
+CHART_DATA_SQL = """
+SELECT max(created_date), sum(amount)::bigint, max(cumulative_total)::bigint
+FROM (
+    SELECT
+        created_date,
+        amount,
+        sum(amount) OVER (ORDER BY created_date, id) AS cumulative_total,
+        (row_number() OVER (ORDER BY created_date, id) - 1) * coalesce(%s, count(*) OVER ()) / count(*) OVER ()
+            AS bucket
+    FROM ({mints_sql}) AS mint
+) AS series
+GROUP BY bucket
+ORDER BY bucket
+"""
+
+
+class MintQuerySet(CustomQuerySet):
+    def get_chart_data(self, max_points=None) -> list[dict]:
+        """
+        Return the cumulative minting series of the mints (downsampled to `max_points` data points if provided)
+        computed by the database, so the response size does not depend on the number of mints.
+        """
+        mints_sql, params = self.order_by().values('id', 'created_date', 'amount').query.sql_with_params()
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(CHART_DATA_SQL.format(mints_sql=mints_sql), [max_points, *params])
+            return [
+                {'timestamp': timestamp, 'amount_minted': amount_minted, 'cumulative_total': cumulative_total}
+                for timestamp, amount_minted, cumulative_total in cursor.fetchall()
+            ]
+
+
+class MintManager(CustomManager.from_queryset(MintQuerySet)):  # type: ignore
+    pass
+
 
 class Mint(CreatedModified):
     currency = models.ForeignKey('currencies.Currency', on_delete=models.CASCADE, related_name='mints')
     owner = models.ForeignKey('users.User', on_delete=models.CASCADE)
     amount = models.PositiveBigIntegerField()
 
+    objects = MintManager()
+
     def __str__(self):
         return f'Mint {self.amount} {self.currency.ticker} by {self.owner.username}'
+
+    def _change_currency_totals(self, amount, count):
+        # Atomic increment, so concurrent mints do not overwrite each other's totals
+        Currency.objects.filter(id=self.currency_id).update(
+            total_minted=F('total_minted') + amount, mint_count=F('mint_count') + count
+        )
+
+    def save(self, *args, **kwargs):
+        # Mints are not supposed to be changed once created, `reconcile_minted_totals` command fixes the totals if
+        # they were changed or deleted in bulk
+        is_adding = self.is_adding()
+        with transaction.atomic():
+            rv = super().save(*args, **kwargs)
+            if is_adding:
+                self._change_currency_totals(self.amount, 1)
+
+        return rv
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            rv = super().delete(*args, **kwargs)
+            self._change_currency_totals(-self.amount, -1)
+
+        return rv
@@ -17,7 +17,7 @@ class CurrencyReadSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Currency
-        fields = '__all__'
+        exclude = ('mint_count', 'total_minted')
 
 
 class CurrencyTinySerializer(serializers.ModelSerializer):
@@ -33,7 +33,7 @@ class CurrencyWriteSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Currency
-        fields = '__all__'
+        exclude = ('mint_count', 'total_minted')
         read_only_fields = (
             'created_date',
             'modified_date',
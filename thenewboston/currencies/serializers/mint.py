@@ -1,9 +1,8 @@
 from django.db import transaction
-from django.db.models import Sum
 from rest_framework import serializers
 
 from thenewboston.general.constants import MAX_MINT_AMOUNT
-from thenewboston.wallets.models import Wallet
+from thenewboston.wallets.models import Wallet, WalletLedgerReason
 
 from ..models import Currency, Mint
 
@@ -33,17 +32,16 @@ class MintWriteSerializer(serializers.ModelSerializer):
         if currency.domain:
             raise serializers.ValidationError('Cannot mint external currencies.')
 
-        total_minted = Mint.objects.filter(currency=currency).aggregate(total=Sum('amount'))['total'] or 0
+        # The currency is locked, so concurrent mints cannot exceed the maximum together
+        total_minted = Currency.objects.select_for_update().values_list('total_minted', flat=True).get(id=currency.id)
         if total_minted + amount > MAX_MINT_AMOUNT:
             raise serializers.ValidationError(
                 f'Total minted amount would exceed maximum of {MAX_MINT_AMOUNT:,}. Current total: {total_minted:,}'
             )
 
         mint = super().create({**validated_data, 'owner': request.user})
-        wallet, _ = Wallet.objects.select_for_update().get_or_create(
-            owner=request.user, currency=currency, defaults={'balance': 0}
-        )
-        wallet.change_balance(amount)
+        wallet, _ = Wallet.objects.get_or_create(owner=request.user, currency=currency, defaults={'balance': 0})
+        wallet.change_balance(amount, reason=WalletLedgerReason.MINT, reference=mint)
         return mint
 
     @staticmethod
@@ -4,13 +4,8 @@ from ..models import Currency
 
 
 class TotalAmountMintedSerializer(serializers.ModelSerializer):
-    total_amount_minted = serializers.SerializerMethodField()
+    total_amount_minted = serializers.IntegerField(source='total_minted', read_only=True)
 
     class Meta:
         model = Currency
         fields = ('id', 'ticker', 'total_amount_minted')
-
-    @staticmethod
-    def get_total_amount_minted(obj):
-        # TODO(dmu) LOW: Implement `total_amount_minted` property and declare it as read-only field
-        return obj.get_total_amount_minted()
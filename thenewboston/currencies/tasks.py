@@ -0,0 +1,8 @@
+from thenewboston.project.celery import app
+
+
+@app.task(name='tasks.refresh_currency_holders')
+def refresh_currency_holders_task():
+    from .models import CurrencyHolder
+
+    CurrencyHolder.objects.refresh_changed()
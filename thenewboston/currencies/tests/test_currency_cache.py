@@ -0,0 +1,56 @@
+import pytest
+from django.test import override_settings
+
+from thenewboston.currencies.currency_cache import currency_cache
+from thenewboston.currencies.models import Currency
+
+
+@override_settings(DEFAULT_CURRENCY_TICKER='TNB')
+def test_currency_cache(django_assert_num_queries, tnb_currency, yyy_currency):
+    assert currency_cache.get_default() == tnb_currency
+    assert currency_cache.get_by_id(yyy_currency.id) == yyy_currency
+
+    with django_assert_num_queries(0):
+        assert currency_cache.get_default() == tnb_currency
+        assert currency_cache.get_by_ticker('TNB') == tnb_currency
+        assert currency_cache.get_by_id(tnb_currency.id) == tnb_currency
+        assert currency_cache.get_by_ticker('YYY') == yyy_currency
+
+    # Changes invalidate the cache
+    yyy_currency.description = 'Updated'
+    yyy_currency.save()
+    assert currency_cache.get_by_id(yyy_currency.id).description == 'Updated'
+
+    yyy_currency_id = yyy_currency.id
+    yyy_currency.delete()
+    assert currency_cache.get_by_id(yyy_currency_id) is None
+    assert currency_cache.get_by_ticker('YYY') is None
+
+
+@override_settings(DEFAULT_CURRENCY_TICKER='TNB')
+def test_currency_cache_default_currency_does_not_exist(db):
+    with pytest.raises(Currency.DoesNotExist):
+        currency_cache.get_default()
+
+
+def test_currency_cache_returns_copies(django_assert_num_queries, tnb_currency):
+    currency = currency_cache.get_by_id(tnb_currency.id)
+    currency.description = 'Modified'
+
+    with django_assert_num_queries(0):
+        cached_currency = currency_cache.get_by_id(tnb_currency.id)
+        assert cached_currency == tnb_currency
+        assert cached_currency.description != 'Modified'
+
+
+def test_currency_cache_is_invalidated_on_commit(
+    django_assert_num_queries, django_capture_on_commit_callbacks, yyy_currency
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        yyy_currency.description = 'Updated'
+        yyy_currency.save()
+        # Other threads may cache the previous state before commit (the same thread caches the new one)
+        assert currency_cache.get_by_id(yyy_currency.id).description == 'Updated'
+
+    with django_assert_num_queries(1):
+        assert currency_cache.get_by_id(yyy_currency.id).description == 'Updated'
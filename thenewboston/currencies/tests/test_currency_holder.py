@@ -0,0 +1,57 @@
+from django.test import override_settings
+from django.utils import timezone
+from model_bakery import baker
+
+from thenewboston.currencies.models import CurrencyHolder
+
+
+def test_currency_balances(
+    api_client_bucky, bucky_tnb_wallet, dmitry_tnb_wallet, bucky_yyy_wallet, tnb_currency, tnb_mint
+):
+    whale_wallet = baker.make('wallets.Wallet', balance=3_000, currency=tnb_currency)
+    baker.make('wallets.Wallet', balance=0, currency=tnb_currency)  # not a holder
+    assert CurrencyHolder.objects.refresh(currency_ids=[tnb_currency.id]) == 3
+    assert CurrencyHolder.objects.refresh() == 4
+
+    response = api_client_bucky.get('/api/currency-balances', {'currency': tnb_currency.id, 'page_size': 2})
+    assert response.status_code == 200
+    data = response.json()
+    assert [(item['owner']['id'], item['balance'], item['rank'], item['percentage']) for item in data['results']] == [
+        (whale_wallet.owner_id, 3_000, 1, 3.0),
+        (min(bucky_tnb_wallet.owner_id, dmitry_tnb_wallet.owner_id), 1_000, 2, 1.0),
+    ]
+
+    response = api_client_bucky.get(data['next'])
+    assert response.status_code == 200
+    data = response.json()
+    assert [(item['owner']['id'], item['rank']) for item in data['results']] == [
+        (max(bucky_tnb_wallet.owner_id, dmitry_tnb_wallet.owner_id), 2)
+    ]
+    assert data['next'] is None
+
+    # Holders are refreshed from the current balances
+    bucky_tnb_wallet.balance = 0
+    bucky_tnb_wallet.save(update_fields=('balance',))
+    assert CurrencyHolder.objects.refresh() == 3
+    assert not CurrencyHolder.objects.filter(currency=tnb_currency, owner=bucky_tnb_wallet.owner).exists()
+
+
+@override_settings(CURRENCY_HOLDERS_REFRESH_LAG_SECONDS=0)
+def test_refresh_changed_currency_holders(bucky_tnb_wallet, dmitry_tnb_wallet, bucky_yyy_wallet, yyy_currency):
+    # All currencies are refreshed for the first time
+    assert CurrencyHolder.objects.get_changed_currency_ids() is None
+    assert CurrencyHolder.objects.refresh_changed() == 3
+
+    refreshed_date = timezone.now()  # after the balances of the wallets have been changed
+    CurrencyHolder.objects.update(refreshed_date=refreshed_date)
+    assert CurrencyHolder.objects.get_changed_currency_ids() == []
+    assert CurrencyHolder.objects.refresh_changed() == 0
+
+    bucky_yyy_wallet.change_balance(1)
+    assert CurrencyHolder.objects.get_changed_currency_ids() == [yyy_currency.id]
+    assert CurrencyHolder.objects.refresh_changed() == 1
+    assert CurrencyHolder.objects.get(currency=yyy_currency).balance == 1_001
+    # Holders of the other currencies are not refreshed
+    assert set(CurrencyHolder.objects.exclude(currency=yyy_currency).values_list('refreshed_date', flat=True)) == {
+        refreshed_date
+    }
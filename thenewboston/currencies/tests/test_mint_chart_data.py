@@ -0,0 +1,34 @@
+from model_bakery import baker
+
+
+def test_mint_chart_data(api_client_bucky, tnb_currency, yyy_currency):
+    mints = [baker.make('currencies.Mint', currency=tnb_currency, amount=amount) for amount in (10, 20, 30, 40, 50)]
+    baker.make('currencies.Mint', currency=yyy_currency, amount=1_000)
+
+    response = api_client_bucky.get('/api/mint-chart-data', {'currency': tnb_currency.id})
+    assert response.status_code == 200
+    data = response.json()
+    assert data['currency'] == tnb_currency.id
+    assert [(point['amount_minted'], point['cumulative_total']) for point in data['data_points']] == [
+        (10, 10),
+        (20, 30),
+        (30, 60),
+        (40, 100),
+        (50, 150),
+    ]
+
+    # Downsampled data points are at the last mints of the buckets
+    response = api_client_bucky.get('/api/mint-chart-data', {'currency': tnb_currency.id, 'max_points': 2})
+    assert response.status_code == 200
+    data_points = response.json()['data_points']
+    assert [(point['amount_minted'], point['cumulative_total']) for point in data_points] == [(60, 60), (90, 150)]
+    assert data_points[-1]['timestamp'] == mints[-1].created_date.replace(tzinfo=None).isoformat() + 'Z'
+
+    response = api_client_bucky.get('/api/mint-chart-data', {'currency': tnb_currency.id, 'max_points': 0})
+    assert response.status_code == 400
+
+
+def test_mint_chart_data_without_mints(api_client_bucky, tnb_currency):
+    response = api_client_bucky.get('/api/mint-chart-data', {'currency': tnb_currency.id})
+    assert response.status_code == 200
+    assert response.json() == {'data_points': [], 'currency': tnb_currency.id}
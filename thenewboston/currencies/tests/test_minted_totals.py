@@ -0,0 +1,49 @@
+from django.core.management import call_command
+from model_bakery import baker
+
+from thenewboston.currencies.models import Currency, Mint
+
+from .fixtures.currency import create_currency
+
+
+def test_minted_totals(api_client_bucky, bucky):
+    currency = create_currency(domain=None, owner=bucky, ticker='AAA')
+
+    for amount in (100, 250):
+        response = api_client_bucky.post('/api/mints', {'currency': currency.id, 'amount': amount}, format='json')
+        assert response.status_code == 201
+
+    currency.refresh_from_db()
+    assert (currency.total_minted, currency.mint_count) == (350, 2)
+
+    response = api_client_bucky.get('/api/total-amount-minted', {'currency': currency.id})
+    assert response.status_code == 200
+    assert response.json() == {'id': currency.id, 'ticker': 'AAA', 'total_amount_minted': 350}
+
+    Mint.objects.filter(currency=currency, amount=100).first().delete()
+    currency.refresh_from_db()
+    assert (currency.total_minted, currency.mint_count) == (250, 1)
+
+
+def test_reconcile_minted_totals(tnb_currency, yyy_currency, tnb_mint, yyy_mint):
+    baker.make('currencies.Mint', currency=tnb_currency, amount=5)
+    Mint.objects.filter(currency=tnb_currency, amount=5).update(amount=10)  # bypasses `Mint.save()`
+
+    assert Currency.objects.reconcile_minted_totals() == [tnb_currency.id]
+    tnb_currency.refresh_from_db()
+    assert (tnb_currency.total_minted, tnb_currency.mint_count) == (100_010, 2)
+
+    call_command('reconcile_minted_totals')
+    yyy_currency.refresh_from_db()
+    assert (yyy_currency.total_minted, yyy_currency.mint_count) == (200_000, 1)
+
+
+def test_currency_save_does_not_overwrite_minted_totals(tnb_currency, tnb_mint):
+    outdated_currency = Currency.objects.get(id=tnb_currency.id)
+    baker.make('currencies.Mint', currency=tnb_currency, amount=5)
+
+    outdated_currency.description = 'Updated'
+    outdated_currency.save()
+    tnb_currency.refresh_from_db()
+    assert tnb_currency.description == 'Updated'
+    assert (tnb_currency.total_minted, tnb_currency.mint_count) == (100_005, 2)
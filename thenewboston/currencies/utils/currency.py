@@ -1,7 +1,5 @@
-from django.conf import settings
-
-from thenewboston.currencies.models import Currency
+from ..currency_cache import currency_cache
 
 
 def get_default_currency():
-    return Currency.objects.get(ticker=settings.DEFAULT_CURRENCY_TICKER)
+    return currency_cache.get_default()
@@ -12,31 +12,22 @@ class MintChartDataView(generics.ListAPIView):
     filter_backends = [DjangoFilterBackend]
     filterset_class = MintChartDataFilter
     permission_classes = [IsAuthenticated]
-    queryset = Mint.objects.select_related('currency').order_by('created_date')
+    queryset = Mint.objects.order_by('created_date')
     serializer_class = MintChartDataResponseSerializer
 
     def list(self, request, *args, **kwargs):  # noqa: A003
-        queryset = self.filter_queryset(self.get_queryset())
-        filterset = self.filterset_class(request.query_params, queryset=queryset)
+        filterset = self.filterset_class(request.query_params, queryset=self.get_queryset())
+        if not filterset.is_valid():
+            return Response(filterset.errors, status=400)
+
         queryset = filterset.qs
         currency = filterset.currency_obj
 
         if not currency:
             return Response({'error': 'Invalid currency'}, status=400)
 
-        mints = list(queryset)
-
-        if not mints:
-            return Response({'data_points': [], 'currency': currency.id})
-
-        data_points = []
-        cumulative_total = 0
-
-        for mint in mints:
-            cumulative_total += mint.amount
-            data_points.append(
-                {'timestamp': mint.created_date, 'amount_minted': mint.amount, 'cumulative_total': cumulative_total}
-            )
+        # The cumulative series is computed (and downsampled) by the database instead of iterating over all the mints
+        data_points = queryset.get_chart_data(max_points=filterset.max_points_value)
 
         serializer = self.get_serializer(data={'data_points': data_points, 'currency': currency.id})
         serializer.is_valid(raise_exception=True)
@@ -1,11 +1,18 @@
 from django.contrib import admin
 
-from .models import AssetPair, ExchangeOrder, OrderProcessingLock, Trade, TradeHistoryItem
+from .models import AssetPair, Candlestick, ExchangeOrder, OrderProcessingLock, Trade, TradeHistoryItem
 from .models.exchange_order import CHANGEABLE_FIELDS
 
 admin.site.register(AssetPair)
 
 
+@admin.register(Candlestick)
+class CandlestickAdmin(admin.ModelAdmin):
+    list_display = ('id', 'asset_pair', 'resolution', 'bucket_start', 'open', 'high', 'low', 'close', 'volume')
+    list_filter = ('resolution', 'asset_pair')
+    ordering = ('-bucket_start', 'resolution')
+
+
 @admin.register(ExchangeOrder)
 class ExchangeOrderAdmin(admin.ModelAdmin):
     list_display = (
@@ -38,12 +45,21 @@ class ExchangeOrderAdmin(admin.ModelAdmin):
 
 @admin.register(OrderProcessingLock)
 class OrderProcessingLockAdmin(admin.ModelAdmin):
-    list_display = ('id', 'acquired_at', 'trade_at', 'extra')
+    list_display = ('id', 'shard', 'shard_count', 'acquired_at', 'trade_at', 'extra')
 
 
 @admin.register(Trade)
 class TradeAdmin(admin.ModelAdmin):
-    list_display = ('id', 'buy_order', 'sell_order', 'filled_quantity', 'price', 'overpayment_amount', 'created_date')
+    list_display = (
+        'id',
+        'asset_pair',
+        'buy_order',
+        'sell_order',
+        'filled_quantity',
+        'price',
+        'overpayment_amount',
+        'created_date',
+    )
     ordering = ('-created_date', '-pk')
 
 
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ExchangeConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'thenewboston.exchange'
+
+    def ready(self):
+        from .asset_pair_registry import connect_signals
+
+        connect_signals()
@@ -0,0 +1,69 @@
+"""
+Process-wide registry of asset pairs: id <-> (primary currency id, secondary currency id).
+
+Asset pairs are never changed after creation, so the only invalidation needed is on creation and deletion.
+It is done by `post_save` / `post_delete` signals in the process that made the change. Other processes pick up
+newly created asset pairs by reloading the registry on a miss.
+"""
+
+import logging
+import threading
+
+from django.db.models.signals import post_delete, post_save
+
+logger = logging.getLogger(__name__)
+
+
+class AssetPairRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._currency_ids_by_id: dict[int, tuple[int, int]] | None = None
+        self._ids_by_currency_ids: dict[tuple[int, int], int] = {}
+
+    def _load(self):
+        from .models import AssetPair
+
+        currency_ids_by_id = {
+            id_: (primary_currency_id, secondary_currency_id)
+            for id_, primary_currency_id, secondary_currency_id in AssetPair.objects.values_list(
+                'id', 'primary_currency_id', 'secondary_currency_id'
+            )
+        }
+        with self._lock:
+            self._currency_ids_by_id = currency_ids_by_id
+            self._ids_by_currency_ids = {value: key for key, value in currency_ids_by_id.items()}
+
+        logger.debug('Loaded %s asset pairs', len(currency_ids_by_id))
+
+    def _get(self, getter):
+        if self._currency_ids_by_id is None or (value := getter()) is None:
+            self._load()  # the asset pair could have been created by another process
+            value = getter()
+
+        return value
+
+    def get_currency_ids(self, asset_pair_id) -> tuple[int, int] | None:
+        return self._get(lambda: (self._currency_ids_by_id or {}).get(asset_pair_id))
+
+    def get_id(self, primary_currency_id, secondary_currency_id) -> int | None:
+        return self._get(lambda: self._ids_by_currency_ids.get((primary_currency_id, secondary_currency_id)))
+
+    def invalidate(self):
+        with self._lock:
+            self._currency_ids_by_id = None
+            self._ids_by_currency_ids = {}
+
+
+asset_pair_registry = AssetPairRegistry()
+
+
+def invalidate_asset_pair_registry(sender, **kwargs):
+    if kwargs.get('created', True):  # `post_delete` does not provide `created`
+        asset_pair_registry.invalidate()
+
+
+def connect_signals():
+    from .models import AssetPair
+
+    post_save.connect(invalidate_asset_pair_registry, sender=AssetPair, dispatch_uid='asset_pair_registry_save')
+    post_delete.connect(invalidate_asset_pair_registry, sender=AssetPair, dispatch_uid='asset_pair_registry_delete')
@@ -0,0 +1,38 @@
+import logging
+
+from django.db.models import OuterRef, Subquery
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 10000
+
+
+def backfill_trade_asset_pair(trade_model=None, batch_size=DEFAULT_BATCH_SIZE) -> int:
+    """
+    Populate `Trade.asset_pair` from the buy order in batches (by primary key ranges), so it does not lock
+    the entire table for long. `trade_model` is provided when called from a data migration (historical model).
+    """
+    if trade_model is None:
+        from ..models import Trade as trade_model
+
+    exchange_order_model = trade_model._meta.get_field('buy_order').related_model
+    asset_pair_id_subquery = Subquery(
+        exchange_order_model.objects.filter(pk=OuterRef('buy_order_id')).values('asset_pair_id')[:1]
+    )
+
+    updated_count = 0
+    last_id = 0
+    while True:
+        ids = list(
+            trade_model.objects.filter(id__gt=last_id, asset_pair__isnull=True)
+            .order_by('id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+
+        updated_count += trade_model.objects.filter(id__in=ids).update(asset_pair_id=asset_pair_id_subquery)
+        last_id = ids[-1]
+        logger.debug('Backfilled asset pair for trades up to id %s', last_id)
+
+    return updated_count
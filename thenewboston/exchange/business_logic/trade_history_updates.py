@@ -0,0 +1,104 @@
+"""
+Debounced and deduplicated trade history updates.
+
+Asset pairs that had trades are added to a Redis "dirty" set and a single flush task is scheduled per
+`TRADE_HISTORY_UPDATE_WINDOW_SECONDS` window, so a burst of trades results in at most one recalculation per
+asset pair per window instead of one per trade.
+"""
+
+import logging
+
+from django.conf import settings
+from django.db import transaction
+
+from thenewboston.general.clients.redis import get_redis_client
+from thenewboston.general.utils.database import apply_on_commit
+
+DIRTY_ASSET_PAIRS_KEY = 'trade_history:dirty_asset_pairs'
+PENDING_REQUESTS_KEY = 'trade_history:pending_requests'
+FLUSH_SCHEDULED_KEY = 'trade_history:flush_scheduled'
+STATS_KEY = 'trade_history:stats'
+
+# The flag expires in case the flush task is lost (worker crash, broker restart)
+FLUSH_SCHEDULED_EXTRA_TTL_SECONDS = 60
+
+logger = logging.getLogger(__name__)
+
+
+def request_trade_history_update(asset_pair_ids) -> bool:
+    """
+    Mark the asset pairs dirty and schedule a flush unless it is already scheduled.
+    Return `True` if the flush was scheduled, `False` if the request was coalesced.
+    """
+    if not (asset_pair_ids := set(asset_pair_ids)):
+        return False
+
+    pipeline = get_redis_client().pipeline()
+    pipeline.incrby(PENDING_REQUESTS_KEY, len(asset_pair_ids))
+    pipeline.hincrby(STATS_KEY, 'requested', len(asset_pair_ids))
+    return _mark_dirty_and_schedule_flush(pipeline, asset_pair_ids)
+
+
+def _mark_dirty_and_schedule_flush(pipeline, asset_pair_ids) -> bool:
+    from ..tasks import flush_trade_history_updates_task
+
+    window_seconds = settings.TRADE_HISTORY_UPDATE_WINDOW_SECONDS
+    pipeline.sadd(DIRTY_ASSET_PAIRS_KEY, *asset_pair_ids)
+    pipeline.set(FLUSH_SCHEDULED_KEY, 1, nx=True, ex=window_seconds + FLUSH_SCHEDULED_EXTRA_TTL_SECONDS)
+    *_, is_flush_scheduled = pipeline.execute()
+    if is_flush_scheduled:
+        flush_trade_history_updates_task.apply_async(countdown=window_seconds)
+
+    return bool(is_flush_scheduled)
+
+
+def request_trade_history_update_on_commit(asset_pair_ids):
+    apply_on_commit(lambda asset_pair_ids=tuple(asset_pair_ids): request_trade_history_update(asset_pair_ids))
+
+
+def flush_trade_history_updates() -> tuple[int, int]:
+    """
+    Recalculate trade history of the dirty asset pairs. Return the number of recalculated asset pairs and
+    the number of coalesced update requests.
+    """
+    from ..models import TradeHistoryItem
+
+    redis_client = get_redis_client()
+    pipeline = redis_client.pipeline()
+    # The flag is removed first, so updates requested after this point are never lost: they either get into
+    # the set being popped now or schedule another flush
+    pipeline.delete(FLUSH_SCHEDULED_KEY)
+    pipeline.smembers(DIRTY_ASSET_PAIRS_KEY)
+    pipeline.delete(DIRTY_ASSET_PAIRS_KEY)
+    pipeline.getdel(PENDING_REQUESTS_KEY)
+    _, asset_pair_ids, _, requests_count = pipeline.execute()
+
+    if not (asset_pair_ids := sorted(map(int, asset_pair_ids))):
+        return 0, 0
+
+    try:
+        with transaction.atomic():
+            TradeHistoryItem.objects.update_for_asset_pairs(asset_pair_ids)
+    except Exception:
+        # Put the asset pairs back and schedule another flush, otherwise they stay stale until the next trade
+        _mark_dirty_and_schedule_flush(redis_client.pipeline(), asset_pair_ids)
+        raise
+
+    coalesced_count = max(int(requests_count or 0) - len(asset_pair_ids), 0)
+    pipeline = redis_client.pipeline()
+    pipeline.hincrby(STATS_KEY, 'flushes', 1)
+    pipeline.hincrby(STATS_KEY, 'recalculated', len(asset_pair_ids))
+    pipeline.hincrby(STATS_KEY, 'coalesced', coalesced_count)
+    pipeline.execute()
+
+    logger.info(
+        'Updated trade history for %s asset pair(s), %s update request(s) coalesced',
+        len(asset_pair_ids),
+        coalesced_count,
+    )
+    return len(asset_pair_ids), coalesced_count
+
+
+def get_trade_history_update_stats() -> dict[str, int]:
+    stats = get_redis_client().hgetall(STATS_KEY)
+    return {key: int(stats.get(key, 0)) for key in ('requested', 'flushes', 'recalculated', 'coalesced')}
@@ -1,2 +1,3 @@
 from .exchange_order import ExchangeOrderConsumer  # noqa: F401
+from .order_book import OrderBookConsumer  # noqa: F401
 from .trade import TradeConsumer  # noqa: F401
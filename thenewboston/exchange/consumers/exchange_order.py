@@ -2,6 +2,9 @@ from asgiref.sync import async_to_sync
 from channels.generic.websocket import JsonWebsocketConsumer
 from channels.layers import get_channel_layer
 
+from thenewboston.general.utils.stream_buffer import send_group_event
+
+from ..asset_pair_registry import asset_pair_registry
 from ..models import AssetPair
 
 
@@ -67,15 +70,15 @@ class ExchangeOrderConsumer(JsonWebsocketConsumer):
         Send order details to the group associated with the asset pair.
         message_type indicates the type of the order action, order_data contains the order details.
         """
-        asset_pair = cls.get_or_create_asset_pair(primary_currency_id, secondary_currency_id)
-        asset_pair_id = asset_pair.id
+        asset_pair_id = asset_pair_registry.get_id(primary_currency_id, secondary_currency_id)
+        if asset_pair_id is None:
+            asset_pair_id = cls.get_or_create_asset_pair(primary_currency_id, secondary_currency_id).id
 
-        channel_layer = get_channel_layer()
         order_event = {
             'payload': order_data,
             'type': message_type.value,
         }
-        async_to_sync(channel_layer.group_send)(cls.get_group_name(asset_pair_id), order_event)
+        send_group_event(cls.get_group_name(asset_pair_id), order_event)
 
     def subscribe_to_asset_pair(self, asset_pair_id):
         """Add the client to the asset pair group."""
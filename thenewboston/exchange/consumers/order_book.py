@@ -0,0 +1,79 @@
+from asgiref.sync import async_to_sync
+from channels.generic.websocket import JsonWebsocketConsumer
+from channels.layers import get_channel_layer
+
+from thenewboston.general.utils.stream_buffer import send_group_event
+
+
+class OrderBookConsumer(JsonWebsocketConsumer):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.subscribed_asset_pairs = set()
+
+    def connect(self):
+        """Accept the incoming connection."""
+        self.accept()
+
+    def disconnect(self, close_code):
+        """Remove the client from all subscribed asset pair groups on disconnection."""
+        for asset_pair_id in self.subscribed_asset_pairs:
+            group_name = self.get_group_name(asset_pair_id)
+            async_to_sync(get_channel_layer().group_discard)(group_name, self.channel_name)
+
+    @staticmethod
+    def get_group_name(asset_pair_id):
+        """Construct a unique group name for a given asset pair."""
+        return f'order_book_{asset_pair_id}'
+
+    def receive_json(self, content, **kwargs):
+        """Handle incoming WebSocket messages for subscribe/unsubscribe actions."""
+        action = content.get('action')
+        asset_pair_id = content.get('asset_pair_id')
+
+        if not action or not asset_pair_id:
+            self.send_json({'error': 'Invalid message format. Required fields: action, asset_pair_id'})
+            return
+
+        try:
+            asset_pair_id = int(asset_pair_id)
+        except (ValueError, TypeError):
+            self.send_json({'error': 'asset_pair_id must be a valid integer'})
+            return
+
+        if action == 'subscribe':
+            self.subscribe_to_asset_pair(asset_pair_id)
+        elif action == 'unsubscribe':
+            self.unsubscribe_from_asset_pair(asset_pair_id)
+        else:
+            self.send_json({'error': f'Unknown action: {action}'})
+
+    @classmethod
+    def stream_order_book(cls, *, message_type, asset_pair_id, order_book_data):
+        """
+        Send price level changes (with the sequence number) to the group associated with the asset pair.
+        """
+        order_book_event = {'payload': order_book_data, 'type': message_type.value}
+        send_group_event(cls.get_group_name(asset_pair_id), order_book_event)
+
+    def subscribe_to_asset_pair(self, asset_pair_id):
+        """Add the client to the asset pair group."""
+        if asset_pair_id not in self.subscribed_asset_pairs:
+            group_name = self.get_group_name(asset_pair_id)
+            async_to_sync(get_channel_layer().group_add)(group_name, self.channel_name)
+            self.subscribed_asset_pairs.add(asset_pair_id)
+            self.send_json({'success': f'Subscribed to asset pair: {asset_pair_id}'})
+
+    def unsubscribe_from_asset_pair(self, asset_pair_id):
+        """Remove the client from the asset pair group."""
+        if asset_pair_id in self.subscribed_asset_pairs:
+            group_name = self.get_group_name(asset_pair_id)
+            async_to_sync(get_channel_layer().group_discard)(group_name, self.channel_name)
+            self.subscribed_asset_pairs.remove(asset_pair_id)
+            self.send_json({'success': f'Unsubscribed from asset pair: {asset_pair_id}'})
+
+    def update_order_book(self, event):
+        """
+        Send price level changes to the client. Changes are `None` if the book was reloaded, so the client must
+        request a new snapshot.
+        """
+        self.send_json({'order_book': event['payload'], 'type': event['type']})
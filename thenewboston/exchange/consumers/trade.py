@@ -2,6 +2,8 @@ from asgiref.sync import async_to_sync
 from channels.generic.websocket import JsonWebsocketConsumer
 from channels.layers import get_channel_layer
 
+from thenewboston.general.utils.stream_buffer import send_group_event
+
 
 class TradeConsumer(JsonWebsocketConsumer):
     def __init__(self, *args, **kwargs):
@@ -53,9 +55,8 @@ class TradeConsumer(JsonWebsocketConsumer):
         message_type indicates the type of the action, trade_data contains the trade details,
         and ticker specifies which currency group to broadcast to.
         """
-        channel_layer = get_channel_layer()
         trade_event = {'payload': trade_data, 'type': message_type.value}
-        async_to_sync(channel_layer.group_send)(cls.get_group_name(ticker), trade_event)
+        send_group_event(cls.get_group_name(ticker), trade_event)
 
     def subscribe_to_ticker(self, ticker):
         """Add the client to the ticker group."""
@@ -4,7 +4,8 @@ from ..models import Trade
 
 
 class TradeFilter(django_filters.FilterSet):
-    buy_order__asset_pair = django_filters.NumberFilter(field_name='buy_order__asset_pair')
+    # Kept for backward compatibility, `asset_pair` should be used instead
+    buy_order__asset_pair = django_filters.NumberFilter(field_name='asset_pair')
 
     class Meta:
         model = Trade
@@ -12,5 +13,5 @@ class TradeFilter(django_filters.FilterSet):
             # TODO(dmu) LOW: Are these definitions excessive?
             'buy_order': ['exact'],
             'sell_order': ['exact'],
-            'buy_order__asset_pair': ['exact'],
+            'asset_pair': ['exact'],
         }
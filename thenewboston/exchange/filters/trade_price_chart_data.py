@@ -3,7 +3,18 @@ from datetime import timedelta
 import django_filters
 from django.utils import timezone
 
-from thenewboston.exchange.models import AssetPair, Trade
+from thenewboston.exchange.models import AssetPair, Candlestick
+from thenewboston.exchange.models.candlestick import get_bucket_start
+
+# Candlestick resolution (in minutes) per time range
+TIME_RANGE_RESOLUTIONS = {
+    '1d': 5,
+    '1w': 60,
+    '1m': 360,
+    '3m': 360,
+    '1y': 360,
+    'all': 360,
+}
 
 
 class TradePriceChartDataFilter(django_filters.FilterSet):
@@ -22,7 +33,7 @@ class TradePriceChartDataFilter(django_filters.FilterSet):
     )
 
     class Meta:
-        model = Trade
+        model = Candlestick
         fields = ('asset_pair', 'time_range')
 
     def __init__(self, *args, **kwargs):
@@ -35,7 +46,7 @@ class TradePriceChartDataFilter(django_filters.FilterSet):
         try:
             asset_pair = AssetPair.objects.get(pk=value)
             self.asset_pair_obj = asset_pair
-            return queryset.filter(buy_order__asset_pair=asset_pair)
+            return queryset.filter(asset_pair=asset_pair)
         except AssetPair.DoesNotExist:
             self.asset_pair_obj = None
             return queryset.none()
@@ -55,7 +66,9 @@ class TradePriceChartDataFilter(django_filters.FilterSet):
         self.start_time = start_time
         self.time_range_value = value
 
+        resolution = TIME_RANGE_RESOLUTIONS[value]
+        queryset = queryset.filter(resolution=resolution)
         if start_time:
-            return queryset.filter(created_date__gte=start_time)
+            return queryset.filter(bucket_start__gte=get_bucket_start(start_time, resolution))
 
         return queryset
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from thenewboston.exchange.models import AssetPair, Candlestick
+
+
+class Command(BaseCommand):
+    help = 'Recalculate stored candlesticks from the trades'  # noqa: A003
+
+    def add_arguments(self, parser):
+        parser.add_argument('--asset-pair', type=int, action='append', dest='asset_pair_ids', help='Asset pair ID')
+
+    def handle(self, *args, asset_pair_ids, **options):
+        if not asset_pair_ids:
+            asset_pair_ids = AssetPair.objects.order_by('id').values_list('id', flat=True)
+
+        for asset_pair_id in asset_pair_ids:
+            # Transaction per asset pair to avoid long locks (similar to trade history update)
+            with transaction.atomic():
+                Candlestick.objects.rebuild_for_asset_pair(asset_pair_id)
+
+            self.stdout.write(f'Rebuilt candlesticks for asset pair {asset_pair_id}')
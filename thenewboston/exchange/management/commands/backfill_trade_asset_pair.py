@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from thenewboston.exchange.business_logic.trade_asset_pair import DEFAULT_BATCH_SIZE, backfill_trade_asset_pair
+
+
+class Command(BaseCommand):
+    help = 'Populate asset pair of the trades that do not have it (created before it was denormalized)'  # noqa: A003
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, batch_size, **options):
+        updated_count = backfill_trade_asset_pair(batch_size=batch_size)
+        self.stdout.write(f'Backfilled asset pair for {updated_count} trade(s)')
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from thenewboston.exchange.models import AssetPair
+from thenewboston.exchange.price_levels import load_price_levels
+
+
+class Command(BaseCommand):
+    help = 'Reload aggregated order books (price levels) from the database to Redis'  # noqa: A003
+
+    def add_arguments(self, parser):
+        parser.add_argument('--asset-pair', type=int, action='append', dest='asset_pair_ids', help='Asset pair ID')
+
+    def handle(self, *args, asset_pair_ids, **options):
+        if not asset_pair_ids:
+            asset_pair_ids = AssetPair.objects.order_by('id').values_list('id', flat=True)
+
+        for asset_pair_id in asset_pair_ids:
+            if (sequence := load_price_levels(asset_pair_id)) is None:
+                self.stdout.write(f'Price levels for asset pair {asset_pair_id} are being loaded by another process')
+                continue
+
+            self.stdout.write(f'Loaded price levels for asset pair {asset_pair_id} (sequence: {sequence})')
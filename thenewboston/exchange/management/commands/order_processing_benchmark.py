@@ -0,0 +1,56 @@
+import json
+import logging
+from dataclasses import fields
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from thenewboston.exchange.order_processing.benchmark import BenchmarkData, OrderFlowConfig, run_benchmark
+from thenewboston.exchange.order_processing.engine import order_processing_lock
+from thenewboston.general.exceptions import ThenewbostonRuntimeError
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark order processing engine with synthetic order flow (creates data in the database)'  # noqa: A003
+
+    def add_arguments(self, parser):
+        for field in fields(OrderFlowConfig):
+            name = field.name.replace('_', '-')
+            if field.name == 'price_distribution':
+                parser.add_argument(f'--{name}', choices=('normal', 'uniform'), default=field.default)
+            else:
+                parser.add_argument(f'--{name}', type=type(field.default), default=field.default)
+
+        parser.add_argument('--mode', choices=('scan', 'order-book'), default='scan')
+        parser.add_argument('--batch-size', type=int, default=None, help='ORDER_PROCESSING_TRADE_BATCH_SIZE override')
+        parser.add_argument('--keep-data', action='store_true', help='Do not delete the benchmark data')
+        parser.add_argument('--json', action='store_true', dest='as_json', help='Output the report as JSON')
+        parser.add_argument('--force', action='store_true', help='Run even if DEBUG is off')
+
+    def handle(self, *args, mode, batch_size, keep_data, as_json, force, **options):
+        if not settings.DEBUG and not force:
+            raise CommandError('The benchmark creates users, currencies and orders, use --force to run with DEBUG off')
+
+        config = OrderFlowConfig(**{field.name: options[field.name] for field in fields(OrderFlowConfig)})
+        batch_size = batch_size or settings.ORDER_PROCESSING_TRADE_BATCH_SIZE
+
+        data = BenchmarkData.create(config)
+        try:
+            # The lock also guarantees that the benchmark is not run along with the real engine
+            with order_processing_lock(), override_settings(ORDER_PROCESSING_TRADE_BATCH_SIZE=batch_size):
+                report = run_benchmark(config, data, use_order_book=mode == 'order-book')
+        except ThenewbostonRuntimeError as ex:
+            raise CommandError(f'Benchmark failed: {ex}')
+        finally:
+            if not keep_data:
+                data.cleanup()
+
+        report_dict = report.as_dict()
+        if as_json:
+            self.stdout.write(json.dumps(report_dict, indent=2))
+        else:
+            for key, value in report_dict.items():
+                self.stdout.write(f'{key}: {value:.3f}' if isinstance(value, float) else f'{key}: {value}')
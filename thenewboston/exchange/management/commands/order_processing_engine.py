@@ -1,8 +1,13 @@
 import logging
+import time
+from argparse import BooleanOptionalAction
 
-from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
 
 from thenewboston.exchange.order_processing.engine import OrderProcessingEngine
+from thenewboston.exchange.order_processing.metrics import HISTOGRAMS, get_histogram_percentile, get_snapshots
+from thenewboston.exchange.order_processing.sharding import Shard
 from thenewboston.general.exceptions import ThenewbostonRuntimeError
 
 logger = logging.getLogger(__name__)
@@ -13,9 +18,66 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument('--force-run', '-f', action='store_true')
+        parser.add_argument(
+            '--order-book',
+            action=BooleanOptionalAction,
+            default=None,
+            help='Use in-memory order books (default: ORDER_PROCESSING_USE_ORDER_BOOK setting)',
+        )
+        parser.add_argument(
+            '--shard-count',
+            type=int,
+            default=None,
+            help='Number of shards (default: ORDER_PROCESSING_SHARD_COUNT setting)',
+        )
+        parser.add_argument('--shard-index', type=int, default=0, help='Asset pairs shard to process (default: 0)')
+        parser.add_argument('--stats', action='store_true', help='Show metrics of the running engines and exit')
+
+    def show_stats(self, shard_count):
+        if not (snapshots := get_snapshots(shard_count)):
+            self.stdout.write('No metrics found (are the engines running?)')
+            return
+
+        for snapshot in snapshots:
+            self.stdout.write(
+                self.style.MIGRATE_HEADING(
+                    f'Shard {snapshot["shard"]} (updated {time.time() - snapshot["updated_at"]:.1f} seconds ago)'
+                )
+            )
+            for name, value in snapshot['counters'].items():
+                self.stdout.write(f'  {name}: {value}')
+
+            for name in HISTOGRAMS:
+                histogram = snapshot['histograms'][name]
+                if not (count := histogram['count']):
+                    continue
+
+                self.stdout.write(
+                    f'  {name}: avg={histogram["sum"] / count:.4g} '
+                    f'p50<={get_histogram_percentile(histogram, 50)} p99<={get_histogram_percentile(histogram, 99)}'
+                )
+
+    def handle(self, *args, force_run, order_book, shard_count, shard_index, stats, **options):
+        if stats:
+            self.show_stats(shard_count)
+            return
+
+        if shard_count is None:
+            shard_count = settings.ORDER_PROCESSING_SHARD_COUNT
+        elif shard_count != settings.ORDER_PROCESSING_SHARD_COUNT:
+            # New order messages are published according to the setting, so the engine would miss some of them
+            logger.warning(
+                'Shard count %s differs from ORDER_PROCESSING_SHARD_COUNT=%s',
+                shard_count,
+                settings.ORDER_PROCESSING_SHARD_COUNT,
+            )
+
+        try:
+            shard = Shard(index=shard_index, count=shard_count)
+        except ValueError as ex:
+            raise CommandError(str(ex))
 
-    def handle(self, *args, force_run, **options):
         try:
-            OrderProcessingEngine().run(force=force_run)
+            OrderProcessingEngine(use_order_book=order_book, shard=shard).run(force=force_run)
         except ThenewbostonRuntimeError as ex:
             logger.error('Order processing engine failed: %s', ex)
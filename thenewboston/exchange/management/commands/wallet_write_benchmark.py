@@ -0,0 +1,65 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from thenewboston.exchange.order_processing.engine import order_processing_lock
+from thenewboston.exchange.order_processing.wallet_write_benchmark import (
+    WalletWriteBenchmarkData,
+    run_wallet_write_benchmark,
+)
+from thenewboston.general.exceptions import ThenewbostonRuntimeError
+
+MODES = {'legacy': (True,), 'current': (False,), 'both': (True, False)}
+
+
+class Command(BaseCommand):
+    help = 'Benchmark concurrent wallet writes with trade_at publication (creates data in the database)'  # noqa: A003
+
+    def add_arguments(self, parser):
+        parser.add_argument('--wallets', type=int, default=8, help='Number of concurrent writers (one wallet each)')
+        parser.add_argument('--writes', type=int, default=100, help='Number of writes per wallet')
+        parser.add_argument('--hold-ms', type=float, default=1.0, help='Extra time each write transaction takes')
+        parser.add_argument('--publish-interval-ms', type=float, default=10.0, help='trade_at publication interval')
+        parser.add_argument(
+            '--mode',
+            choices=tuple(MODES),
+            default='both',
+            help='legacy: OrderProcessingLock rows are selected for update, current: shared advisory lock',
+        )
+        parser.add_argument('--keep-data', action='store_true', help='Do not delete the benchmark data')
+        parser.add_argument('--json', action='store_true', dest='as_json', help='Output the report as JSON')
+        parser.add_argument('--force', action='store_true', help='Run even if DEBUG is off')
+
+    def handle(self, *args, wallets, writes, hold_ms, publish_interval_ms, mode, keep_data, as_json, force, **options):
+        if not settings.DEBUG and not force:
+            raise CommandError('The benchmark creates users, currencies and wallets, use --force to run with DEBUG off')
+
+        reports = {}
+        data = WalletWriteBenchmarkData.create(wallets)
+        try:
+            # The lock also guarantees that the benchmark is not run along with the real engine
+            with order_processing_lock():
+                for legacy in MODES[mode]:
+                    report = run_wallet_write_benchmark(
+                        data,
+                        writes,
+                        hold_seconds=hold_ms / 1000,
+                        publish_interval=publish_interval_ms / 1000,
+                        legacy=legacy,
+                    )
+                    reports['legacy' if legacy else 'current'] = report.as_dict()
+        except ThenewbostonRuntimeError as ex:
+            raise CommandError(f'Benchmark failed: {ex}')
+        finally:
+            if not keep_data:
+                data.cleanup()
+
+        if as_json:
+            self.stdout.write(json.dumps(reports, indent=2))
+            return
+
+        for name, report_dict in reports.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            for key, value in report_dict.items():
+                self.stdout.write(f'  {key}: {value:.3f}' if isinstance(value, float) else f'  {key}: {value}')
@@ -0,0 +1,16 @@
+# Generated by Django 5.2.1 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('exchange', '0005_exchangeorder_asset_pair_tradehistoryitem_asset_pair_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='exchangeorder',
+            index=models.Index(fields=['modified_date'], name='exchange_order_modified_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('exchange', '0006_exchangeorder_exchange_order_modified_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='orderprocessinglock',
+            name='shard',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.RemoveConstraint(
+            model_name='orderprocessinglock',
+            name='only_one_row_allowed',
+        ),
+        migrations.AddConstraint(
+            model_name='orderprocessinglock',
+            constraint=models.UniqueConstraint(fields=('shard',), name='only_one_row_per_shard_allowed'),
+        ),
+    ]
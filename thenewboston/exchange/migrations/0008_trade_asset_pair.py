@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('exchange', '0007_orderprocessinglock_shard'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trade',
+            name='asset_pair',
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name='trades',
+                to='exchange.assetpair',
+            ),
+        ),
+    ]
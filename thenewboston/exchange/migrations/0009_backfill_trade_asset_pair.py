@@ -0,0 +1,22 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:00
+
+from django.db import migrations
+
+
+def backfill_asset_pair(apps, schema_editor):
+    from thenewboston.exchange.business_logic.trade_asset_pair import backfill_trade_asset_pair
+
+    backfill_trade_asset_pair(apps.get_model('exchange', 'Trade'))
+
+
+class Migration(migrations.Migration):
+    # Every batch is committed separately, so the backfill does not hold locks on the trades until it is done
+    atomic = False
+
+    dependencies = [
+        ('exchange', '0008_trade_asset_pair'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_asset_pair, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:00
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False  # required by `CREATE INDEX CONCURRENTLY`
+
+    dependencies = [
+        ('exchange', '0009_backfill_trade_asset_pair'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='trade',
+            index=models.Index(fields=['asset_pair', 'created_date'], name='trade_asset_pair_created_idx'),
+        ),
+    ]
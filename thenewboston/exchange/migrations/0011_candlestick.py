@@ -0,0 +1,53 @@
+# Generated by Django 5.2.1 on 2026-10-18 15:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_candlesticks(apps, schema_editor):
+    from thenewboston.exchange.models.candlestick import rebuild_candlesticks
+
+    candlestick_model = apps.get_model('exchange', 'Candlestick')
+    trade_model = apps.get_model('exchange', 'Trade')
+    for asset_pair_id in apps.get_model('exchange', 'AssetPair').objects.values_list('id', flat=True):
+        rebuild_candlesticks(asset_pair_id, candlestick_model, trade_model)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('exchange', '0010_trade_asset_pair_created_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Candlestick',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resolution', models.PositiveIntegerField()),
+                ('bucket_start', models.DateTimeField()),
+                ('open', models.PositiveBigIntegerField()),
+                ('high', models.PositiveBigIntegerField()),
+                ('low', models.PositiveBigIntegerField()),
+                ('close', models.PositiveBigIntegerField()),
+                ('volume', models.PositiveBigIntegerField()),
+                ('open_date', models.DateTimeField()),
+                ('close_date', models.DateTimeField()),
+                (
+                    'asset_pair',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='candlesticks',
+                        to='exchange.assetpair',
+                    ),
+                ),
+            ],
+            options={
+                'constraints': [
+                    models.UniqueConstraint(
+                        fields=('asset_pair', 'resolution', 'bucket_start'), name='unique_candlestick'
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_candlesticks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-18 17:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('exchange', '0011_candlestick'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='orderprocessinglock',
+            name='shard_count',
+            field=models.PositiveSmallIntegerField(default=1),
+        ),
+    ]
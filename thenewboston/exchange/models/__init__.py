@@ -1,4 +1,5 @@
 from .asset_pair import AssetPair  # noqa: F401
+from .candlestick import Candlestick  # noqa: F401
 from .exchange_order import ExchangeOrder  # noqa: F401
 from .order_processing_lock import OrderProcessingLock  # noqa: F401
 from .trade import Trade  # noqa: F401
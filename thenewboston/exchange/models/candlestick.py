@@ -0,0 +1,140 @@
+from datetime import UTC, datetime
+
+from django.db import connection, transaction
+from django.db.models import (
+    CASCADE,
+    DateTimeField,
+    ForeignKey,
+    PositiveBigIntegerField,
+    PositiveIntegerField,
+    UniqueConstraint,
+)
+
+from thenewboston.general.managers import CustomManager
+from thenewboston.general.models.custom_model import CustomModel
+
+# In minutes. All of them divide a day, so buckets are aligned to (UTC) midnight
+CANDLESTICK_RESOLUTIONS = (5, 60, 360)
+
+# Trades may be added out of chronological order (for instance, by concurrent settlements), so the open and close
+# prices are taken from the earliest and the latest trades by time (ties go to the trade added later for the close)
+UPSERT_SQL = """
+INSERT INTO {table} (asset_pair_id, resolution, bucket_start, open, high, low, close, volume, open_date, close_date)
+VALUES {values}
+ON CONFLICT (asset_pair_id, resolution, bucket_start) DO UPDATE SET
+    open = CASE WHEN EXCLUDED.open_date < {table}.open_date THEN EXCLUDED.open ELSE {table}.open END,
+    high = GREATEST({table}.high, EXCLUDED.high),
+    low = LEAST({table}.low, EXCLUDED.low),
+    close = CASE WHEN EXCLUDED.close_date >= {table}.close_date THEN EXCLUDED.close ELSE {table}.close END,
+    volume = {table}.volume + EXCLUDED.volume,
+    open_date = LEAST({table}.open_date, EXCLUDED.open_date),
+    close_date = GREATEST({table}.close_date, EXCLUDED.close_date)
+"""
+
+# Candlesticks of the asset pair are deleted beforehand, so buckets without trades (anymore) do not remain
+REBUILD_SQL = """
+INSERT INTO {candlestick_table} (
+    asset_pair_id, resolution, bucket_start, open, high, low, close, volume, open_date, close_date
+)
+SELECT
+    asset_pair_id,
+    %(resolution)s,
+    to_timestamp(floor(extract(epoch FROM created_date) / %(seconds)s) * %(seconds)s),
+    (array_agg(price ORDER BY created_date, id))[1],
+    max(price),
+    min(price),
+    (array_agg(price ORDER BY created_date DESC, id DESC))[1],
+    sum(filled_quantity),
+    min(created_date),
+    max(created_date)
+FROM {trade_table}
+WHERE asset_pair_id = %(asset_pair_id)s
+GROUP BY asset_pair_id, 3
+"""
+
+
+def get_bucket_start(dt, resolution):
+    seconds = resolution * 60
+    timestamp = int(dt.timestamp())
+    return datetime.fromtimestamp(timestamp - timestamp % seconds, tz=UTC)
+
+
+def rebuild_candlesticks(asset_pair_id, candlestick_model, trade_model):
+    """
+    Recalculate candlesticks of the asset pair from the trades (models are arguments to be usable in data migrations).
+    """
+    sql = REBUILD_SQL.format(candlestick_table=candlestick_model._meta.db_table, trade_table=trade_model._meta.db_table)
+    with transaction.atomic(), connection.cursor() as cursor:
+        candlestick_model.objects.filter(asset_pair_id=asset_pair_id).delete()
+        for resolution in CANDLESTICK_RESOLUTIONS:
+            cursor.execute(sql, {'asset_pair_id': asset_pair_id, 'resolution': resolution, 'seconds': resolution * 60})
+
+
+class CandlestickManager(CustomManager):
+    def add_trades(self, trades):
+        """
+        Incrementally update candlesticks of all resolutions with the (just created) trades in a single query.
+        """
+        candlesticks: dict[tuple, list] = {}
+        for trade in trades:
+            if trade.asset_pair_id is None:
+                continue
+
+            price = trade.price
+            created_date = trade.created_date
+            for resolution in CANDLESTICK_RESOLUTIONS:
+                key = (trade.asset_pair_id, resolution, get_bucket_start(created_date, resolution))
+                if (candlestick := candlesticks.get(key)) is None:
+                    candlesticks[key] = [price, price, price, price, trade.filled_quantity, created_date, created_date]
+                    continue
+
+                if created_date < candlestick[5]:
+                    candlestick[0] = price
+                    candlestick[5] = created_date
+
+                candlestick[1] = max(candlestick[1], price)
+                candlestick[2] = min(candlestick[2], price)
+                if created_date >= candlestick[6]:
+                    candlestick[3] = price
+                    candlestick[6] = created_date
+
+                candlestick[4] += trade.filled_quantity
+
+        if not candlesticks:
+            return
+
+        # `ON CONFLICT DO UPDATE` cannot affect the same row twice, that is why we aggregate in Python first
+        params = [value for key, candlestick in candlesticks.items() for value in (*key, *candlestick)]
+        values = ', '.join(['(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)'] * len(candlesticks))
+        with connection.cursor() as cursor:
+            cursor.execute(UPSERT_SQL.format(table=self.model._meta.db_table, values=values), params)
+
+    def rebuild_for_asset_pair(self, asset_pair_id):
+        from .trade import Trade
+
+        rebuild_candlesticks(asset_pair_id, self.model, Trade)
+
+
+class Candlestick(CustomModel):
+    asset_pair = ForeignKey('AssetPair', on_delete=CASCADE, related_name='candlesticks')
+    resolution = PositiveIntegerField()  # in minutes
+    bucket_start = DateTimeField()
+
+    open = PositiveBigIntegerField()  # noqa: A003
+    high = PositiveBigIntegerField()
+    low = PositiveBigIntegerField()
+    close = PositiveBigIntegerField()
+    volume = PositiveBigIntegerField()
+    # Times of the trades the open and close prices are taken from
+    open_date = DateTimeField()
+    close_date = DateTimeField()
+
+    objects = CandlestickManager()
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(fields=['asset_pair', 'resolution', 'bucket_start'], name='unique_candlestick'),
+        ]
+
+    def __str__(self):
+        return f'{self.asset_pair_id} | {self.resolution}m | {self.bucket_start}'
@@ -1,10 +1,10 @@
-from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
 from django.db import transaction
 from django.db.models import (
     PROTECT,
     ForeignKey,
+    Index,
     IntegerChoices,
     PositiveBigIntegerField,
     PositiveSmallIntegerField,
@@ -13,13 +13,18 @@ from django.db.models import (
 from django.utils.translation import gettext_lazy as _
 from model_utils import FieldTracker
 
+from thenewboston.currencies.currency_cache import currency_cache
 from thenewboston.currencies.serializers.currency import CurrencyTinySerializer
-from thenewboston.general.clients.redis import get_redis_client
 from thenewboston.general.enums import MessageType, NotificationType
 from thenewboston.general.models.created_modified import AdjustableTimestampsModel
 from thenewboston.general.utils.database import apply_on_commit
+from thenewboston.general.utils.stream_buffer import stream_on_commit
 from thenewboston.notifications.models import Notification
-from thenewboston.wallets.models import Wallet
+from thenewboston.wallets.models import Wallet, WalletLedgerReason
+
+from ..asset_pair_registry import asset_pair_registry
+from ..order_processing.events import CANCEL_ORDER_EVENT, NEW_ORDER_EVENT, publish_order_event, serialize_order
+from ..price_levels import apply_price_level_changes_on_commit
 
 
 class ExchangeOrderSide(IntegerChoices):
@@ -35,7 +40,6 @@ class ExchangeOrderStatus(IntegerChoices):
 
 
 ORDER_PROCESSING_LOCK_ID = 1
-NEW_ORDER_EVENT = 'new_order'
 # We need `modified_date` to be in `CHANGEABLE_FIELDS` to allow timestamp adjustments
 CHANGEABLE_FIELDS = frozenset(('status', 'filled_quantity', 'modified_date'))  # type: ignore
 UNFILLED_STATUSES = (ExchangeOrderStatus.OPEN.value, ExchangeOrderStatus.PARTIALLY_FILLED.value)  # type: ignore
@@ -46,11 +50,6 @@ SOMEWHAT_FILLED_STATUSES = (
 FINAL_STATUSES = (ExchangeOrderStatus.FILLED.value, ExchangeOrderStatus.CANCELLED.value)  # type: ignore
 
 
-def publish_new_order_message():
-    # TODO(dmu) LOW: Consider adding the serialized order data to the message. For now it is not needed
-    get_redis_client().publish(settings.ORDER_PROCESSING_CHANNEL_NAME, NEW_ORDER_EVENT)
-
-
 class ExchangeOrder(AdjustableTimestampsModel):
     owner = ForeignKey('users.User', on_delete=PROTECT)
     asset_pair = ForeignKey('AssetPair', on_delete=PROTECT, related_name='exchange_orders', null=True)
@@ -65,6 +64,10 @@ class ExchangeOrder(AdjustableTimestampsModel):
 
     tracker = FieldTracker()
 
+    class Meta:
+        # Used for incremental synchronization of the order processing engine order books
+        indexes = [Index(fields=['modified_date'], name='exchange_order_modified_idx')]
+
     def _clean_status(self):
         if (
             # We are intentionally blind to re-entering the status, assume that in the that case we are just
@@ -88,7 +91,7 @@ class ExchangeOrder(AdjustableTimestampsModel):
             raise ValidationError([{currency_field: [f'{currency.ticker} wallet does not exist.']}])
 
         if total > wallet.balance:
-            # TODO(dmu) MEDIUM: Consider relying on `Wallet.change_balance` to raise an error
+            # This is an early check for a user friendly message, `Wallet.change_balance()` makes the final one
             raise ValidationError(
                 f'Total of {total} exceeds {wallet.currency.ticker} wallet balance of {wallet.balance}'
             )
@@ -108,32 +111,53 @@ class ExchangeOrder(AdjustableTimestampsModel):
     def unfilled_quantity(self):
         return self.quantity - self.filled_quantity
 
+    def get_price_level_changes(self) -> list[tuple[int, int, int, int]]:
+        """
+        Return changes of the aggregated order book caused by the (not yet saved) order changes as
+        `[(side, price, quantity_delta, count_delta), ...]`.
+        """
+        changes = []
+        if not self.is_adding():
+            previous = self.tracker.previous
+            if previous('status') in UNFILLED_STATUSES:
+                unfilled_quantity = previous('quantity') - previous('filled_quantity')
+                changes.append((previous('side'), previous('price'), -unfilled_quantity, -1))
+
+        if self.status in UNFILLED_STATUSES:
+            changes.append((self.side, self.price, self.unfilled_quantity, 1))
+
+        return changes
+
     def fill_order(self, quantity):
         assert 0 < quantity <= self.unfilled_quantity
         self.filled_quantity += quantity
         self.ensure_filled_status()
 
-    def notify_filled(self):
-        asset_pair = self.asset_pair
-        Notification(
-            owner=self.owner,
+    def make_filled_notification(self):
+        # Currencies are reference data, so they are resolved without database queries
+        primary_currency_id, secondary_currency_id = asset_pair_registry.get_currency_ids(self.asset_pair_id)
+        return Notification(
+            owner_id=self.owner_id,
             payload={
                 'notification_type': NotificationType.EXCHANGE_ORDER_FILLED.value,
                 'order_id': self.id,
                 'side': self.side,
                 'quantity': self.quantity,
                 'price': self.price,
-                'primary_currency': CurrencyTinySerializer(asset_pair.primary_currency).data,
-                'secondary_currency': CurrencyTinySerializer(asset_pair.secondary_currency).data,
+                'primary_currency': CurrencyTinySerializer(currency_cache.get_by_id(primary_currency_id)).data,
+                'secondary_currency': CurrencyTinySerializer(currency_cache.get_by_id(secondary_currency_id)).data,
             },
-        ).save(should_stream=True)
+        )
+
+    def notify_filled(self):
+        self.make_filled_notification().save(should_stream=True)
 
     def stream(self):
         from ..consumers.exchange_order import ExchangeOrderConsumer
         from ..serializers.exchange_order import ExchangeOrderReadSerializer
 
         asset_pair = self.asset_pair
-        apply_on_commit(
+        stream_on_commit(
             lambda order=self,
             primary_currency_id=asset_pair.primary_currency_id,
             secondary_currency_id=asset_pair.secondary_currency_id: ExchangeOrderConsumer.stream_exchange_order(
@@ -143,9 +167,17 @@ class ExchangeOrder(AdjustableTimestampsModel):
                 #                extract `primary_currency_id` and `secondary_currency_id` and then serialized
                 primary_currency_id=primary_currency_id,
                 secondary_currency_id=secondary_currency_id,
-            )
+            ),
+            dedupe_key=('exchange_order', self.pk),  # only the latest order state is streamed
         )
 
+    def update_price_levels(self, changes):
+        apply_price_level_changes_on_commit(self.asset_pair_id, changes)
+
+    def publish_event(self, event):
+        # The order is serialized right away to publish its state as of the moment of the change
+        apply_on_commit(lambda order_data=serialize_order(self): publish_order_event(event, order_data))
+
     def ensure_filled_status(self):
         if self.has_changed('filled_quantity'):
             # We purposefully change status back to PARTIALLY_FILLED or OPEN in case of `filled_quantity` reduction
@@ -163,14 +195,15 @@ class ExchangeOrder(AdjustableTimestampsModel):
         return unfilled_quantity, 'primary_currency'
 
     def get_debit_wallet(self, currency):
-        return Wallet.objects.filter(owner=self.owner, currency=currency).select_for_update().get_or_none()
+        # The wallet is not selected for update, because the balance is changed atomically
+        return Wallet.objects.filter(owner=self.owner, currency=currency).get_or_none()
 
     def handle_cancel(self):
         assert transaction.get_connection().in_atomic_block
         assert self.status == ExchangeOrderStatus.CANCELLED.value
         refund_amount, refund_currency_field = self.get_unfilled_total_and_currency_field()
         wallet = self.get_debit_wallet(getattr(self.asset_pair, refund_currency_field))
-        wallet.change_balance(refund_amount)
+        wallet.change_balance(refund_amount, reason=WalletLedgerReason.ORDER, reference=self)
 
     def cancel(self):
         self.status = ExchangeOrderStatus.CANCELLED.value
@@ -195,17 +228,21 @@ class ExchangeOrder(AdjustableTimestampsModel):
 
             # We just assert assuming the `._clean_wallet_balance_for_reservation()` has been called before
             assert wallet
-            assert total <= wallet.balance
-
-            wallet.change_balance(-total)
+            # The balance may have been changed concurrently since the validation, so `.change_balance()` fails
+            # if there is not enough balance anymore (the order is not saved yet, so it cannot be referenced)
+            wallet.change_balance(-total, reason=WalletLedgerReason.ORDER)
 
+        price_level_changes = self.get_price_level_changes()
         rv = super().save(*args, should_adjust_timestamps=should_adjust_timestamps, **kwargs)
+        if had_changes:
+            self.update_price_levels(price_level_changes)
 
         if was_status_changed and self.status == ExchangeOrderStatus.CANCELLED.value:
             self.handle_cancel()  # we already have the status
+            self.publish_event(CANCEL_ORDER_EVENT)
 
         if was_adding:
-            apply_on_commit(publish_new_order_message)
+            self.publish_event(NEW_ORDER_EVENT)
 
         if had_changes:
             self.stream()  # TODO(dmu) MEDIUM: Should we stream on order creation?
@@ -1,16 +1,87 @@
+import logging
+import time
 import uuid
 
-from django.db import models
-from django.db.models import UniqueConstraint, Value
+from django.db import connection, models
+from django.db.models import UniqueConstraint
 
 from thenewboston.general.models.custom_model import CustomModel
 
+# Transaction level advisory lock key for `trade_at` reads ('trad' in ASCII). It is positive, so it does not
+# collide with per row lock keys (see `make_advisory_lock_expression()`)
+TRADE_AT_LOCK_KEY = 0x74726164
+TRADE_AT_READERS_POLL_INTERVAL_SECONDS = 0.001
+# Readers are waited for as long as it takes (the `trade_at` guarantee relies on it), but slow ones are reported
+TRADE_AT_READERS_WARNING_SECONDS = 5
+
+# Virtual transaction IDs of other transactions holding the `trade_at` lock (the key fits into 32 bits, so `classid`
+# is 0, while `objsubid` is 1 for single bigint key advisory locks). Advisory locks are per database, so locks taken
+# in other databases of the cluster are not ours
+TRADE_AT_READERS_SQL = f"""
+SELECT virtualtransaction
+FROM pg_locks
+WHERE locktype = 'advisory' AND classid = 0 AND objid = {TRADE_AT_LOCK_KEY} AND objsubid = 1
+    AND database = (SELECT oid FROM pg_database WHERE datname = current_database())
+    AND granted AND pid <> pg_backend_pid()
+    AND (%(virtualtransactions)s::text[] IS NULL OR virtualtransaction = ANY(%(virtualtransactions)s::text[]))
+"""
+
+logger = logging.getLogger(__name__)
+
 
 class OrderProcessingLock(CustomModel):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)  # noqa: A003
+    # See `thenewboston.exchange.order_processing.sharding.Shard` (0 for non-sharded setup)
+    shard = models.PositiveSmallIntegerField(default=0)
+    # All running engines must use the same shard count, otherwise they may process the same asset pairs
+    shard_count = models.PositiveSmallIntegerField(default=1)
     acquired_at = models.DateTimeField(null=True, blank=True)
     trade_at = models.DateTimeField(null=True, blank=True)
     extra = models.JSONField(null=True, blank=True)
 
     class Meta:
-        constraints = [UniqueConstraint(Value(1), name='only_one_row_allowed')]
+        constraints = [UniqueConstraint(fields=['shard'], name='only_one_row_per_shard_allowed')]
+
+
+def wait_for_trade_at_readers():
+    """
+    Wait for the transactions that may have read the previous `trade_at` (see `get_published_trade_at()`) to finish.
+    It must be called once the new `trade_at` is committed, so later readers get the new value and are not waited for.
+    Readers are looked up in `pg_locks` instead of requesting the lock exclusively, because new shared lock requests
+    would queue behind the exclusive one, so writers would be blocked for as long as the slowest reader.
+    """
+    virtualtransactions = None  # all readers at first, then the remaining ones of them
+    started_at = time.monotonic()
+    warn_at = started_at + TRADE_AT_READERS_WARNING_SECONDS
+    with connection.cursor() as cursor:
+        while True:
+            cursor.execute(TRADE_AT_READERS_SQL, {'virtualtransactions': virtualtransactions})
+            if not (virtualtransactions := [row[0] for row in cursor.fetchall()]):
+                return
+
+            if (now := time.monotonic()) >= warn_at:
+                logger.warning(
+                    'Waiting for trade_at readers for %.1f seconds, remaining: %s',
+                    now - started_at,
+                    ', '.join(virtualtransactions),
+                )
+                warn_at = now + TRADE_AT_READERS_WARNING_SECONDS
+
+            time.sleep(TRADE_AT_READERS_POLL_INTERVAL_SECONDS)
+
+
+def get_published_trade_at():
+    """
+    Return the latest `trade_at` of all shards. The value can be relied on until the end of the current transaction:
+    the engine does not trade at a newer `trade_at` until then (see `wait_for_trade_at_readers()`). The shared lock
+    only marks the transaction as a reader: nobody takes it exclusively, so it never blocks.
+    """
+    assert connection.in_atomic_block
+    with connection.cursor() as cursor:
+        # Separate statements (but one round trip), because in READ COMMITTED mode the snapshot is taken at statement
+        # start, so we must read `trade_at` after the lock is acquired. Result of the last statement is returned
+        cursor.execute(
+            f'SELECT pg_advisory_xact_lock_shared(%s); SELECT max(trade_at) FROM {OrderProcessingLock._meta.db_table}',
+            [TRADE_AT_LOCK_KEY],
+        )
+        return cursor.fetchone()[0]
@@ -3,20 +3,22 @@ import logging
 from django.db import models
 from model_utils import FieldTracker
 
-from thenewboston.exchange.tasks import update_trade_history_for_currency_pair_task
+from thenewboston.currencies.currency_cache import currency_cache
+from thenewboston.exchange.business_logic.trade_history_updates import request_trade_history_update_on_commit
 from thenewboston.general.enums import MessageType
 from thenewboston.general.managers import CustomManager, CustomQuerySet
 from thenewboston.general.models.created_modified import AdjustableTimestampsModel
-from thenewboston.general.utils.celery import run_task_on_commit
-from thenewboston.general.utils.database import apply_on_commit
+from thenewboston.general.utils.stream_buffer import stream_on_commit
+
+from ..asset_pair_registry import asset_pair_registry
+from .candlestick import Candlestick
 
 logger = logging.getLogger(__name__)
 
 
 class TradeQuerySet(CustomQuerySet):
     def filter_by_asset_pair(self, asset_pair_id):
-        # TODO(dmu) LOW: We can optimize performance by storing the asset pair in the Trade model
-        return self.filter(buy_order__asset_pair_id=asset_pair_id)
+        return self.filter(asset_pair_id=asset_pair_id)
 
 
 class TradeManager(CustomManager.from_queryset(TradeQuerySet)):  # type: ignore
@@ -27,6 +29,8 @@ class Trade(AdjustableTimestampsModel):
     # TODO(dmu) HIGH: Consider not allowing order deletion if there were traded
     buy_order = models.ForeignKey('exchange.ExchangeOrder', related_name='buy_trades', on_delete=models.CASCADE)
     sell_order = models.ForeignKey('exchange.ExchangeOrder', related_name='sell_trades', on_delete=models.CASCADE)
+    # Denormalized from the orders (they are always of the same asset pair) to avoid joins on trade history and charts
+    asset_pair = models.ForeignKey('exchange.AssetPair', related_name='trades', on_delete=models.PROTECT, null=True)
     filled_quantity = models.PositiveBigIntegerField()
     price = models.PositiveBigIntegerField()
     overpayment_amount = models.PositiveBigIntegerField()
@@ -34,6 +38,9 @@ class Trade(AdjustableTimestampsModel):
     objects = TradeManager()
     tracker = FieldTracker()
 
+    class Meta:
+        indexes = [models.Index(fields=['asset_pair', 'created_date'], name='trade_asset_pair_created_idx')]
+
     def __str__(self):
         return (
             f'Trade ID: {self.pk} | '
@@ -44,25 +51,31 @@ class Trade(AdjustableTimestampsModel):
             f'Overpayment Amount: {self.overpayment_amount}'
         )
 
+    def stream(self):
+        from ..consumers.trade import TradeConsumer
+        from ..serializers.trade import TradeSerializer
+
+        # Resolved from the process-local caches, so streaming a trade does not load the asset pair and the currency
+        primary_currency_id, _ = asset_pair_registry.get_currency_ids(self.asset_pair_id)
+        ticker = currency_cache.get_by_id(primary_currency_id).ticker
+        stream_on_commit(
+            lambda trade=self, ticker=ticker: TradeConsumer.stream_trade(
+                message_type=MessageType.CREATE_TRADE, trade_data=TradeSerializer(trade).data, ticker=ticker
+            )
+        )
+
     def save(self, *args, **kwargs):
         # In most cases we do not need to adjust timestamps for trades, because they are the origin of trade time
         kwargs.setdefault('should_adjust_timestamps', False)
         was_adding = self.is_adding()
+        if self.asset_pair_id is None:
+            self.asset_pair_id = self.buy_order.asset_pair_id
+
         rv = super().save(*args, **kwargs)
 
         if was_adding:
-            from ..consumers.trade import TradeConsumer
-            from ..serializers.trade import TradeSerializer
-
-            buy_order = self.buy_order
-            run_task_on_commit(update_trade_history_for_currency_pair_task, asset_pair_id=buy_order.asset_pair_id)
-            apply_on_commit(
-                # TODO(dmu) LOW: Add comment explaining why `self.sell_order.asset_pair.primary_currency` ticker
-                #                is used not, but not `self.buy_order.asset_pair.primary_currency`
-                lambda trade=self,
-                ticker=self.sell_order.asset_pair.primary_currency.ticker: TradeConsumer.stream_trade(
-                    message_type=MessageType.CREATE_TRADE, trade_data=TradeSerializer(trade).data, ticker=ticker
-                )
-            )
+            Candlestick.objects.add_trades((self,))
+            request_trade_history_update_on_commit((self.asset_pair_id,))
+            self.stream()
 
         return rv  # return value for forward compatibility
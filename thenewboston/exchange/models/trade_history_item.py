@@ -1,23 +1,45 @@
-from datetime import timedelta
+from datetime import UTC, datetime, timedelta
 
 from django.contrib.postgres.fields import ArrayField
-from django.db.models import CASCADE, FloatField, OneToOneField, PositiveBigIntegerField, Sum
+from django.db import connection
+from django.db.models import CASCADE, FloatField, OneToOneField, PositiveBigIntegerField
 from django.utils import timezone
 
-from thenewboston.currencies.models.currency import get_total_amount_minted
+from thenewboston.currencies.models import Currency
 from thenewboston.exchange.models import AssetPair
 from thenewboston.general.managers import CustomManager
 from thenewboston.general.models.created_modified import CreatedModified
 
-
-def get_past_price(asset_pair_id, recency: timedelta | None = None, now=None):
-    from .trade import Trade
-
-    qs = Trade.objects.filter_by_asset_pair(asset_pair_id)
-    if recency:
-        qs = qs.filter(created_date__lte=(now or timezone.now()) - recency)
-
-    return qs.order_by('-created_date').values_list('price', flat=True).first()
+# The latest trade price before each cutoff is found with an index seek (see `trade_asset_pair_created_idx`) per
+# asset pair, so the number of queries does not depend on the number of asset pairs
+ROLLUP_SQL = """
+SELECT
+    asset_pair.id,
+    prices.prices,
+    (
+        SELECT coalesce(sum(trade.filled_quantity), 0)
+        FROM {trade_table} trade
+        WHERE trade.asset_pair_id = asset_pair.id AND trade.created_date >= %(volume_since)s
+    ),
+    currency.total_minted
+FROM {asset_pair_table} asset_pair
+JOIN {currency_table} currency ON currency.id = asset_pair.primary_currency_id
+CROSS JOIN LATERAL (
+    SELECT array_agg(trade.price ORDER BY cutoffs.cutoff_index) AS prices
+    FROM unnest(%(cutoffs)s::timestamptz[]) WITH ORDINALITY AS cutoffs(cutoff, cutoff_index)
+    LEFT JOIN LATERAL (
+        SELECT trade.price
+        FROM {trade_table} trade
+        WHERE trade.asset_pair_id = asset_pair.id AND trade.created_date <= cutoffs.cutoff
+        ORDER BY trade.created_date DESC, trade.id DESC
+        LIMIT 1
+    ) trade ON true
+) prices
+WHERE prices.prices[1] IS NOT NULL {asset_pair_filter}
+"""
+
+CHANGE_RECENCIES = (timedelta(hours=1), timedelta(hours=24), timedelta(hours=24 * 7))
+SPARKLINE_RECENCIES = tuple(timedelta(hours=offset) for offset in range(24 * 7 - 6, 0, -6))
 
 
 def calculate_change_percent(current_price, past_price):
@@ -29,43 +51,72 @@ def calculate_change_percent(current_price, past_price):
 
 class TradeHistoryItemManager(CustomManager):
     def update_for_currency_pair(self, asset_pair_id):
-        from .trade import Trade
+        self.update_for_asset_pairs((asset_pair_id,))
 
-        if (current_price := get_past_price(asset_pair_id)) is None:
-            # TODO(dmu) LOW: This is questionable behavior: what if we deleted all trades and
-            #                want trade history selfheal?
-            return  # we do not do anything if there were no trades at all
+    def update_for_asset_pairs(self, asset_pair_ids=None):
+        """
+        Update trade history items of the asset pairs (all of them if `asset_pair_ids` is `None`) that had trades
+        with one rollup query and one bulk upsert.
+        """
+        from .trade import Trade
 
         now = timezone.now()  # bind to the same moment for consistency
-        sparkline = [
-            get_past_price(asset_pair_id, recency=timedelta(hours=offset), now=now)
-            for offset in range(24 * 7 - 6, 0, -6)
-        ]
-        sparkline.append(current_price)
-
-        asset_pair = AssetPair.objects.get(id=asset_pair_id)
-        defaults = {
-            'price': current_price,
-            'change_1h': calculate_change_percent(
-                current_price, get_past_price(asset_pair_id, recency=timedelta(hours=1), now=now)
-            )
-            or 0,
-            'change_24h': calculate_change_percent(
-                current_price, get_past_price(asset_pair_id, recency=timedelta(hours=24), now=now)
+        recencies = CHANGE_RECENCIES + SPARKLINE_RECENCIES
+        # The first cutoff is for the current price
+        cutoffs = [datetime.max.replace(tzinfo=UTC)] + [now - recency for recency in recencies]
+        params = {'cutoffs': cutoffs, 'volume_since': now - timedelta(hours=24)}
+
+        asset_pair_filter = ''
+        if asset_pair_ids is not None:
+            asset_pair_filter = 'AND asset_pair.id = ANY(%(asset_pair_ids)s::bigint[])'
+            params['asset_pair_ids'] = list(asset_pair_ids)
+
+        sql = ROLLUP_SQL.format(
+            trade_table=Trade._meta.db_table,
+            currency_table=Currency._meta.db_table,
+            asset_pair_table=AssetPair._meta.db_table,
+            asset_pair_filter=asset_pair_filter,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+        change_count = len(CHANGE_RECENCIES)
+        items = []
+        for asset_pair_id, (current_price, *past_prices), volume_24h, total_amount_minted in rows:
+            change_1h, change_24h, change_7d = (
+                calculate_change_percent(current_price, past_price) or 0 for past_price in past_prices[:change_count]
             )
-            or 0,
-            'change_7d': calculate_change_percent(
-                current_price, get_past_price(asset_pair_id, recency=timedelta(hours=24 * 7), now=now)
+            items.append(
+                self.model(
+                    asset_pair_id=asset_pair_id,
+                    price=current_price,
+                    change_1h=change_1h,
+                    change_24h=change_24h,
+                    change_7d=change_7d,
+                    volume_24h=volume_24h,
+                    market_cap=current_price * total_amount_minted,
+                    sparkline=past_prices[change_count:] + [current_price],
+                )
             )
-            or 0,
-            'volume_24h': Trade.objects.filter_by_asset_pair(asset_pair_id)
-            .filter(created_date__gte=now - timedelta(hours=24))
-            .aggregate(volume=Sum('filled_quantity'))['volume']
-            or 0,
-            'market_cap': current_price * get_total_amount_minted(asset_pair.primary_currency_id),
-            'sparkline': sparkline,
-        }
-        self.update_or_create(asset_pair_id=asset_pair_id, defaults=defaults)
+
+        # TODO(dmu) LOW: Asset pairs without trades are not updated. This is questionable behavior: what if we
+        #                deleted all trades and want trade history selfheal?
+        self.bulk_create(
+            items,
+            update_conflicts=True,
+            unique_fields=('asset_pair',),
+            update_fields=(
+                'price',
+                'change_1h',
+                'change_24h',
+                'change_7d',
+                'volume_24h',
+                'market_cap',
+                'sparkline',
+                'modified_date',
+            ),
+        )
 
 
 class TradeHistoryItem(CreatedModified):
@@ -0,0 +1,286 @@
+"""
+Order processing engine benchmark: synthetic order flow generator and a harness that drives the engine.
+
+The harness submits orders the same way the API does (so wallet reservation, timestamps adjustment and order events
+are included), runs engine iterations the same way `OrderProcessingEngine._run_impl()` does and measures only
+what happens inside the iterations.
+"""
+
+import logging
+import math
+import random
+import string
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Literal
+
+from django.db import connection, transaction
+
+from thenewboston.currencies.models import Currency
+from thenewboston.general.clients.redis import get_redis_client
+from thenewboston.users.models import User
+from thenewboston.wallets.models import Wallet
+
+from ..models import AssetPair, ExchangeOrder, Trade
+from ..models.exchange_order import UNFILLED_STATUSES, ExchangeOrderSide
+from .engine import OrderProcessingEngine
+from .metrics import QueryStats
+
+BUY = ExchangeOrderSide.BUY.value  # type: ignore
+SELL = ExchangeOrderSide.SELL.value  # type: ignore
+TRADER_WALLET_BALANCE = 10**15
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OrderFlowConfig:
+    pairs: int = 1
+    traders: int = 10
+    orders: int = 1000
+    burst_size: int = 10  # orders submitted between engine iterations
+    cancel_rate: float = 0.1  # probability of cancelling one of the previous orders after submitting an order
+    price_distribution: Literal['normal', 'uniform'] = 'normal'
+    price_mean: int = 1000
+    price_spread: int = 20  # standard deviation for normal distribution, half-width for uniform
+    price_drift: float = 1.0  # standard deviation of mid price random walk step (per order)
+    max_quantity: int = 10
+    seed: int = 0
+
+
+@dataclass(frozen=True)
+class OrderSpec:
+    pair_index: int
+    trader_index: int
+    side: int
+    price: int
+    quantity: int
+
+
+@dataclass(frozen=True)
+class CancelSpec:
+    order_index: int  # index of previously generated `OrderSpec`
+
+
+class OrderFlowGenerator:
+    """
+    Deterministic (for the given seed) stream of order bursts. Buy orders are centered below and sell orders above
+    the mid price of the pair, so only the tails of the distributions cross, like it happens on a real exchange.
+    """
+
+    def __init__(self, config: OrderFlowConfig):
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.mid_prices = [float(config.price_mean)] * config.pairs
+        self.orders_generated = 0
+
+    def get_price(self, pair_index, side) -> int:
+        config = self.config
+        mid_price = self.mid_prices[pair_index] = max(
+            self.mid_prices[pair_index] + self.random.gauss(0, config.price_drift), 1
+        )
+        center = mid_price - config.price_spread / 2 if side == BUY else mid_price + config.price_spread / 2
+        if config.price_distribution == 'uniform':
+            price = self.random.uniform(center - config.price_spread, center + config.price_spread)
+        else:
+            price = self.random.gauss(center, config.price_spread)
+
+        return max(round(price), 1)
+
+    def generate_order(self) -> OrderSpec:
+        config = self.config
+        pair_index = self.random.randrange(config.pairs)
+        side = self.random.choice((BUY, SELL))
+        self.orders_generated += 1
+        return OrderSpec(
+            pair_index=pair_index,
+            trader_index=self.random.randrange(config.traders),
+            side=side,
+            price=self.get_price(pair_index, side),
+            quantity=self.random.randint(1, config.max_quantity),
+        )
+
+    def __iter__(self):
+        config = self.config
+        while self.orders_generated < config.orders:
+            burst: list[OrderSpec | CancelSpec] = []
+            for _ in range(min(config.burst_size, config.orders - self.orders_generated)):
+                burst.append(self.generate_order())
+                if self.random.random() < config.cancel_rate:
+                    burst.append(CancelSpec(order_index=self.random.randrange(self.orders_generated)))
+
+            yield burst
+
+
+@dataclass
+class BenchmarkData:
+    users: list[User]
+    asset_pairs: list[AssetPair]
+
+    @classmethod
+    def create(cls, config: OrderFlowConfig):
+        assert config.pairs <= 1000  # tickers are limited to 5 characters
+        with transaction.atomic():
+            # Currency tickers and usernames must be unique
+            while True:
+                tag = ''.join(random.choices(string.ascii_uppercase, k=2))
+                if not Currency.objects.filter(ticker__startswith=tag).exists():
+                    break
+
+            users = [User.objects.create(username=f'benchmark_{tag}_{index}') for index in range(config.traders)]
+            owner = users[0]
+            quote_currency = Currency.objects.create(owner=owner, ticker=f'{tag}Q', logo='images/benchmark.png')
+            asset_pairs = [
+                AssetPair.objects.create(
+                    primary_currency=Currency.objects.create(
+                        owner=owner, ticker=f'{tag}{index:03d}', logo='images/benchmark.png'
+                    ),
+                    secondary_currency=quote_currency,
+                )
+                for index in range(config.pairs)
+            ]
+            currencies = [quote_currency, *(asset_pair.primary_currency for asset_pair in asset_pairs)]
+            Wallet.objects.bulk_create(
+                Wallet(owner=user, currency=currency, balance=TRADER_WALLET_BALANCE)
+                for user in users
+                for currency in currencies
+            )
+
+        return cls(users=users, asset_pairs=asset_pairs)
+
+    def cleanup(self):
+        with transaction.atomic():
+            # Trades are deleted by cascade, the rest (currencies, asset pairs, wallets, notifications, etc)
+            # is deleted by cascade on users deletion
+            ExchangeOrder.objects.filter(owner__in=self.users).delete()
+            User.objects.filter(id__in=[user.id for user in self.users]).delete()
+
+
+def get_percentile(sorted_values, percentile) -> float | None:
+    if not sorted_values:
+        return None
+
+    return sorted_values[max(math.ceil(percentile / 100 * len(sorted_values)) - 1, 0)]
+
+
+@dataclass
+class BenchmarkReport:
+    orders: int = 0
+    cancels: int = 0
+    trades: int = 0
+    iterations: int = 0
+    elapsed_seconds: float = 0.0  # time spent in the engine iterations
+    queries: int = 0
+    lock_wait_seconds: float = 0.0
+    latencies: list[float] = field(default_factory=list, repr=False)
+
+    @property
+    def trades_per_second(self):
+        return self.trades / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def queries_per_trade(self):
+        return self.queries / self.trades if self.trades else None
+
+    def get_latency_ms(self, percentile):
+        latency = get_percentile(sorted(self.latencies), percentile)
+        return None if latency is None else latency * 1000
+
+    def as_dict(self):
+        rv = asdict(self)
+        del rv['latencies']
+        rv.update(
+            trades_per_second=self.trades_per_second,
+            queries_per_trade=self.queries_per_trade,
+            latency_p50_ms=self.get_latency_ms(50),
+            latency_p99_ms=self.get_latency_ms(99),
+        )
+        return rv
+
+
+def submit_order(spec: OrderSpec, data: BenchmarkData) -> ExchangeOrder:
+    with transaction.atomic():
+        order = ExchangeOrder(
+            owner=data.users[spec.trader_index],
+            asset_pair=data.asset_pairs[spec.pair_index],
+            side=spec.side,
+            price=spec.price,
+            quantity=spec.quantity,
+        )
+        order.save()
+
+    return order
+
+
+def cancel_order(order_id) -> bool:
+    with transaction.atomic():
+        order = ExchangeOrder.objects.select_for_update().get(id=order_id)
+        if order.status not in UNFILLED_STATUSES:
+            return False
+
+        order.cancel()
+
+    return True
+
+
+def run_benchmark(config: OrderFlowConfig, data: BenchmarkData, use_order_book=False) -> BenchmarkReport:
+    """
+    Run the benchmark, the order processing lock must be acquired by the caller.
+
+    Order-to-trade latency is measured from the moment the order is committed to the end of the iteration that
+    made a trade with it (for the later order of the two, since the earlier one was just waiting in the book).
+    """
+    engine = OrderProcessingEngine(hook_signals=False, use_order_book=use_order_book)
+    report = BenchmarkReport()
+    query_stats = QueryStats()
+
+    order_ids: list[int] = []
+    submitted_at: dict[int, float] = {}
+    asset_pair_ids = [asset_pair.id for asset_pair in data.asset_pairs]
+    last_trade_id = Trade.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+    pubsub = get_redis_client().pubsub()
+    pubsub.subscribe(engine.shard.channel_name)
+    try:
+        for burst in OrderFlowGenerator(config):
+            for spec in burst:
+                if isinstance(spec, CancelSpec):
+                    report.cancels += cancel_order(order_ids[spec.order_index])
+                    continue
+
+                order = submit_order(spec, data)
+                submitted_at[order.id] = time.perf_counter()
+                order_ids.append(order.id)
+                report.orders += 1
+
+            # The same way as `OrderProcessingEngine._run_impl()` does
+            message = pubsub.get_message(ignore_subscribe_messages=True, timeout=0.1)
+            events = None if message is None else engine.receive_events(pubsub, message)
+
+            start = time.perf_counter()
+            with connection.execute_wrapper(query_stats):
+                report.iterations += 1
+                while engine.run_iteration(events):
+                    report.iterations += 1
+                    events = None
+
+            finished_at = time.perf_counter()
+            report.elapsed_seconds += finished_at - start
+
+            # The engine may also trade orders of other asset pairs (that are not submitted by the benchmark)
+            trades = (
+                Trade.objects.filter(id__gt=last_trade_id, asset_pair_id__in=asset_pair_ids)
+                .order_by('id')
+                .values_list('id', 'buy_order_id', 'sell_order_id')
+            )
+            for last_trade_id, buy_order_id, sell_order_id in trades:
+                report.trades += 1
+                report.latencies.append(finished_at - max(submitted_at[buy_order_id], submitted_at[sell_order_id]))
+    finally:
+        pubsub.unsubscribe()
+        pubsub.close()
+
+    report.queries = query_stats.queries
+    report.lock_wait_seconds = query_stats.lock_wait_seconds
+    logger.info('Benchmark finished: %s', report)
+    return report
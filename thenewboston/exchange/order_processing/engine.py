@@ -10,27 +10,33 @@ from itertools import chain
 
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
-from django.db import IntegrityError, transaction
+from django.db import IntegrityError, connection, transaction
 from django.db.models import Case, ExpressionWrapper, F, FloatField, IntegerField, Max, Min, Q, When, Window
 from django.utils import timezone
 
 from thenewboston.general.clients.redis import get_redis_client
 from thenewboston.general.exceptions import ThenewbostonRuntimeError
 from thenewboston.general.misc import ExtractEpoch
+from thenewboston.general.utils.database import apply_on_commit
 from thenewboston.general.utils.logging import log
 from thenewboston.general.utils.pytest import is_pytest_running
-from thenewboston.wallets.models import Wallet
+from thenewboston.wallets.models import Wallet, WalletLedgerReason
 
+from ..asset_pair_registry import asset_pair_registry
 from ..models import OrderProcessingLock, Trade
 from ..models.exchange_order import (
-    NEW_ORDER_EVENT,
     ORDER_PROCESSING_LOCK_ID,
-    SOMEWHAT_FILLED_STATUSES,
     UNFILLED_STATUSES,
     ExchangeOrder,
     ExchangeOrderSide,
     ExchangeOrderStatus,
 )
+from ..models.order_processing_lock import wait_for_trade_at_readers
+from .events import CANCEL_ORDER_EVENT, OrderEvent, OrderEventReader
+from .metrics import EngineMetrics, record_candidate_orders, record_trades
+from .order_book import AssetPairOrderBook, OrderBooks
+from .settlement import TradeSettlement, fill_orders
+from .sharding import DEFAULT_SHARD, Shard
 
 GET_MESSAGE_ITERATION_TIMEOUT_SECONDS = 1
 BUY = ExchangeOrderSide.BUY.value  # type: ignore
@@ -38,7 +44,7 @@ SELL = ExchangeOrderSide.SELL.value  # type: ignore
 logger = logging.getLogger(__name__)
 
 
-def update_wallet(owner, currency, amount, trade_at):
+def update_wallet(owner, currency_id, amount, trade_at):
     defaults = {'balance': amount, 'created_date': trade_at, 'modified_date': trade_at}
     # TODO(dmu) HIGH: If wallet is created then the balance update is not stream. It would be more consistent to
     #                 actually stream it because balance was changed from nothing to something particular
@@ -46,16 +52,15 @@ def update_wallet(owner, currency, amount, trade_at):
     #                     but with `.get_or_create()` reuse there a conditional related to `internal` and `external`
     #                     currencies. Is it an overlook in the original implementation or intentional? Fix or just
     #                     remove this comment.
+    # The wallet is not selected for update, because the balance is changed atomically (the `UPDATE` locks the row
+    # until the end of the transaction anyway)
     wallet, is_created = Wallet.objects.get_or_create(
-        owner=owner, currency=currency, defaults=defaults, _for_update=True
+        owner=owner, currency_id=currency_id, defaults=defaults, ledger_reason=WalletLedgerReason.TRADE
     )
     if not is_created:
-        defaults.pop('balance', None)
-        for attr, value in defaults.items():
-            setattr(wallet, attr, value)
-
+        wallet.modified_date = trade_at
         # We should not adjust timestamps because the wallet update happens within the trade
-        wallet.change_balance(amount, should_adjust_timestamps=False)
+        wallet.change_balance(amount, should_adjust_timestamps=False, reason=WalletLedgerReason.TRADE)
 
     return wallet
 
@@ -87,27 +92,17 @@ def advance_to_next_pair(current_index: int, potentially_matching_orders: list[E
 
 
 def make_trade(sell_order, buy_order, trade_at):
-    trade_price = sell_order.price
-    overpay_price = buy_order.price - trade_price
-    assert overpay_price >= 0  # covers `assert sell_order.price <= buy_order.price`
-
-    filled_quantity = min(sell_order.unfilled_quantity, buy_order.unfilled_quantity)
-    sell_order.fill_order(filled_quantity)
-    assert sell_order.status in SOMEWHAT_FILLED_STATUSES
-    buy_order.fill_order(filled_quantity)
-    assert buy_order.status in SOMEWHAT_FILLED_STATUSES
-
-    assert sell_order.unfilled_quantity == 0 or buy_order.unfilled_quantity == 0
-    assert sell_order.status == ExchangeOrderStatus.FILLED.value or buy_order.status == ExchangeOrderStatus.FILLED.value
-
-    overpayment_amount = overpay_price * filled_quantity
+    trade_price, filled_quantity, overpayment_amount = fill_orders(sell_order, buy_order)
 
     logger.debug('Trading at %s (quantity: %s): "%s" vs "%s"', trade_price, filled_quantity, buy_order, sell_order)
+    # Trades are counted once they are committed, so rolled back iterations do not inflate the metrics
+    apply_on_commit(record_trades)
     # TODO(dmu) MEDIUM: Figure out the best order of saving trade, wallet and orders updates, because it affects
     #                   the order of events being streamed to the clients
     Trade.objects.create(
         buy_order=buy_order,
         sell_order=sell_order,
+        asset_pair_id=buy_order.asset_pair_id,
         filled_quantity=filled_quantity,
         price=trade_price,
         overpayment_amount=overpayment_amount,
@@ -115,30 +110,29 @@ def make_trade(sell_order, buy_order, trade_at):
         modified_date=trade_at,
     )
 
+    buy_order.modified_date = trade_at
+    buy_order.save(should_adjust_timestamps=False)
+    sell_order.modified_date = trade_at
+    sell_order.save(should_adjust_timestamps=False)
+
     buy_order_owner = buy_order.owner
     assert buy_order.asset_pair_id == sell_order.asset_pair_id
-    asset_pair = buy_order.asset_pair
-    primary_currency = asset_pair.primary_currency
-    secondary_currency = asset_pair.secondary_currency
+    primary_currency_id, secondary_currency_id = asset_pair_registry.get_currency_ids(buy_order.asset_pair_id)
 
-    update_wallet(buy_order_owner, primary_currency, filled_quantity, trade_at)
+    # Wallets are the rows contended by other writers, so they are updated (and locked until commit) last
+    update_wallet(buy_order_owner, primary_currency_id, filled_quantity, trade_at)
     if overpayment_amount:
         assert overpayment_amount > 0
-        update_wallet(buy_order_owner, secondary_currency, overpayment_amount, trade_at)
+        update_wallet(buy_order_owner, secondary_currency_id, overpayment_amount, trade_at)
 
-    update_wallet(sell_order.owner, secondary_currency, trade_price * filled_quantity, trade_at)
-
-    buy_order.modified_date = trade_at
-    buy_order.save(should_adjust_timestamps=False)
-    sell_order.modified_date = trade_at
-    sell_order.save(should_adjust_timestamps=False)
+    update_wallet(sell_order.owner, secondary_currency_id, trade_price * filled_quantity, trade_at)
 
 
 @log(logger_=logger, level=logging.DEBUG)
-def get_potentially_matching_orders(trade_at=None):
+def get_potentially_matching_orders(trade_at=None, shard: Shard = DEFAULT_SHARD):
     trade_at = trade_at or timezone.now()
     subquery = (
-        ExchangeOrder.objects.filter(status__in=UNFILLED_STATUSES, created_date__lte=trade_at)
+        shard.filter_queryset(ExchangeOrder.objects.filter(status__in=UNFILLED_STATUSES, created_date__lte=trade_at))
         .annotate(
             best_sell_price=Window(expression=Min('price', filter=Q(side=SELL)), partition_by='asset_pair_id'),
             best_buy_price=Window(expression=Max('price', filter=Q(side=BUY)), partition_by='asset_pair_id'),
@@ -226,12 +220,51 @@ def find_matching_orders(sell_index, buy_index, potentially_matching_orders: lis
     return None
 
 
+def process_matching_orders(sell_order, buy_order, matching_indexes, trade_maker):
+    # These are algorithm correctness asserts, not runtime error handling against direct database access
+    # (although they serve as an extra preventive measure in case asserts are not disable in production)
+    assert sell_order.asset_pair_id == buy_order.asset_pair_id
+    assert sell_order.price <= buy_order.price
+
+    # Because it allowed to change only status and filled_quantity for order (in Django Admin)
+    # they are still matching by price, so we check for status change and advance to the next order
+    if sell_order.status not in UNFILLED_STATUSES or sell_order.unfilled_quantity <= 0:
+        matching_indexes[0] += 1  # increment sell index
+    elif buy_order.status not in UNFILLED_STATUSES or buy_order.unfilled_quantity <= 0:
+        matching_indexes[1] += 1  # increment buy index
+    else:
+        trade_maker(sell_order, buy_order)
+        if sell_order.status == ExchangeOrderStatus.FILLED.value:  # type: ignore
+            matching_indexes[0] += 1  # increment sell index
+        if buy_order.status == ExchangeOrderStatus.FILLED.value:  # type: ignore
+            matching_indexes[1] -= 1  # increment buy index
+
+
 def match_orders(potentially_matching_orders, trade_at) -> tuple[bool, set[int]]:
     potentially_matching_orders_len = len(potentially_matching_orders)
     if potentially_matching_orders_len < 2:  # defensive guard condition
         return False, set()
 
-    unlocked_orders = set()
+    # Batched settlement mode: trades are matched in memory and persisted in one transaction per batch
+    # (see `TradeSettlement` for details)
+    batch_size = settings.ORDER_PROCESSING_TRADE_BATCH_SIZE
+    settlement = TradeSettlement(trade_at) if batch_size > 1 else None
+
+    unlocked_orders: set[int] = set()
+    orders_to_unlock: list[ExchangeOrder] = []
+
+    def unlock_processed_orders():
+        if settlement is not None:
+            settlement.commit()  # orders can be unlocked only after the trades are committed
+
+        if not orders_to_unlock:
+            return
+
+        order_ids = [order.id for order in orders_to_unlock]
+        ExchangeOrder.objects.advisory_unlock_by_pks(order_ids, ORDER_PROCESSING_LOCK_ID)
+        unlocked_orders.update(order_ids)
+        orders_to_unlock.clear()
+
     matching_indexes = find_matching_orders(0, potentially_matching_orders_len - 1, potentially_matching_orders)
 
     # We use for-loop instead of `while matching_indexes:` to prevent infinite loop in case of implementation bugs
@@ -243,47 +276,42 @@ def match_orders(potentially_matching_orders, trade_at) -> tuple[bool, set[int]]
         original_matching_indexes = matching_indexes.copy()
         assert len(matching_indexes) == 2
 
-        # This is important that we are not in transaction, so every trade results into saving data to the database
-        # and streaming events to the clients (because it is done on commit)
-        assert not transaction.get_connection().in_atomic_block or is_pytest_running()
-        with transaction.atomic():
-            # We use advisory locks when getting potentially matching orders instead of regular database locks
-            # to be able to commit after each trade therefore stream events trade by trade and allow updated
-            # order statuses and wallet balances earlier (before completing the entire match).
-            #
-            # Race condition prevention mechanisms in use:
-            # - Potentially matching orders are fetched with session scoped advisory locks.
-            # - On API level we require transaction scoped advisory locks and regular row level database locks
-            #   (`.select_for_update()`) for update operations (therefore any updates are delayed).
-            # - On model level we prohibit updates of order attributes other than 'status', 'filled_quantity',
-            #   'modified_date'.
-            # - Orders are selected with regular row level database locks (`.select_for_update()`) rights
-            #   before the trade is made
-            #
-            # The above measures may still leak changes to the order via Django Admin or direct database access
-            # between getting potentially matching orders and making a trade. We assume that if someone is making
-            # changes directly to the database they know what they are doing and can handle the consequences therefore
-            # we will make extra checks against Django Admin changes.
-            sell_order = potentially_matching_orders[matching_indexes[0]].select_for_update()  # sell index
-            buy_order = potentially_matching_orders[matching_indexes[1]].select_for_update()  # buy index
-
-            # These are algorithm correctness asserts, not runtime error handling against direct database access
-            # (although they serve as an extra preventive measure in case asserts are not disable in production)
-            assert sell_order.asset_pair_id == buy_order.asset_pair_id
-            assert sell_order.price <= buy_order.price
-
-            # Because it allowed to change only status and filled_quantity for order (in Django Admin)
-            # they are still matching by price, so we check for status change and advance to the next order
-            if sell_order.status not in UNFILLED_STATUSES or sell_order.unfilled_quantity <= 0:
-                matching_indexes[0] += 1  # increment sell index
-            elif buy_order.status not in UNFILLED_STATUSES or buy_order.unfilled_quantity <= 0:
-                matching_indexes[1] += 1  # increment buy index
-            else:
-                make_trade(sell_order, buy_order, trade_at)
-                if sell_order.status == ExchangeOrderStatus.FILLED.value:  # type: ignore
-                    matching_indexes[0] += 1  # increment sell index
-                if buy_order.status == ExchangeOrderStatus.FILLED.value:  # type: ignore
-                    matching_indexes[1] -= 1  # increment buy index
+        if settlement is None:
+            # This is important that we are not in transaction, so every trade results into saving data to
+            # the database and streaming events to the clients (because it is done on commit)
+            assert not transaction.get_connection().in_atomic_block or is_pytest_running()
+            with transaction.atomic():
+                # We use advisory locks when getting potentially matching orders instead of regular database locks
+                # to be able to commit after each trade therefore stream events trade by trade and allow updated
+                # order statuses and wallet balances earlier (before completing the entire match).
+                #
+                # Race condition prevention mechanisms in use:
+                # - Potentially matching orders are fetched with session scoped advisory locks.
+                # - On API level we require transaction scoped advisory locks and regular row level database locks
+                #   (`.select_for_update()`) for update operations (therefore any updates are delayed).
+                # - On model level we prohibit updates of order attributes other than 'status', 'filled_quantity',
+                #   'modified_date'.
+                # - Orders are selected with regular row level database locks (`.select_for_update()`) rights
+                #   before the trade is made
+                #
+                # The above measures may still leak changes to the order via Django Admin or direct database access
+                # between getting potentially matching orders and making a trade. We assume that if someone is making
+                # changes directly to the database they know what they are doing and can handle the consequences
+                # therefore we will make extra checks against Django Admin changes.
+                process_matching_orders(
+                    potentially_matching_orders[matching_indexes[0]].select_for_update(),  # sell index
+                    potentially_matching_orders[matching_indexes[1]].select_for_update(),  # buy index
+                    matching_indexes,
+                    lambda sell_order, buy_order: make_trade(sell_order, buy_order, trade_at),
+                )
+        else:
+            # Orders are locked and checked for changes by `TradeSettlement.commit()`
+            process_matching_orders(
+                settlement.get_order(potentially_matching_orders[matching_indexes[0]]),  # sell index
+                settlement.get_order(potentially_matching_orders[matching_indexes[1]]),  # buy index
+                matching_indexes,
+                settlement.add_trade,
+            )
 
         matching_indexes = find_matching_orders(matching_indexes[0], matching_indexes[1], potentially_matching_orders)
 
@@ -299,11 +327,9 @@ def match_orders(potentially_matching_orders, trade_at) -> tuple[bool, set[int]]
             assert original_matching_indexes[0] < original_matching_indexes[1]
             index_generator = range(original_matching_indexes[0], original_matching_indexes[1] + 1)  # type: ignore
 
-        for order_index in index_generator:
-            logger.debug('Unlocking order at index %s: %s', order_index, potentially_matching_orders[order_index])
-            order = potentially_matching_orders[order_index]
-            order.advisory_unlock(ORDER_PROCESSING_LOCK_ID)
-            unlocked_orders.add(order.id)
+        orders_to_unlock.extend(potentially_matching_orders[order_index] for order_index in index_generator)
+        if settlement is None or len(settlement) >= batch_size:
+            unlock_processed_orders()
 
         if settings.ONE_TRADE_PER_ITERATION:  # aka one trade per commit
             # Multiple trades per operation lead to a better performance
@@ -311,25 +337,37 @@ def match_orders(potentially_matching_orders, trade_at) -> tuple[bool, set[int]]
             # corresponding changes are stamped with the same `trade_at` timestamp
             break
 
+    unlock_processed_orders()
     return bool(matching_indexes), unlocked_orders
 
 
-@log(logger_=logger, level=logging.DEBUG)
-def run_single_iteration():
+def start_trade(shard: Shard = DEFAULT_SHARD):
     with transaction.atomic():
         # We use `.get()` here because
         # 1) There must be OrderProcessingLock instance created by now with:
         #    `thenewboston.exchange.order_processing.engine.order_processing_lock`
-        # 2) There can be only one instance of OrderProcessingLock
-        lock = OrderProcessingLock.objects.select_for_update().get()
+        # 2) There can be only one instance of OrderProcessingLock per shard
+        lock = OrderProcessingLock.objects.select_for_update().get(shard=shard.index)
         # We named it `trade_at`, not `traded_at`, because by the moment we set it the trade is not yet done
         lock.trade_at = trade_at = timezone.now()
         lock.save()
 
+    # Wait for the transactions that adjusted timestamps according to the previous `trade_at` to be committed,
+    # so all orders with timestamps up to the new `trade_at` are visible to the trade
+    wait_for_trade_at_readers()
+    return trade_at
+
+
+@log(logger_=logger, level=logging.DEBUG)
+def run_single_iteration(shard: Shard = DEFAULT_SHARD):
+    trade_at = start_trade(shard)
     unlocked_order_ids = set()
     potentially_matching_orders = []  # putting a dummy value, so get_potentially_matching_orders() moved into `try`
     try:
-        if not (potentially_matching_orders := get_potentially_matching_orders(trade_at)):
+        start = time.perf_counter()
+        potentially_matching_orders = get_potentially_matching_orders(trade_at, shard)
+        record_candidate_orders(len(potentially_matching_orders), time.perf_counter() - start)
+        if not potentially_matching_orders:
             return False
         has_more_matches, unlocked_order_ids = match_orders(potentially_matching_orders, trade_at)
     finally:
@@ -345,6 +383,75 @@ def run_single_iteration():
     return has_more_matches
 
 
+def match_order_book(book: AssetPairOrderBook, trade_at) -> int:
+    trades_made = 0
+    # We use for-loop instead of `while` to prevent infinite loop in case of implementation bugs (defensive programming)
+    for _ in range(len(book) + 1):
+        if not (best_orders := book.get_best_orders()):
+            break
+
+        sell_entry, buy_entry = best_orders
+        order_ids = (sell_entry.id, buy_entry.id)
+        # The same race condition prevention mechanisms are used as in `match_orders()`, but we lock just the pair of
+        # orders being traded, because the rest of the book is not read from the database
+        ExchangeOrder.objects.advisory_lock_by_pks(order_ids, ORDER_PROCESSING_LOCK_ID)
+
+        try:
+            assert not transaction.get_connection().in_atomic_block or is_pytest_running()
+            with transaction.atomic():
+                orders = ExchangeOrder.objects.select_for_update().in_bulk(order_ids)
+                sell_order = orders.get(sell_entry.id)
+                buy_order = orders.get(buy_entry.id)
+                if not sell_order or sell_order.status not in UNFILLED_STATUSES or sell_order.unfilled_quantity <= 0:
+                    logger.debug('Discarding stale sell order from the order book: %s', sell_entry.id)
+                    book.remove(sell_entry.id)
+                    continue
+
+                if not buy_order or buy_order.status not in UNFILLED_STATUSES or buy_order.unfilled_quantity <= 0:
+                    logger.debug('Discarding stale buy order from the order book: %s', buy_entry.id)
+                    book.remove(buy_entry.id)
+                    continue
+
+                # These are algorithm correctness asserts (see `match_orders()`)
+                assert sell_order.asset_pair_id == buy_order.asset_pair_id == book.asset_pair_id
+                assert sell_order.price <= buy_order.price
+
+                make_trade(sell_order, buy_order, trade_at)
+
+            trades_made += 1
+            book.apply(sell_order)
+            book.apply(buy_order)
+        finally:
+            ExchangeOrder.objects.advisory_unlock_by_pks(order_ids, ORDER_PROCESSING_LOCK_ID)
+
+        if settings.ONE_TRADE_PER_ITERATION:
+            break
+
+    return trades_made
+
+
+@log(logger_=logger, level=logging.DEBUG)
+def run_single_order_book_iteration(order_books: OrderBooks, events: list[OrderEvent] | None = None):
+    trade_at = start_trade(order_books.shard)
+    if events is None:
+        # Only orders created up to `trade_at` get into the order books, so we have the same chronology guarantees
+        # as `get_potentially_matching_orders()` provides
+        start = time.perf_counter()
+        orders_count = order_books.sync(trade_at)
+        record_candidate_orders(orders_count, time.perf_counter() - start)
+        books = order_books.get_crossed_books()
+    else:
+        # Fast path: we apply the events to the order books directly instead of reading the database
+        assert order_books.is_loaded()
+        books = [book for book in order_books.apply_events(events, trade_at) if book.is_crossed()]
+
+    for book in books:
+        if match_order_book(book, trade_at) and settings.ONE_TRADE_PER_ITERATION:
+            return True  # there may be more matches, so let the outer loop run another iteration
+
+    return False
+
+
 def make_lock_metadata():
     hostname = socket.gethostname()
     metadata = {'hostname': hostname, 'pid': os.getpid(), 'argv': sys.argv, 'user': getpass.getuser()}
@@ -364,28 +471,49 @@ def make_lock_metadata():
 
 
 @contextmanager
-def order_processing_lock(force=False):
+def order_processing_lock(force=False, shard: Shard = DEFAULT_SHARD):
     assert not transaction.get_connection().in_atomic_block or is_pytest_running()
     with transaction.atomic():
-        lock = OrderProcessingLock.objects.select_for_update().get_or_none()
+        with connection.cursor() as cursor:
+            # The lock mode conflicts with itself, so engines acquire their locks one at a time and see each other's
+            # shard count even if they are started concurrently (the `trade_at` updates are blocked only briefly)
+            cursor.execute(f'LOCK TABLE {OrderProcessingLock._meta.db_table} IN SHARE ROW EXCLUSIVE MODE')
+
+        locks = {lock.shard: lock for lock in OrderProcessingLock.objects.all()}
+        lock = locks.get(shard.index)
         if lock and not force and lock.acquired_at:
             raise ThenewbostonRuntimeError(
                 f'Order processing lock is already acquired at {lock.acquired_at.isoformat()} (extra: {lock.extra})'
             )
 
+        if mismatching_locks := [
+            lock_
+            for lock_ in locks.values()
+            if lock_.shard != shard.index and lock_.acquired_at and lock_.shard_count != shard.count
+        ]:
+            running_shards = ', '.join(f'shard {lock_.shard} of {lock_.shard_count}' for lock_ in mismatching_locks)
+            message = f'Shard count {shard.count} differs from the one of running engines: {running_shards}'
+            if not force:
+                raise ThenewbostonRuntimeError(message)
+
+            logger.warning('%s (ignored, because of force)', message)
+
         now = timezone.now()
         if lock:  # case of existing lock record which is not acquired, or force
             lock.acquired_at = now
+            lock.shard_count = shard.count
             lock.save()
         else:
             try:
-                OrderProcessingLock.objects.create(acquired_at=now, extra=make_lock_metadata())
+                OrderProcessingLock.objects.create(
+                    shard=shard.index, shard_count=shard.count, acquired_at=now, extra=make_lock_metadata()
+                )
             except IntegrityError:
                 # This handles race condition when another process manager to create the lock before after we
                 # initially did not find it in the database
                 raise ThenewbostonRuntimeError('Order processing lock is already acquired')
 
-    logger.debug('Order processing lock acquired')
+    logger.debug('Order processing lock acquired (shard: %s)', shard)
     try:
         yield
     finally:
@@ -395,18 +523,30 @@ def order_processing_lock(force=False):
             # adjusting timestamps of the orders (even when trade processing is not running we should account for
             # those rare cases of adjusting timestamps of the orders)
             # TODO(dmu) LOW: Is `.select_for_update()` necessary here?
-            if lock := OrderProcessingLock.objects.select_for_update().get_or_none():
+            if lock := OrderProcessingLock.objects.select_for_update().get_or_none(shard=shard.index):
                 # TODO(dmu) LOW: We use `acquired_at` as `is_active` flag, but maybe we should have the flag,
                 #                so we can use `acquired_at` for debugging purposes?
                 lock.acquired_at = None
                 lock.save()
 
-        logger.debug('Order processing lock released')
+        logger.debug('Order processing lock released (shard: %s)', shard)
 
 
 class OrderProcessingEngine:
-    def __init__(self, hook_signals=True):
+    def __init__(self, hook_signals=True, use_order_book=None, shard: Shard = DEFAULT_SHARD):
         self.is_running = False
+        # Each engine process handles its own disjoint set of asset pairs, so several processes can run in parallel
+        self.shard = shard
+
+        if use_order_book is None:
+            use_order_book = settings.ORDER_PROCESSING_USE_ORDER_BOOK
+
+        # In order book mode we keep price-time priority order books in memory and synchronize them incrementally
+        # instead of scanning all unfilled orders on every iteration
+        self.order_books = OrderBooks(shard) if use_order_book else None
+        self.order_event_reader = OrderEventReader()
+        self.metrics = EngineMetrics(shard.index)
+        self.reconciled_at = None
 
         if hook_signals:
             signal.signal(signal.SIGTERM, lambda sig, _: self.graceful_shutdown())  # Docker stop
@@ -424,11 +564,65 @@ class OrderProcessingEngine:
         logger.info('Graceful shutdown initiated')
         self.is_running = False
 
+    def is_reconciliation_due(self):
+        if (reconciled_at := self.reconciled_at) is None:
+            return True
+
+        # Changes not covered by the order events (for instance, made via Django Admin) must also be picked up
+        # even if the order events keep coming and we never hit the timeout
+        timeout_seconds = settings.ORDER_PROCESSING_CHANNEL_GET_MESSAGE_TIMEOUT_SECONDS
+        return timeout_seconds is not None and time.monotonic() - reconciled_at >= timeout_seconds
+
+    def run_iteration(self, events: list[OrderEvent] | None = None):
+        """
+        Run the iteration applying `events` (fast path) or reconciling with the database if `events` is `None`.
+        """
+        metrics = self.metrics
+        try:
+            with metrics.measure_iteration():
+                return self._run_iteration_impl(events)
+        finally:
+            metrics.export()
+
+    def _run_iteration_impl(self, events: list[OrderEvent] | None):
+        if (order_books := self.order_books) is None:
+            if events is not None and all(event.event == CANCEL_ORDER_EVENT for event in events):
+                return False  # cancellations cannot produce new matches
+
+            return run_single_iteration(self.shard)
+
+        if events is not None and (not order_books.is_loaded() or self.is_reconciliation_due()):
+            events = None
+
+        try:
+            has_more_matches = run_single_order_book_iteration(order_books, events)
+        except Exception:
+            # The order books may be inconsistent with the database now, so we reload them on the next iteration
+            order_books.reset()
+            raise
+
+        if events is None:
+            self.reconciled_at = time.monotonic()
+
+        return has_more_matches
+
+    def receive_events(self, pubsub, message) -> list[OrderEvent] | None:
+        messages = [message]
+        # Take all the pending messages, so they are applied in one iteration
+        while message := pubsub.get_message(ignore_subscribe_messages=True, timeout=0):
+            messages.append(message)
+
+        events = self.order_event_reader.read(messages)
+        self.metrics.record_messages(
+            len(messages), [event.published_at for event in events or () if event.published_at is not None]
+        )
+        return events
+
     def _run_impl(self):
-        logger.info('Order processing engine started')
+        logger.info('Order processing engine started (shard: %s)', self.shard)
 
         pubsub = get_redis_client().pubsub()
-        pubsub.subscribe(settings.ORDER_PROCESSING_CHANNEL_NAME)
+        pubsub.subscribe(self.shard.channel_name)
 
         if (timeout_seconds := settings.ORDER_PROCESSING_CHANNEL_GET_MESSAGE_TIMEOUT_SECONDS) == 0:
             raise ImproperlyConfigured('ORDER_PROCESSING_CHANNEL_GET_MESSAGE_TIMEOUT cannot be 0')
@@ -450,20 +644,21 @@ class OrderProcessingEngine:
                 if not self.is_running:
                     break
 
-                if message is None or (message.get('type') == 'message' and message.get('data') == NEW_ORDER_EVENT):
-                    # We did not get a message (maybe there is something wrong with Redis Pub/Sub) or we got
-                    # a new order event, so we run the iteration
-                    try:
-                        while run_single_iteration():  # We run iteration in case of timeout or new order message
-                            pass  # We run iterations until we run out of matching orders
-                    except Exception:
-                        logger.warning('Iteration failed', exc_info=True)
+                # We did not get a message (maybe there is something wrong with Redis Pub/Sub) or the order events
+                # were lost, so we reconcile with the database (`events` is `None`)
+                events = None if message is None else self.receive_events(pubsub, message)
+                try:
+                    while self.run_iteration(events):  # We run iterations until we run out of matching orders
+                        events = None  # the events are already applied, so next iterations reconcile
+                except Exception:
+                    logger.warning('Iteration failed', exc_info=True)
         finally:
             pubsub.unsubscribe()
             pubsub.close()
+            self.metrics.export(force=True)
 
         logger.info('Order matching engine gracefully stopped')
 
     def run(self, force=False):
-        with order_processing_lock(force=force):
+        with order_processing_lock(force=force, shard=self.shard):
             self._run_impl()
@@ -0,0 +1,125 @@
+import json
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+from thenewboston.general.clients.redis import get_redis_client
+
+from .sharding import get_channel_name, get_shard_index
+
+NEW_ORDER_EVENT = 'new_order'
+CANCEL_ORDER_EVENT = 'cancel_order'
+ORDER_EVENTS = (NEW_ORDER_EVENT, CANCEL_ORDER_EVENT)
+
+# Sequence number is incremented and the message is published atomically, so subscribers receive messages in
+# the sequence order and can detect lost messages. We prepend the sequence to the already serialized JSON instead
+# of decoding / encoding it in Lua, because Lua `cjson` would lose precision of big integers (prices, quantities)
+PUBLISH_SCRIPT = """
+local sequence = redis.call('INCR', KEYS[1])
+return redis.call('PUBLISH', ARGV[1], '{"sequence":' .. sequence .. ',' .. string.sub(ARGV[2], 2))
+"""
+
+logger = logging.getLogger(__name__)
+
+_publish_script = None
+
+
+@dataclass(frozen=True, slots=True)
+class OrderEvent:
+    sequence: int
+    event: str
+    id: int  # noqa: A003
+    asset_pair_id: int
+    side: int
+    price: int
+    quantity: int
+    created_date: datetime
+    owner_id: int
+    published_at: float | None = None  # UNIX timestamp
+
+
+def serialize_order(order) -> dict:
+    return {
+        'id': order.id,
+        'asset_pair': order.asset_pair_id,
+        'side': order.side,
+        'price': order.price,
+        'quantity': order.quantity,
+        'created_date': order.created_date.isoformat(),
+        'owner': order.owner_id,
+    }
+
+
+def get_sequence_key(channel_name):
+    return f'{channel_name}:sequence'
+
+
+def publish_order_event(event, order_data):
+    global _publish_script
+
+    assert event in ORDER_EVENTS
+    redis_client = get_redis_client()
+    if _publish_script is None:
+        _publish_script = redis_client.register_script(PUBLISH_SCRIPT)
+
+    channel_name = get_channel_name(get_shard_index(order_data['asset_pair']))
+    _publish_script(
+        keys=[get_sequence_key(channel_name)],
+        args=[
+            channel_name,
+            json.dumps({'event': event, 'published_at': time.time(), 'order': order_data}, separators=(',', ':')),
+        ],
+        client=redis_client,
+    )
+
+
+def parse_order_event(data) -> OrderEvent | None:
+    try:
+        message = json.loads(data)
+        order_data = message['order']
+        return OrderEvent(
+            sequence=message['sequence'],
+            event=message['event'],
+            id=order_data['id'],
+            asset_pair_id=order_data['asset_pair'],
+            side=order_data['side'],
+            price=order_data['price'],
+            quantity=order_data['quantity'],
+            created_date=datetime.fromisoformat(order_data['created_date']),
+            owner_id=order_data['owner'],
+            published_at=message.get('published_at'),
+        )
+    except (TypeError, ValueError, KeyError):
+        return None
+
+
+class OrderEventReader:
+    """
+    Parses order events received via Redis Pub/Sub and checks they are not lost by tracking the sequence.
+    `None` is returned when the events cannot be relied on, so a full reconciliation with the database is needed.
+    """
+
+    def __init__(self):
+        self.last_sequence: int | None = None
+
+    def read(self, messages) -> list[OrderEvent] | None:
+        events = []
+        is_reliable = True
+        for message in messages:
+            if message.get('type') != 'message':
+                continue
+
+            if (event := parse_order_event(message.get('data'))) is None or event.event not in ORDER_EVENTS:
+                logger.warning('Unexpected order processing message: %s', message)
+                is_reliable = False
+                continue
+
+            if (last_sequence := self.last_sequence) is not None and event.sequence != last_sequence + 1:
+                logger.warning('Order event sequence gap detected: %s -> %s', last_sequence, event.sequence)
+                is_reliable = False
+
+            self.last_sequence = event.sequence
+            events.append(event)
+
+        return events if is_reliable else None
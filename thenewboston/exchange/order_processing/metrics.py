@@ -0,0 +1,250 @@
+"""
+Order processing engine instrumentation.
+
+The engine records per-iteration counters and histograms in memory and periodically exports a snapshot to Redis
+(so it can be served by the API and shown by `order_processing_engine --stats`) and optionally to a file in
+Prometheus text format (for node exporter textfile collector or similar).
+"""
+
+import json
+import logging
+import os
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import connection
+
+from thenewboston.general.clients.redis import get_redis_client
+
+METRIC_PREFIX = 'thenewboston_order_processing_'
+LOCK_STATEMENT_MARKERS = ('pg_advisory_lock', 'pg_advisory_xact_lock', 'FOR UPDATE')
+SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+COUNTERS = {
+    'iterations_total': 'Engine iterations run',
+    'iterations_failed_total': 'Engine iterations failed with an exception',
+    'trades_total': 'Trades made',
+    'candidate_orders_total': 'Potentially matching orders fetched',
+    'db_queries_total': 'Database queries issued during iterations',
+    'messages_total': 'Pub/Sub messages received',
+}
+HISTOGRAMS = {
+    'iteration_seconds': ('Iteration wall time', SECONDS_BUCKETS),
+    'fetch_candidate_orders_seconds': ('Time in get_potentially_matching_orders()', SECONDS_BUCKETS),
+    'lock_wait_seconds': ('Time in locking statements (advisory locks, SELECT FOR UPDATE)', SECONDS_BUCKETS),
+    'message_lag_seconds': ('Time from order event publishing to receiving it by the engine', SECONDS_BUCKETS),
+    'trades_per_iteration': ('Trades made per iteration', COUNT_BUCKETS),
+    'candidate_orders_per_iteration': ('Potentially matching orders fetched per iteration', COUNT_BUCKETS),
+    'db_queries_per_iteration': ('Database queries issued per iteration', COUNT_BUCKETS),
+}
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """
+    `connection.execute_wrapper()` that counts queries and the time spent in the locking statements
+    (advisory locks and `SELECT ... FOR UPDATE`), which is dominated by lock wait time under contention.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.lock_wait_seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        if not any(marker in sql for marker in LOCK_STATEMENT_MARKERS):
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.lock_wait_seconds += time.perf_counter() - start
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last one is for +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def as_dict(self):
+        return {'buckets': list(self.buckets), 'counts': self.counts, 'sum': self.sum, 'count': self.count}
+
+
+@dataclass
+class IterationStats:
+    trades: int = 0
+    candidate_orders: int = 0
+    fetch_candidate_orders_seconds: float = 0.0
+
+
+# Stats of the iteration being run (if measured), so the engine functions can record them without passing around
+_current_iteration: IterationStats | None = None
+
+
+def record_trades(count=1):
+    if (stats := _current_iteration) is not None:
+        stats.trades += count
+
+
+def record_candidate_orders(count, seconds):
+    if (stats := _current_iteration) is not None:
+        stats.candidate_orders += count
+        stats.fetch_candidate_orders_seconds += seconds
+
+
+class EngineMetrics:
+    def __init__(self, shard_index=0):
+        self.shard_index = shard_index
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.histograms = {name: Histogram(buckets) for name, (_, buckets) in HISTOGRAMS.items()}
+        self.exported_at = None
+
+    def observe(self, name, value):
+        self.histograms[name].observe(value)
+
+    @contextmanager
+    def measure_iteration(self):
+        global _current_iteration
+
+        # Nested iterations are not supported (and not expected)
+        assert _current_iteration is None
+        stats = _current_iteration = IterationStats()
+        query_stats = QueryStats()
+        start = time.perf_counter()
+        try:
+            with connection.execute_wrapper(query_stats):
+                yield stats
+        except Exception:
+            self.counters['iterations_failed_total'] += 1
+            raise
+        finally:
+            _current_iteration = None
+            counters = self.counters
+            counters['iterations_total'] += 1
+            counters['trades_total'] += stats.trades
+            counters['candidate_orders_total'] += stats.candidate_orders
+            counters['db_queries_total'] += query_stats.queries
+
+            self.observe('iteration_seconds', time.perf_counter() - start)
+            self.observe('fetch_candidate_orders_seconds', stats.fetch_candidate_orders_seconds)
+            self.observe('lock_wait_seconds', query_stats.lock_wait_seconds)
+            self.observe('trades_per_iteration', stats.trades)
+            self.observe('candidate_orders_per_iteration', stats.candidate_orders)
+            self.observe('db_queries_per_iteration', query_stats.queries)
+
+    def record_messages(self, count, published_ats=()):
+        self.counters['messages_total'] += count
+        now = time.time()
+        for published_at in published_ats:
+            self.observe('message_lag_seconds', max(now - published_at, 0))
+
+    def get_snapshot(self) -> dict:
+        return {
+            'shard': self.shard_index,
+            'updated_at': time.time(),
+            'counters': self.counters.copy(),
+            'histograms': {name: histogram.as_dict() for name, histogram in self.histograms.items()},
+        }
+
+    def export(self, force=False):
+        """
+        Export the snapshot not more often than `ORDER_PROCESSING_METRICS_EXPORT_INTERVAL_SECONDS`.
+        """
+        now = time.monotonic()
+        interval_seconds = settings.ORDER_PROCESSING_METRICS_EXPORT_INTERVAL_SECONDS
+        if not force and self.exported_at is not None and now - self.exported_at < interval_seconds:
+            return
+
+        self.exported_at = now
+        snapshot = self.get_snapshot()
+        try:
+            get_redis_client().set(
+                get_snapshot_key(self.shard_index),
+                json.dumps(snapshot),
+                ex=settings.ORDER_PROCESSING_METRICS_TTL_SECONDS,
+            )
+            if path := settings.ORDER_PROCESSING_METRICS_FILE:
+                write_file_atomically(path, render_prometheus([snapshot]))
+        except Exception:
+            # Metrics must never break the engine
+            logger.warning('Could not export order processing engine metrics', exc_info=True)
+
+
+def get_snapshot_key(shard_index):
+    return f'{settings.ORDER_PROCESSING_CHANNEL_NAME}:metrics:{shard_index}'
+
+
+def get_snapshots(shard_count=None) -> list[dict]:
+    shard_count = shard_count or settings.ORDER_PROCESSING_SHARD_COUNT
+    values = get_redis_client().mget([get_snapshot_key(shard_index) for shard_index in range(shard_count)])
+    return [json.loads(value) for value in values if value]
+
+
+def write_file_atomically(path, content):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as fo:
+        fo.write(content)
+
+    os.replace(tmp_path, path)  # so the reader never sees partially written file
+
+
+def format_labels(**labels):
+    return '{' + ','.join(f'{key}="{value}"' for key, value in labels.items()) + '}'
+
+
+def render_prometheus(snapshots) -> str:
+    lines = []
+    for name, help_text in COUNTERS.items():
+        metric_name = METRIC_PREFIX + name
+        lines.append(f'# HELP {metric_name} {help_text}')
+        lines.append(f'# TYPE {metric_name} counter')
+        for snapshot in snapshots:
+            lines.append(f'{metric_name}{format_labels(shard=snapshot["shard"])} {snapshot["counters"][name]}')
+
+    for name, (help_text, _) in HISTOGRAMS.items():
+        metric_name = METRIC_PREFIX + name
+        lines.append(f'# HELP {metric_name} {help_text}')
+        lines.append(f'# TYPE {metric_name} histogram')
+        for snapshot in snapshots:
+            shard = snapshot['shard']
+            histogram = snapshot['histograms'][name]
+            cumulative_count = 0
+            for bucket, count in zip((*histogram['buckets'], '+Inf'), histogram['counts']):
+                cumulative_count += count
+                lines.append(f'{metric_name}_bucket{format_labels(shard=shard, le=bucket)} {cumulative_count}')
+
+            lines.append(f'{metric_name}_sum{format_labels(shard=shard)} {histogram["sum"]}')
+            lines.append(f'{metric_name}_count{format_labels(shard=shard)} {histogram["count"]}')
+
+    return '\n'.join(lines) + '\n'
+
+
+def get_histogram_percentile(histogram, percentile) -> float | None:
+    """
+    Estimate percentile by the histogram buckets (upper bound of the bucket), like Prometheus `histogram_quantile()`
+    does, but without interpolation.
+    """
+    if not (total := histogram['count']):
+        return None
+
+    threshold = total * percentile / 100
+    cumulative_count = 0
+    for bucket, count in zip((*histogram['buckets'], float('inf')), histogram['counts']):
+        cumulative_count += count
+        if cumulative_count >= threshold:
+            return bucket
+
+    return float('inf')
@@ -0,0 +1,264 @@
+import logging
+from bisect import bisect_left, insort
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+
+from ..models.exchange_order import UNFILLED_STATUSES, ExchangeOrder, ExchangeOrderSide
+from .events import CANCEL_ORDER_EVENT, NEW_ORDER_EVENT, OrderEvent
+from .sharding import DEFAULT_SHARD, Shard
+
+BUY = ExchangeOrderSide.BUY.value  # type: ignore
+SELL = ExchangeOrderSide.SELL.value  # type: ignore
+ORDER_BOOK_FIELDS = ('id', 'asset_pair', 'side', 'price', 'quantity', 'filled_quantity', 'status', 'created_date')
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class OrderBookEntry:
+    id: int  # noqa: A003
+    side: int
+    price: int
+    unfilled_quantity: int
+    created_date: datetime
+    is_active: bool = True
+
+    @property
+    def priority_key(self):
+        return self.created_date, self.id
+
+
+class PriceLevels:
+    """
+    One side of the order book: price levels sorted by price, each level is a FIFO queue of entries.
+    Entries are removed lazily: they are marked inactive and discarded once they reach the head of the queue.
+    """
+
+    def __init__(self, side):
+        assert side in (BUY, SELL)
+        self.side = side
+        self.prices: list[int] = []  # always ascending, the best price is on the left for SELL and right for BUY
+        self.levels: dict[int, deque[OrderBookEntry]] = {}
+
+    def __len__(self):
+        return len(self.prices)
+
+    def add(self, entry: OrderBookEntry):
+        price = entry.price
+        if (level := self.levels.get(price)) is None:
+            level = self.levels[price] = deque()
+            insort(self.prices, price)
+
+        if not level or level[-1].priority_key <= entry.priority_key:
+            level.append(entry)  # regular case: orders come in chronological order
+        else:
+            # Rare case: the order was created earlier than the orders already queued (loaded out of order)
+            entries = sorted((*level, entry), key=lambda item: item.priority_key)
+            level.clear()
+            level.extend(entries)
+
+    def _remove_price(self, price):
+        del self.levels[price]
+        index = bisect_left(self.prices, price)
+        assert self.prices[index] == price
+        del self.prices[index]
+
+    def get_best_price(self) -> int | None:
+        if not (prices := self.prices):
+            return None
+
+        return prices[0] if self.side == SELL else prices[-1]
+
+    def peek(self) -> OrderBookEntry | None:
+        while (price := self.get_best_price()) is not None:
+            level = self.levels[price]
+            while level and not level[0].is_active:
+                level.popleft()
+
+            if level:
+                return level[0]
+
+            self._remove_price(price)
+
+        return None
+
+
+class AssetPairOrderBook:
+    def __init__(self, asset_pair_id):
+        self.asset_pair_id = asset_pair_id
+        self.asks = PriceLevels(SELL)
+        self.bids = PriceLevels(BUY)
+        self.entries: dict[int, OrderBookEntry] = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get_side(self, side) -> PriceLevels:
+        return self.bids if side == BUY else self.asks
+
+    def add(self, order: ExchangeOrder):
+        assert order.asset_pair_id == self.asset_pair_id
+        self.add_entry(
+            OrderBookEntry(
+                id=order.id,
+                side=order.side,
+                price=order.price,
+                unfilled_quantity=order.quantity - order.filled_quantity,
+                created_date=order.created_date,
+            )
+        )
+
+    def add_entry(self, entry: OrderBookEntry):
+        self.remove(entry.id)
+        self.entries[entry.id] = entry
+        self.get_side(entry.side).add(entry)
+
+    def remove(self, order_id) -> bool:
+        if (entry := self.entries.pop(order_id, None)) is None:
+            return False
+
+        entry.is_active = False
+        return True
+
+    def apply(self, order: ExchangeOrder):
+        if order.status in UNFILLED_STATUSES and order.quantity > order.filled_quantity:
+            entry = self.entries.get(order.id)
+            if entry and entry.price == order.price and entry.side == order.side:
+                # Keep time priority, just update the quantity (filled by us or changed via Django Admin)
+                entry.unfilled_quantity = order.quantity - order.filled_quantity
+            else:
+                self.add(order)
+        else:
+            self.remove(order.id)
+
+    def get_best_orders(self) -> tuple[OrderBookEntry, OrderBookEntry] | None:
+        if (sell_entry := self.asks.peek()) is None or (buy_entry := self.bids.peek()) is None:
+            return None
+
+        if sell_entry.price > buy_entry.price:
+            return None
+
+        return sell_entry, buy_entry
+
+    def is_crossed(self):
+        return self.get_best_orders() is not None
+
+
+class OrderBooks:
+    """
+    Price-time priority order books for all asset pairs kept in memory by the order processing engine.
+
+    The books are loaded from the database once and then are synchronized incrementally by the orders modified
+    within the `(synced_until, trade_at]` window. Because of timestamps adjustment (see
+    `AdjustableTimestampsModel._adjust_timestamps()`) all orders with `modified_date <= trade_at` are already
+    committed by the moment the engine has published `trade_at`, so no order changes are missed.
+
+    Only asset pairs owned by `shard` are kept (see `Shard` for details).
+    """
+
+    def __init__(self, shard: Shard = DEFAULT_SHARD):
+        self.shard = shard
+        self.books: dict[int, AssetPairOrderBook] = {}
+        self.synced_until: datetime | None = None
+
+    def __len__(self):
+        return sum(len(book) for book in self.books.values())
+
+    def is_loaded(self):
+        return self.synced_until is not None
+
+    def reset(self):
+        self.books = {}
+        self.synced_until = None
+
+    def get_book(self, asset_pair_id) -> AssetPairOrderBook:
+        if (book := self.books.get(asset_pair_id)) is None:
+            book = self.books[asset_pair_id] = AssetPairOrderBook(asset_pair_id)
+
+        return book
+
+    def apply(self, order: ExchangeOrder):
+        self.get_book(order.asset_pair_id).apply(order)
+
+    def load(self, trade_at) -> int:
+        self.reset()
+        orders = (
+            self.shard.filter_queryset(
+                ExchangeOrder.objects.filter(status__in=UNFILLED_STATUSES, created_date__lte=trade_at)
+            )
+            .order_by('created_date', 'id')
+            .only(*ORDER_BOOK_FIELDS)
+        )
+        orders_count = 0
+        for order in orders.iterator():
+            self.apply(order)
+            orders_count += 1
+
+        self.synced_until = trade_at
+        logger.info('Order books loaded: %s orders, %s asset pairs', len(self), len(self.books))
+        return orders_count
+
+    def sync(self, trade_at) -> int:
+        if not self.is_loaded():
+            return self.load(trade_at)
+
+        assert self.synced_until <= trade_at
+        orders = (
+            self.shard.filter_queryset(
+                ExchangeOrder.objects.filter(modified_date__gt=self.synced_until, modified_date__lte=trade_at)
+            )
+            .order_by('created_date', 'id')
+            .only(*ORDER_BOOK_FIELDS)
+        )
+        orders_count = 0
+        for order in orders:
+            self.apply(order)
+            orders_count += 1
+
+        self.synced_until = trade_at
+        return orders_count
+
+    def apply_events(self, events: list[OrderEvent], trade_at) -> list[AssetPairOrderBook]:
+        """
+        Apply order events received via Pub/Sub without reading the database, return the affected books.
+
+        Events may duplicate the changes already synchronized from the database, therefore a new order is only
+        added if it is not in the book yet (stale entries are discarded on matching anyway, since the orders
+        are re-read under lock).
+        """
+        books = {}
+        for event in events:
+            if not self.shard.owns(asset_pair_id := event.asset_pair_id):  # defensive programming
+                continue
+
+            book = self.get_book(asset_pair_id)
+            if event.event == NEW_ORDER_EVENT:
+                if event.id in book.entries:
+                    continue
+
+                if event.created_date > trade_at:
+                    # This is possible in case of clock skew between servers. We leave the order for the next
+                    # reconciliation to preserve the chronology guarantees
+                    logger.debug('Skipping order created after trade_at: %s', event.id)
+                    continue
+
+                book.add_entry(
+                    OrderBookEntry(
+                        id=event.id,
+                        side=event.side,
+                        price=event.price,
+                        unfilled_quantity=event.quantity,
+                        created_date=event.created_date,
+                    )
+                )
+            else:
+                assert event.event == CANCEL_ORDER_EVENT
+                book.remove(event.id)
+
+            books[asset_pair_id] = book
+
+        return [book for _, book in sorted(books.items())]
+
+    def get_crossed_books(self) -> list[AssetPairOrderBook]:
+        return [book for _, book in sorted(self.books.items()) if book.is_crossed()]
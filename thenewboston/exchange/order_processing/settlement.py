@@ -0,0 +1,201 @@
+import logging
+from collections import defaultdict
+
+from django.db import transaction
+
+from thenewboston.general.exceptions import ThenewbostonRuntimeError
+from thenewboston.general.outbox import batch_outbox_events
+from thenewboston.general.utils.database import apply_on_commit
+from thenewboston.general.utils.pytest import is_pytest_running
+from thenewboston.notifications.models import Notification
+from thenewboston.wallets.models import Wallet, WalletLedgerReason
+
+from ..asset_pair_registry import asset_pair_registry
+from ..business_logic.trade_history_updates import request_trade_history_update_on_commit
+from ..models import Candlestick, Trade
+from ..models.exchange_order import SOMEWHAT_FILLED_STATUSES, ExchangeOrder, ExchangeOrderStatus
+from ..price_levels import apply_price_level_changes_on_commit, get_current_xact_id
+from .metrics import record_trades
+
+FILLED = ExchangeOrderStatus.FILLED.value  # type: ignore
+ORDER_UPDATE_FIELDS = ('filled_quantity', 'status', 'modified_date')
+
+logger = logging.getLogger(__name__)
+
+
+def fill_orders(sell_order, buy_order) -> tuple[int, int, int]:
+    trade_price = sell_order.price
+    overpay_price = buy_order.price - trade_price
+    assert overpay_price >= 0  # covers `assert sell_order.price <= buy_order.price`
+
+    filled_quantity = min(sell_order.unfilled_quantity, buy_order.unfilled_quantity)
+    sell_order.fill_order(filled_quantity)
+    assert sell_order.status in SOMEWHAT_FILLED_STATUSES
+    buy_order.fill_order(filled_quantity)
+    assert buy_order.status in SOMEWHAT_FILLED_STATUSES
+
+    assert sell_order.unfilled_quantity == 0 or buy_order.unfilled_quantity == 0
+    assert sell_order.status == FILLED or buy_order.status == FILLED
+
+    return trade_price, filled_quantity, overpay_price * filled_quantity
+
+
+class TradeSettlement:
+    """
+    Accumulates trades in memory and persists them in one transaction with bulk writes: trades are inserted with
+    a single `INSERT`, orders are updated with a single multi-row `UPDATE` and wallet balances are changed by net
+    delta per (owner, currency) with a single atomic `UPDATE`. Streaming events are written to the outbox with
+    a single `INSERT` (see `batch_outbox_events()`).
+
+    Orders are read (without locking) on the first access and then are modified in memory only. On commit
+    they are locked with `.select_for_update()` and checked for being changed in the meantime (for instance, via
+    Django Admin), in which case the entire batch is discarded.
+    """
+
+    def __init__(self, trade_at):
+        self.trade_at = trade_at
+        self.reset()
+
+    def __len__(self):
+        return len(self.trades)
+
+    def reset(self):
+        self.orders: dict[int, ExchangeOrder] = {}
+        self.original_order_states: dict[int, tuple[int, int]] = {}
+        self.trades: list[Trade] = []
+        self.wallet_deltas: defaultdict[tuple[int, int], int] = defaultdict(int)
+
+    def get_order(self, order) -> ExchangeOrder:
+        if (working_order := self.orders.get(order.id)) is None:
+            working_order = ExchangeOrder.objects.select_related(
+                'asset_pair__primary_currency', 'asset_pair__secondary_currency'
+            ).get(pk=order.pk)
+            self.orders[order.id] = working_order
+            self.original_order_states[order.id] = (working_order.status, working_order.filled_quantity)
+
+        return working_order
+
+    def add_trade(self, sell_order, buy_order):
+        assert self.orders.get(sell_order.id) is sell_order
+        assert self.orders.get(buy_order.id) is buy_order
+
+        trade_price, filled_quantity, overpayment_amount = fill_orders(sell_order, buy_order)
+        logger.debug('Trading at %s (quantity: %s): "%s" vs "%s"', trade_price, filled_quantity, buy_order, sell_order)
+
+        trade_at = self.trade_at
+        self.trades.append(
+            Trade(
+                buy_order=buy_order,
+                sell_order=sell_order,
+                asset_pair_id=buy_order.asset_pair_id,
+                filled_quantity=filled_quantity,
+                price=trade_price,
+                overpayment_amount=overpayment_amount,
+                created_date=trade_at,
+                modified_date=trade_at,
+            )
+        )
+        sell_order.modified_date = buy_order.modified_date = trade_at
+
+        primary_currency_id, secondary_currency_id = asset_pair_registry.get_currency_ids(buy_order.asset_pair_id)
+        self.wallet_deltas[(buy_order.owner_id, primary_currency_id)] += filled_quantity
+        if overpayment_amount:
+            assert overpayment_amount > 0
+            self.wallet_deltas[(buy_order.owner_id, secondary_currency_id)] += overpayment_amount
+
+        self.wallet_deltas[(sell_order.owner_id, secondary_currency_id)] += trade_price * filled_quantity
+
+    def _lock_orders(self):
+        order_states = {
+            id_: (status, filled_quantity)
+            for id_, status, filled_quantity in ExchangeOrder.objects.select_for_update()
+            .filter(pk__in=self.orders.keys())
+            .values_list('id', 'status', 'filled_quantity')
+        }
+        if order_states != self.original_order_states:
+            raise ThenewbostonRuntimeError('Orders were changed while trades were being settled')
+
+    def _update_wallets(self) -> list[Wallet]:
+        trade_at = self.trade_at
+        # Balances are changed with a single `UPDATE` without selecting the wallets for update beforehand (the rows are
+        # still locked by the `UPDATE` until commit)
+        # (ledger entries get `created_date` equal to the trades' one, so they can be matched)
+        updated_wallets = Wallet.objects.change_balances(
+            self.wallet_deltas, modified_date=trade_at, reason=WalletLedgerReason.TRADE
+        )
+        for (owner_id, currency_id), amount in self.wallet_deltas.items():
+            if (owner_id, currency_id) in updated_wallets:
+                continue
+
+            # Rare case: the wallet does not exist yet (see `update_wallet()` for details)
+            wallet, is_created = Wallet.objects.get_or_create(
+                owner_id=owner_id,
+                currency_id=currency_id,
+                defaults={'balance': amount, 'created_date': trade_at, 'modified_date': trade_at},
+                ledger_reason=WalletLedgerReason.TRADE,
+            )
+            if not is_created:  # created concurrently
+                wallet.modified_date = trade_at
+                wallet.change_balance(
+                    amount, should_stream=False, should_adjust_timestamps=False, reason=WalletLedgerReason.TRADE
+                )
+
+            updated_wallets[(owner_id, currency_id)] = (wallet.id, wallet.balance)
+
+        # Wallets are read (with their currencies) for streaming
+        return list(
+            Wallet.objects.filter(id__in=[id_ for id_, _ in updated_wallets.values()]).select_related('currency')
+        )
+
+    def commit(self) -> int:
+        if not (trades := self.trades):
+            self.reset()
+            return 0
+
+        assert not transaction.get_connection().in_atomic_block or is_pytest_running()
+        with transaction.atomic():
+            self._lock_orders()
+
+            Trade.objects.bulk_create(trades)
+            Candlestick.objects.add_trades(trades)
+            orders = list(self.orders.values())
+            ExchangeOrder.objects.bulk_update(orders, ORDER_UPDATE_FIELDS)
+            notifications = Notification.objects.bulk_create(
+                [
+                    order.make_filled_notification()
+                    for order in orders
+                    if order.status == FILLED and self.original_order_states[order.id][0] != FILLED
+                ]
+            )
+            # Wallets are the rows contended by other writers, so they are updated (and locked until commit) last
+            wallets = self._update_wallets()
+
+            # Streaming is done on commit (one event per trade, the latest state of orders and wallets)
+            request_trade_history_update_on_commit({trade.asset_pair_id for trade in trades})
+
+            price_level_changes = defaultdict(list)
+            with batch_outbox_events():
+                for trade in trades:
+                    trade.stream()
+
+                for order in orders:
+                    order.stream()
+                    price_level_changes[order.asset_pair_id].extend(order.get_price_level_changes())
+
+                for wallet in wallets:
+                    wallet.stream()
+
+                for notification in notifications:
+                    notification.stream()
+
+            if price_level_changes:
+                xact_id = get_current_xact_id()
+                for asset_pair_id, changes in price_level_changes.items():
+                    apply_price_level_changes_on_commit(asset_pair_id, changes, xact_id)
+
+            trades_count = len(trades)
+            apply_on_commit(lambda: record_trades(trades_count))
+
+        logger.debug('Settled %s trades', trades_count)
+        self.reset()
+        return trades_count
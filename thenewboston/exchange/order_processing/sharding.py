@@ -0,0 +1,51 @@
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db.models import F
+from django.db.models.functions import Mod
+
+
+def get_shard_index(asset_pair_id, shard_count=None):
+    shard_count = shard_count or settings.ORDER_PROCESSING_SHARD_COUNT
+    return asset_pair_id % shard_count
+
+
+def get_channel_name(shard_index=0, shard_count=None):
+    shard_count = shard_count or settings.ORDER_PROCESSING_SHARD_COUNT
+    channel_name = settings.ORDER_PROCESSING_CHANNEL_NAME
+    # We keep the original channel name for non-sharded setup for backward compatibility
+    return channel_name if shard_count == 1 else f'{channel_name}_{shard_index}'
+
+
+@dataclass(frozen=True)
+class Shard:
+    """
+    A disjoint set of asset pairs processed by one order processing engine process: `asset_pair_id % count == index`
+    """
+
+    index: int = 0
+    count: int = 1
+
+    def __post_init__(self):
+        if not (self.count >= 1 and 0 <= self.index < self.count):
+            raise ValueError(f'Invalid shard: index={self.index}, count={self.count}')
+
+    @property
+    def is_sharded(self):
+        return self.count > 1
+
+    @property
+    def channel_name(self):
+        return get_channel_name(self.index, self.count)
+
+    def owns(self, asset_pair_id):
+        return not self.is_sharded or get_shard_index(asset_pair_id, self.count) == self.index
+
+    def filter_queryset(self, queryset, asset_pair_id_field='asset_pair_id'):
+        if not self.is_sharded:
+            return queryset
+
+        return queryset.alias(shard_index=Mod(F(asset_pair_id_field), self.count)).filter(shard_index=self.index)
+
+
+DEFAULT_SHARD = Shard()
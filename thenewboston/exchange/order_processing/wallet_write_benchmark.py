@@ -0,0 +1,154 @@
+"""
+Concurrent wallet writes benchmark: every writer thread changes the balance of its own wallet (so writers can only
+contend on timestamps adjustment, see `AdjustableTimestampsModel._adjust_timestamps()`) while another thread
+publishes `trade_at` the same way the order processing engine does.
+
+`legacy=True` reproduces the former wallet writes that selected the wallet and `OrderProcessingLock` rows for update,
+so the throughput can be compared.
+"""
+
+import logging
+import random
+import string
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+
+from django.db import connection, transaction
+
+from thenewboston.currencies.models import Currency
+from thenewboston.users.models import User
+from thenewboston.wallets.models import Wallet
+
+from ..models import OrderProcessingLock
+from .benchmark import get_percentile
+from .engine import start_trade
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WalletWriteBenchmarkData:
+    user: User
+    wallet_ids: list[int]
+
+    @classmethod
+    def create(cls, wallets: int):
+        assert wallets <= 1000  # tickers are limited to 5 characters
+        with transaction.atomic():
+            # Currency tickers and usernames must be unique
+            while True:
+                tag = ''.join(random.choices(string.ascii_uppercase, k=2))
+                if not Currency.objects.filter(ticker__startswith=tag).exists():
+                    break
+
+            user = User.objects.create(username=f'benchmark_{tag}_wallets')
+            currencies = [
+                Currency.objects.create(owner=user, ticker=f'{tag}{index:03d}', logo='images/benchmark.png')
+                for index in range(wallets)
+            ]
+            created_wallets = Wallet.objects.bulk_create(
+                Wallet(owner=user, currency=currency) for currency in currencies
+            )
+
+        return cls(user=user, wallet_ids=[wallet.id for wallet in created_wallets])
+
+    def cleanup(self):
+        # Currencies and wallets are deleted by cascade
+        User.objects.filter(id=self.user.id).delete()
+
+
+@dataclass
+class WalletWriteBenchmarkReport:
+    writes: int = 0
+    errors: int = 0
+    trade_at_publications: int = 0
+    elapsed_seconds: float = 0.0
+    latencies: list[float] = field(default_factory=list, repr=False)
+
+    @property
+    def writes_per_second(self):
+        return self.writes / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def get_latency_ms(self, percentile):
+        latency = get_percentile(sorted(self.latencies), percentile)
+        return None if latency is None else latency * 1000
+
+    def as_dict(self):
+        rv = asdict(self)
+        del rv['latencies']
+        rv.update(
+            writes_per_second=self.writes_per_second,
+            latency_p50_ms=self.get_latency_ms(50),
+            latency_p99_ms=self.get_latency_ms(99),
+        )
+        return rv
+
+
+def write_wallet(wallet_id, hold_seconds=0.0, legacy=False):
+    with transaction.atomic():
+        if legacy:
+            wallet = Wallet.objects.select_for_update().get(id=wallet_id)
+            list(OrderProcessingLock.objects.select_for_update().order_by('shard').values_list('trade_at', flat=True))
+            wallet.change_balance(1, should_stream=False, should_adjust_timestamps=False)
+        else:
+            wallet = Wallet.objects.get(id=wallet_id)
+            wallet.change_balance(1, should_stream=False)
+
+        if hold_seconds:
+            time.sleep(hold_seconds)  # the rest of the work done in the transaction (for instance, by API request)
+
+
+def run_wallet_write_benchmark(
+    data: WalletWriteBenchmarkData, writes_per_wallet, hold_seconds=0.0, publish_interval=0.01, legacy=False
+) -> WalletWriteBenchmarkReport:
+    """
+    Run the benchmark, the order processing lock must be acquired by the caller (so `trade_at` can be published).
+    """
+    report = WalletWriteBenchmarkReport()
+    report_lock = threading.Lock()
+    writers_done = threading.Event()
+
+    def write(wallet_id):
+        latencies = []
+        errors = 0
+        try:
+            for _ in range(writes_per_wallet):
+                start = time.perf_counter()
+                try:
+                    write_wallet(wallet_id, hold_seconds=hold_seconds, legacy=legacy)
+                except Exception:
+                    logger.exception('Wallet write failed')
+                    errors += 1
+                else:
+                    latencies.append(time.perf_counter() - start)
+        finally:
+            connection.close()
+
+        with report_lock:
+            report.writes += len(latencies)
+            report.errors += errors
+            report.latencies.extend(latencies)
+
+    def publish():
+        try:
+            while not writers_done.wait(publish_interval):
+                start_trade()
+                report.trade_at_publications += 1
+        finally:
+            connection.close()
+
+    writers = [threading.Thread(target=write, args=(wallet_id,)) for wallet_id in data.wallet_ids]
+    publisher = threading.Thread(target=publish)
+    publisher.start()
+    start = time.perf_counter()
+    for writer in writers:
+        writer.start()
+
+    for writer in writers:
+        writer.join()
+
+    report.elapsed_seconds = time.perf_counter() - start
+    writers_done.set()
+    publisher.join()
+    return report
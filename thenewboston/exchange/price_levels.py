@@ -0,0 +1,353 @@
+"""
+Aggregated (L2) order book: price levels (price, total unfilled quantity, order count) per asset pair and side.
+
+Price levels are maintained in Redis as orders change (on transaction commit) and every change increments
+the per asset pair sequence number. Changes are streamed to `OrderBookConsumer` subscribers as diffs with
+the sequence number, so clients can apply them on top of a snapshot (see `OrderBookView`) and resync when
+they detect a gap.
+
+Reloading a book from the database is coordinated with the changes: only one process reloads the book at a time
+(see `load_price_levels()`), and changes arriving meanwhile are journaled along with the ID of the database
+transaction that made them. Once the book is loaded, the journaled changes of the transactions that are not visible
+in the database snapshot the book was loaded from are applied, the rest are already counted in the loaded book.
+"""
+
+import json
+import logging
+import time
+from collections import defaultdict
+from uuid import uuid4
+
+from django.conf import settings
+from django.db import connection
+
+from thenewboston.general.clients.redis import get_redis_client
+from thenewboston.general.enums import MessageType
+from thenewboston.general.exceptions import ThenewbostonRuntimeError
+from thenewboston.general.utils.database import apply_on_commit
+
+BUY = 1
+SELL = -1
+SIDE_NAMES = {BUY: 'buy', SELL: 'sell'}
+PRICE_WIDTH = 20  # enough for `PositiveBigIntegerField`, zero-padded prices are sorted lexicographically
+
+# Applies ARGV (side index, price, quantity delta, count delta) * N starting from `first_change_index`
+APPLY_CHANGES_LUA = """
+local changes = {}
+for i = first_change_index, #ARGV, 4 do
+    local offset = ARGV[i] * 3 - 1
+    local price = ARGV[i + 1]
+    local quantity = redis.call('HINCRBY', KEYS[offset], price, ARGV[i + 2])
+    local count = redis.call('HINCRBY', KEYS[offset + 1], price, ARGV[i + 3])
+    if quantity <= 0 or count <= 0 then
+        redis.call('HDEL', KEYS[offset], price)
+        redis.call('HDEL', KEYS[offset + 1], price)
+        redis.call('ZREM', KEYS[offset + 2], price)
+        quantity = 0
+        count = 0
+    else
+        redis.call('ZADD', KEYS[offset + 2], 0, price)
+    end
+    -- Numbers are returned as separate items, because Lua formats big numbers in exponential notation
+    table.insert(changes, ARGV[i])
+    table.insert(changes, price)
+    table.insert(changes, quantity)
+    table.insert(changes, count)
+end
+
+return {redis.call('INCR', KEYS[1]), changes}
+"""
+
+# KEYS: sequence, buy quantities, buy counts, buy prices, sell quantities, sell counts, sell prices, loading, journal
+# ARGV: transaction ID, (side index, price, quantity delta, count delta) * N
+# The changes are journaled while the book is being loaded. The book is not changed if it has not been loaded yet
+# (absent sequence), it will be loaded on snapshot request
+UPDATE_SCRIPT = (
+    """
+if redis.call('EXISTS', KEYS[8]) == 1 then
+    redis.call('RPUSH', KEYS[9], cjson.encode(ARGV))
+    return false
+end
+
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return false
+end
+
+local first_change_index = 2
+"""
+    + APPLY_CHANGES_LUA
+)
+
+# KEYS: the same as for `UPDATE_SCRIPT`, ARGV: (side index, price, quantity delta, count delta) * N
+# Applies journaled changes while the book is being loaded
+REPLAY_SCRIPT = 'local first_change_index = 1\n' + APPLY_CHANGES_LUA
+
+# KEYS: the same as for `UPDATE_SCRIPT`, ARGV: loading token
+# Return 1 if loading is finished, 0 if there are more journaled changes to apply, -1 if the loading lock was lost
+FINISH_LOADING_SCRIPT = """
+if redis.call('GET', KEYS[8]) ~= ARGV[1] then
+    return -1
+end
+
+if redis.call('LLEN', KEYS[9]) > 0 then
+    return 0
+end
+
+redis.call('DEL', KEYS[8])
+return 1
+"""
+
+# The snapshot is taken by the same statement, so it is the one the levels are read from (one row with `NULL`
+# level is returned if there are no unfilled orders)
+LOAD_SQL = """
+SELECT pg_current_snapshot()::text, level.side, level.price, level.quantity, level.count
+FROM (SELECT 1) AS dummy
+LEFT JOIN (
+    SELECT side, price, sum(quantity - filled_quantity)::bigint AS quantity, count(*) AS count
+    FROM {table}
+    WHERE asset_pair_id = %(asset_pair_id)s AND status = ANY(%(statuses)s)
+    GROUP BY side, price
+) AS level ON true
+"""
+
+VISIBILITY_SQL = """
+SELECT pg_visible_in_snapshot(nullif(xact_id, '')::xid8, %(snapshot)s::pg_snapshot)
+FROM unnest(%(xact_ids)s::text[]) WITH ORDINALITY AS journal(xact_id, index)
+ORDER BY index
+"""
+
+LOADING_POLL_INTERVAL_SECONDS = 0.05
+
+# KEYS: the same as for `UPDATE_SCRIPT`, ARGV: depth
+# All prices have the same score, so they are sorted lexicographically: best bid is the last, best ask is the first
+SNAPSHOT_SCRIPT = """
+local sequence = redis.call('GET', KEYS[1])
+if not sequence then
+    return false
+end
+
+local depth = tonumber(ARGV[1])
+local buy_prices = redis.call('ZRANGE', KEYS[4], -depth, -1)
+local sell_prices = redis.call('ZRANGE', KEYS[7], 0, depth - 1)
+local result = {tonumber(sequence), {}, {}}
+for side, prices in ipairs({buy_prices, sell_prices}) do
+    if #prices > 0 then
+        local offset = side * 3 - 1
+        local quantities = redis.call('HMGET', KEYS[offset], unpack(prices))
+        local counts = redis.call('HMGET', KEYS[offset + 1], unpack(prices))
+        for i = 1, #prices do
+            table.insert(result[side + 1], prices[i] .. ':' .. quantities[i] .. ':' .. counts[i])
+        end
+    end
+end
+
+return result
+"""
+
+logger = logging.getLogger(__name__)
+
+_scripts: dict = {}
+
+
+def get_script(script):
+    if (registered_script := _scripts.get(script)) is None:
+        registered_script = _scripts[script] = get_redis_client().register_script(script)
+
+    return registered_script
+
+
+def get_keys(asset_pair_id) -> list[str]:
+    prefix = f'{settings.PRICE_LEVELS_KEY_PREFIX}:{asset_pair_id}'
+    keys = [f'{prefix}:sequence']
+    for side_name in (SIDE_NAMES[BUY], SIDE_NAMES[SELL]):
+        keys.extend(f'{prefix}:{side_name}:{name}' for name in ('quantities', 'counts', 'prices'))
+
+    keys.extend((f'{prefix}:loading', f'{prefix}:journal'))
+    return keys
+
+
+def get_current_xact_id() -> str:
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_current_xact_id()::text')
+        return cursor.fetchone()[0]
+
+
+def get_side_index(side):
+    return 1 if side == BUY else 2
+
+
+def format_price(price):
+    return str(price).zfill(PRICE_WIDTH)
+
+
+def parse_level(level) -> dict:
+    price, quantity, count = level.split(':')
+    return {'price': int(price), 'quantity': int(quantity), 'count': int(count)}
+
+
+def stream_changes(asset_pair_id, sequence, changes=None):
+    from .consumers.order_book import OrderBookConsumer
+
+    OrderBookConsumer.stream_order_book(
+        message_type=MessageType.UPDATE_ORDER_BOOK,
+        asset_pair_id=asset_pair_id,
+        # `changes=None` means the book was reloaded and clients must request a new snapshot
+        order_book_data={'asset_pair': asset_pair_id, 'sequence': sequence, 'changes': changes},
+    )
+
+
+def stream_applied_changes(asset_pair_id, result) -> int:
+    sequence, levels = result
+    stream_changes(
+        asset_pair_id,
+        sequence,
+        [
+            {'side': BUY if side_index == '1' else SELL, 'price': int(price), 'quantity': quantity, 'count': count}
+            for side_index, price, quantity, count in zip(*[iter(levels)] * 4)
+        ],
+    )
+    return sequence
+
+
+def apply_price_level_changes(asset_pair_id, changes, xact_id='') -> int | None:
+    """
+    Apply `[(side, price, quantity_delta, count_delta), ...]` changes made by the (committed) database transaction
+    `xact_id` to the price levels of the asset pair and stream the resulting levels. Return the new sequence number
+    or `None` if the book is not loaded (or being loaded, then the changes are journaled).
+    """
+    merged_changes: defaultdict[tuple[int, int], list[int]] = defaultdict(lambda: [0, 0])
+    for side, price, quantity_delta, count_delta in changes:
+        merged_change = merged_changes[(side, price)]
+        merged_change[0] += quantity_delta
+        merged_change[1] += count_delta
+
+    args = [xact_id]
+    for (side, price), (quantity_delta, count_delta) in merged_changes.items():
+        if quantity_delta or count_delta:
+            args.extend((get_side_index(side), format_price(price), quantity_delta, count_delta))
+
+    if len(args) == 1:
+        return None
+
+    if (result := get_script(UPDATE_SCRIPT)(keys=get_keys(asset_pair_id), args=args)) is None:
+        return None
+
+    return stream_applied_changes(asset_pair_id, result)
+
+
+def apply_price_level_changes_on_commit(asset_pair_id, changes, xact_id=None):
+    # The transaction ID tells a reload whether the changes are already counted in the database snapshot it reads
+    if xact_id is None:
+        xact_id = get_current_xact_id()
+
+    apply_on_commit(
+        lambda asset_pair_id=asset_pair_id, changes=changes, xact_id=xact_id: apply_price_level_changes(
+            asset_pair_id, changes, xact_id
+        )
+    )
+
+
+def replay_journal(asset_pair_id, keys, token, snapshot) -> bool:
+    """
+    Apply the changes journaled while the book was being loaded that are not counted in the database `snapshot`.
+    Return `False` if the loading lock was lost.
+    """
+    redis_client = get_redis_client()
+    journal_key = keys[-1]
+    while (is_finished := get_script(FINISH_LOADING_SCRIPT)(keys=keys, args=[token])) == 0:
+        entries = [json.loads(entry) for entry in redis_client.lrange(journal_key, 0, -1)]
+        with connection.cursor() as cursor:
+            cursor.execute(VISIBILITY_SQL, {'snapshot': snapshot, 'xact_ids': [entry[0] for entry in entries]})
+            visibilities = [is_visible for (is_visible,) in cursor.fetchall()]
+
+        for (xact_id, *args), is_visible in zip(entries, visibilities):
+            # Changes without transaction ID cannot be matched against the snapshot, so they are applied
+            if xact_id and is_visible:
+                continue
+
+            stream_applied_changes(asset_pair_id, get_script(REPLAY_SCRIPT)(keys=keys, args=args))
+
+        redis_client.ltrim(journal_key, len(entries), -1)
+
+    return is_finished == 1
+
+
+def load_price_levels(asset_pair_id) -> int | None:
+    """
+    (Re)load price levels of the asset pair from the database. Return the new sequence number or `None` if
+    the book is being loaded by another process.
+    """
+    from .models import ExchangeOrder
+    from .models.exchange_order import UNFILLED_STATUSES
+
+    keys = get_keys(asset_pair_id)
+    sequence_key, *side_keys, loading_key, journal_key = keys
+    token = uuid4().hex
+    redis_client = get_redis_client()
+    if not redis_client.set(loading_key, token, nx=True, ex=settings.PRICE_LEVELS_LOADING_TIMEOUT_SECONDS):
+        logger.debug('Price levels for asset pair %s are being loaded by another process', asset_pair_id)
+        return None
+
+    try:
+        redis_client.delete(journal_key)  # left by a loading that could not finish
+        with connection.cursor() as cursor:
+            cursor.execute(
+                LOAD_SQL.format(table=ExchangeOrder._meta.db_table),
+                {'asset_pair_id': asset_pair_id, 'statuses': list(UNFILLED_STATUSES)},
+            )
+            rows = cursor.fetchall()
+
+        snapshot = rows[0][0]
+        pipeline = redis_client.pipeline()  # transactional, so readers never see a partially loaded book
+        pipeline.delete(*side_keys)
+        for _, side, price, quantity, count in rows:
+            if side is None:
+                continue
+
+            offset = (get_side_index(side) - 1) * 3
+            quantities_key, counts_key, prices_key = side_keys[offset : offset + 3]
+            price = format_price(price)
+            pipeline.hset(quantities_key, price, quantity)
+            pipeline.hset(counts_key, price, count)
+            pipeline.zadd(prices_key, {price: 0})
+
+        pipeline.incr(sequence_key)
+        *_, sequence = pipeline.execute()
+        logger.debug('Loaded price levels for asset pair %s (%s keys)', asset_pair_id, len(keys))
+        stream_changes(asset_pair_id, sequence)
+
+        if not replay_journal(asset_pair_id, keys, token, snapshot):
+            raise ThenewbostonRuntimeError(f'Lost the loading lock of price levels for asset pair {asset_pair_id}')
+    except Exception:
+        # The book may have missed changes, so it is dropped to be loaded again
+        redis_client.delete(*keys)
+        raise
+
+    return get_sequence(asset_pair_id)
+
+
+def get_sequence(asset_pair_id) -> int | None:
+    sequence = get_redis_client().get(get_keys(asset_pair_id)[0])
+    return None if sequence is None else int(sequence)
+
+
+def get_price_levels_snapshot(asset_pair_id, depth) -> dict:
+    keys = get_keys(asset_pair_id)
+    script = get_script(SNAPSHOT_SCRIPT)
+    if (result := script(keys=keys, args=[depth])) is None:
+        load_price_levels(asset_pair_id)
+        # The book may be loaded by another process, then we wait for it instead of loading it concurrently
+        deadline = time.monotonic() + settings.PRICE_LEVELS_LOADING_TIMEOUT_SECONDS
+        while (result := script(keys=keys, args=[depth])) is None:
+            if time.monotonic() >= deadline:
+                raise ThenewbostonRuntimeError(f'Price levels for asset pair {asset_pair_id} are not loaded')
+
+            time.sleep(LOADING_POLL_INTERVAL_SECONDS)
+
+    sequence, buy_levels, sell_levels = result
+    return {
+        'asset_pair': asset_pair_id,
+        'sequence': sequence,
+        'buy_levels': [parse_level(level) for level in reversed(buy_levels)],  # best (highest) price first
+        'sell_levels': [parse_level(level) for level in sell_levels],  # best (lowest) price first
+    }
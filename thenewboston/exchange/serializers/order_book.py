@@ -0,0 +1,25 @@
+from django.conf import settings
+from rest_framework import serializers
+
+
+class OrderBookQuerySerializer(serializers.Serializer):
+    asset_pair = serializers.IntegerField(min_value=1)
+    depth = serializers.IntegerField(min_value=1, default=50)
+    sequence = serializers.IntegerField(min_value=0, required=False)
+
+    @staticmethod
+    def validate_depth(value):
+        return min(value, settings.PRICE_LEVELS_MAX_DEPTH)
+
+
+class PriceLevelSerializer(serializers.Serializer):
+    price = serializers.IntegerField()
+    quantity = serializers.IntegerField()
+    count = serializers.IntegerField()
+
+
+class OrderBookSerializer(serializers.Serializer):
+    asset_pair = serializers.IntegerField()
+    sequence = serializers.IntegerField()
+    buy_levels = PriceLevelSerializer(many=True)
+    sell_levels = PriceLevelSerializer(many=True)
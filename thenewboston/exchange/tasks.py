@@ -8,8 +8,8 @@ def update_trade_history_task():
     update_trade_history()
 
 
-@app.task(name='tasks.update_trade_history_for_currency_pair')
-def update_trade_history_for_currency_pair_task(asset_pair_id):
-    from .models import TradeHistoryItem
+@app.task(name='tasks.flush_trade_history_updates')
+def flush_trade_history_updates_task():
+    from .business_logic.trade_history_updates import flush_trade_history_updates
 
-    TradeHistoryItem.objects.update_for_currency_pair(asset_pair_id)
+    flush_trade_history_updates()
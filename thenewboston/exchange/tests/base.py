@@ -1,5 +1,6 @@
 from django.db import connection
 
+from thenewboston.exchange.models.order_processing_lock import TRADE_AT_LOCK_KEY
 from thenewboston.general.advisory_locks import make_advisory_lock_expression
 
 BASE_SQL_QUERY = """
@@ -31,4 +32,5 @@ def is_advisory_lock_set(lock_id: int, row_id: int):
 
 
 def has_advisory_locks():
-    return exists(f'{BASE_SQL_QUERY} LIMIT 1')
+    # `trade_at` publication lock is transaction level, so it is held until the end of the test transaction
+    return exists(f'{BASE_SQL_QUERY} AND NOT (classid = 0 AND objid = {TRADE_AT_LOCK_KEY}) LIMIT 1')
@@ -190,3 +190,29 @@ def test_advisory_lock_are_cleaned_up(bucky, dmitry, tnb_currency, yyy_currency)
     assert buy_order_2.status == 3  # FILLED
     assert not has_advisory_locks()
     ExchangeOrder.objects.all().delete()
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('bucky_yyy_wallet', 'dmitry_tnb_wallet')
+def test_advisory_lock_by_pks(bucky, dmitry, tnb_currency, yyy_currency):
+    sell_order = make_sell_order(dmitry, tnb_currency, yyy_currency, price=10)
+    buy_order = make_buy_order(bucky, tnb_currency, yyy_currency, price=10)
+    order_ids = [buy_order.id, sell_order.id]
+
+    assert ExchangeOrder.objects.advisory_lock_by_pks(order_ids, ORDER_PROCESSING_LOCK_ID) == {
+        sell_order.id: True,
+        buy_order.id: True,
+    }
+    assert is_advisory_lock_set(ORDER_PROCESSING_LOCK_ID, sell_order.id)
+    assert is_advisory_lock_set(ORDER_PROCESSING_LOCK_ID, buy_order.id)
+
+    assert ExchangeOrder.objects.advisory_unlock_by_pks([sell_order.id], ORDER_PROCESSING_LOCK_ID) == {
+        sell_order.id: True
+    }
+    assert not is_advisory_lock_set(ORDER_PROCESSING_LOCK_ID, sell_order.id)
+    assert ExchangeOrder.objects.advisory_unlock_by_pks(order_ids, ORDER_PROCESSING_LOCK_ID) == {
+        sell_order.id: False,  # already unlocked
+        buy_order.id: True,
+    }
+    assert not has_advisory_locks()
+    assert ExchangeOrder.objects.advisory_unlock_by_pks([], ORDER_PROCESSING_LOCK_ID) == {}
@@ -0,0 +1,25 @@
+from thenewboston.exchange.asset_pair_registry import asset_pair_registry
+from thenewboston.exchange.models import AssetPair
+
+
+def test_asset_pair_registry(django_assert_num_queries, tnb_currency, yyy_currency, zzz_currency):
+    tnb_yyy = AssetPair.objects.create(primary_currency=tnb_currency, secondary_currency=yyy_currency)
+    assert asset_pair_registry.get_id(tnb_currency.id, yyy_currency.id) == tnb_yyy.id
+
+    with django_assert_num_queries(0):
+        assert asset_pair_registry.get_id(tnb_currency.id, yyy_currency.id) == tnb_yyy.id
+        assert asset_pair_registry.get_currency_ids(tnb_yyy.id) == (tnb_currency.id, yyy_currency.id)
+
+    # Creation invalidates the registry
+    tnb_zzz = AssetPair.objects.create(primary_currency=tnb_currency, secondary_currency=zzz_currency)
+    assert asset_pair_registry.get_currency_ids(tnb_zzz.id) == (tnb_currency.id, zzz_currency.id)
+
+    # Asset pairs created by other processes are loaded on a miss
+    zzz_yyy = AssetPair.objects.bulk_create([AssetPair(primary_currency=zzz_currency, secondary_currency=yyy_currency)])
+    assert asset_pair_registry.get_id(zzz_currency.id, yyy_currency.id) == zzz_yyy[0].id
+
+    # Deletion invalidates the registry
+    tnb_zzz_id = tnb_zzz.id
+    tnb_zzz.delete()
+    assert asset_pair_registry.get_currency_ids(tnb_zzz_id) is None
+    assert asset_pair_registry.get_id(tnb_currency.id, zzz_currency.id) is None
@@ -0,0 +1,31 @@
+import pytest
+
+from thenewboston.exchange.business_logic.trade_asset_pair import backfill_trade_asset_pair
+from thenewboston.exchange.models import Trade
+from thenewboston.exchange.order_processing.engine import run_single_iteration
+
+from .factories.exchange_order import make_buy_order, make_sell_order
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('lock_order_processing', 'bucky_yyy_wallet', 'bucky_zzz_wallet', 'dmitry_tnb_wallet')
+def test_backfill_trade_asset_pair(bucky, dmitry, tnb_currency, yyy_currency, zzz_currency):
+    make_sell_order(dmitry, tnb_currency, yyy_currency, quantity=2, price=10)
+    yyy_buy_order = make_buy_order(bucky, tnb_currency, yyy_currency, quantity=1, price=10)
+    make_buy_order(bucky, tnb_currency, yyy_currency, quantity=1, price=10)
+    make_sell_order(dmitry, tnb_currency, zzz_currency, quantity=1, price=10)
+    zzz_buy_order = make_buy_order(bucky, tnb_currency, zzz_currency, quantity=1, price=10)
+    run_single_iteration()
+
+    expected = {(trade.id, trade.buy_order.asset_pair_id) for trade in Trade.objects.select_related('buy_order').all()}
+    assert len(expected) == 3
+    assert {asset_pair_id for _, asset_pair_id in expected} == {
+        yyy_buy_order.asset_pair_id,
+        zzz_buy_order.asset_pair_id,
+    }
+    assert set(Trade.objects.values_list('id', 'asset_pair_id')) == expected
+
+    Trade.objects.update(asset_pair=None)
+    assert backfill_trade_asset_pair(batch_size=2) == 3
+    assert set(Trade.objects.values_list('id', 'asset_pair_id')) == expected
+    assert backfill_trade_asset_pair() == 0
@@ -0,0 +1,95 @@
+import pytest
+from django.test import override_settings
+
+from thenewboston.exchange.models import ExchangeOrder
+from thenewboston.exchange.order_processing.benchmark import (
+    BenchmarkData,
+    CancelSpec,
+    OrderFlowConfig,
+    OrderFlowGenerator,
+    OrderSpec,
+    run_benchmark,
+)
+from thenewboston.exchange.order_processing.engine import order_processing_lock
+from thenewboston.exchange.order_processing.wallet_write_benchmark import (
+    WalletWriteBenchmarkData,
+    run_wallet_write_benchmark,
+)
+from thenewboston.users.models import User
+from thenewboston.wallets.models import Wallet
+
+from .base import has_advisory_locks
+
+try:
+    import pytest_benchmark  # noqa: F401
+except ImportError:
+    pytest_benchmark = None
+
+requires_pytest_benchmark = pytest.mark.skipif(pytest_benchmark is None, reason='pytest-benchmark is not installed')
+
+
+def test_order_flow_generator():
+    config = OrderFlowConfig(pairs=3, orders=25, burst_size=10, cancel_rate=0.5, seed=1)
+    bursts = list(OrderFlowGenerator(config))
+    assert bursts == list(OrderFlowGenerator(config))  # deterministic
+    assert [sum(isinstance(spec, OrderSpec) for spec in burst) for burst in bursts] == [10, 10, 5]
+
+    specs = [spec for burst in bursts for spec in burst]
+    assert any(isinstance(spec, CancelSpec) for spec in specs)
+    assert {spec.pair_index for spec in specs if isinstance(spec, OrderSpec)} == {0, 1, 2}
+    assert all(spec.price >= 1 and 1 <= spec.quantity <= 10 for spec in specs if isinstance(spec, OrderSpec))
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('lock_order_processing')
+@pytest.mark.parametrize('use_order_book', (False, True))
+def test_run_benchmark(use_order_book):
+    config = OrderFlowConfig(pairs=2, traders=3, orders=40, burst_size=8, price_spread=5)
+    data = BenchmarkData.create(config)
+    report = run_benchmark(config, data, use_order_book=use_order_book)
+
+    assert report.orders == 40
+    assert report.trades > 0
+    assert len(report.latencies) == report.trades
+    report_dict = report.as_dict()
+    assert report_dict['latency_p50_ms'] <= report_dict['latency_p99_ms']
+    assert report_dict['queries_per_trade'] > 0
+    assert not has_advisory_locks()
+
+    data.cleanup()
+    assert not ExchangeOrder.objects.exists()
+    assert not User.objects.exists()
+
+
+@requires_pytest_benchmark
+@pytest.mark.django_db
+@pytest.mark.usefixtures('lock_order_processing')
+@pytest.mark.parametrize('use_order_book', (False, True))
+@pytest.mark.parametrize('batch_size', (1, 20))
+def test_benchmark_order_processing_engine(benchmark, use_order_book, batch_size):
+    config = OrderFlowConfig(pairs=5, orders=500, burst_size=20)
+    data = BenchmarkData.create(config)
+
+    with override_settings(ORDER_PROCESSING_TRADE_BATCH_SIZE=batch_size):
+        # One round only, because the benchmark changes the database state
+        report = benchmark.pedantic(run_benchmark, args=(config, data, use_order_book), rounds=1, iterations=1)
+
+    benchmark.extra_info.update(report.as_dict())
+    assert report.trades > 0
+
+
+# Writers run in separate threads (database connections), so they must see the committed data
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize('legacy', (True, False))
+def test_run_wallet_write_benchmark(legacy):
+    data = WalletWriteBenchmarkData.create(wallets=3)
+    try:
+        with order_processing_lock(force=True):
+            report = run_wallet_write_benchmark(data, writes_per_wallet=5, publish_interval=0.001, legacy=legacy)
+
+        assert report.writes == 15
+        assert not report.errors
+        assert report.as_dict()['writes_per_second'] > 0
+        assert set(Wallet.objects.filter(id__in=data.wallet_ids).values_list('balance', flat=True)) == {5}
+    finally:
+        data.cleanup()
@@ -0,0 +1,129 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from django.forms.models import model_to_dict
+from freezegun import freeze_time
+
+from thenewboston.exchange.models import AssetPair, Candlestick, Trade
+from thenewboston.exchange.models.candlestick import get_bucket_start
+from thenewboston.exchange.order_processing.engine import run_single_iteration
+
+from .factories.exchange_order import make_buy_order, make_sell_order
+
+
+def get_candlesticks():
+    return [
+        model_to_dict(candlestick, exclude=('id',))
+        for candlestick in Candlestick.objects.order_by('asset_pair_id', 'resolution', 'bucket_start')
+    ]
+
+
+def test_get_bucket_start():
+    dt = datetime(2025, 7, 28, 13, 47, 12, 345, tzinfo=UTC)
+    assert get_bucket_start(dt, 5) == datetime(2025, 7, 28, 13, 45, tzinfo=UTC)
+    assert get_bucket_start(dt, 60) == datetime(2025, 7, 28, 13, tzinfo=UTC)
+    assert get_bucket_start(dt, 360) == datetime(2025, 7, 28, 12, tzinfo=UTC)
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('lock_order_processing', 'bucky_yyy_wallet', 'dmitry_tnb_wallet')
+def test_candlesticks_are_updated_on_trades(bucky, dmitry, tnb_currency, yyy_currency):
+    with freeze_time('2025-07-28 13:46:00') as frozen_time:
+        make_sell_order(dmitry, tnb_currency, yyy_currency, quantity=2, price=10)
+        make_sell_order(dmitry, tnb_currency, yyy_currency, quantity=3, price=12)
+        buy_order = make_buy_order(bucky, tnb_currency, yyy_currency, quantity=5, price=12)
+        run_single_iteration()
+        frozen_time.move_to('2025-07-28 13:47:00')
+        make_sell_order(dmitry, tnb_currency, yyy_currency, quantity=1, price=11)
+        make_buy_order(bucky, tnb_currency, yyy_currency, quantity=1, price=11)
+        run_single_iteration()
+
+    trades = list(Trade.objects.order_by('created_date', 'id'))
+    assert [(trade.price, trade.filled_quantity) for trade in trades] == [(10, 2), (12, 3), (11, 1)]
+
+    asset_pair_id = buy_order.asset_pair_id
+    expected_candlesticks = [
+        {
+            'asset_pair': asset_pair_id,
+            'resolution': resolution,
+            'bucket_start': bucket_start,
+            'open': 10,
+            'high': 12,
+            'low': 10,
+            'close': 11,
+            'volume': 6,
+            'open_date': trades[0].created_date,
+            'close_date': trades[-1].created_date,
+        }
+        for resolution, bucket_start in (
+            (5, datetime(2025, 7, 28, 13, 45, tzinfo=UTC)),
+            (60, datetime(2025, 7, 28, 13, tzinfo=UTC)),
+            (360, datetime(2025, 7, 28, 12, tzinfo=UTC)),
+        )
+    ]
+    assert get_candlesticks() == expected_candlesticks
+
+    # A trade added out of chronological order does not become the close (or the open) of the bucket
+    late_trade = Trade(
+        asset_pair_id=asset_pair_id,
+        price=9,
+        filled_quantity=1,
+        created_date=datetime(2025, 7, 28, 13, 46, 30, tzinfo=UTC),
+    )
+    Candlestick.objects.add_trades([late_trade])
+    assert [
+        (candlestick['open'], candlestick['low'], candlestick['close'], candlestick['volume'])
+        for candlestick in get_candlesticks()
+    ] == [(10, 9, 11, 7)] * 3
+
+    # Rebuilding deletes the buckets that have no trades
+    stale_bucket_start = datetime(2025, 7, 28, 13, 50, tzinfo=UTC)
+    Candlestick.objects.create(
+        asset_pair_id=asset_pair_id,
+        resolution=5,
+        bucket_start=stale_bucket_start,
+        open=1,
+        high=1,
+        low=1,
+        close=1,
+        volume=1,
+        open_date=stale_bucket_start,
+        close_date=stale_bucket_start,
+    )
+    Candlestick.objects.rebuild_for_asset_pair(asset_pair_id)
+    assert get_candlesticks() == expected_candlesticks
+
+
+@pytest.mark.django_db
+@freeze_time('2025-07-28 13:47:00')
+def test_trade_price_chart_data(authenticated_api_client, tnb_currency, yyy_currency):
+    # Authentication is forced, because a JWT issued at the real time is not valid yet at the frozen time
+    asset_pair = AssetPair.objects.create(primary_currency=tnb_currency, secondary_currency=yyy_currency)
+    first_bucket_start = datetime(2025, 7, 28, 13, 25, tzinfo=UTC)
+    for offset, price in ((0, 10), (10, 12)):
+        bucket_start = first_bucket_start + timedelta(minutes=offset)
+        Candlestick.objects.create(
+            asset_pair=asset_pair,
+            resolution=5,
+            bucket_start=bucket_start,
+            open=price,
+            high=price + 1,
+            low=price - 1,
+            close=price,
+            volume=3,
+            open_date=bucket_start,
+            close_date=bucket_start,
+        )
+
+    response = authenticated_api_client.get(f'/api/trade-price-chart-data?asset_pair={asset_pair.id}&time_range=1d')
+    assert response.status_code == 200
+    data = response.json()
+    assert data['interval_minutes'] == 5
+    assert [
+        (candlestick['open'], candlestick['high'], candlestick['low'], candlestick['close'], candlestick['volume'])
+        for candlestick in data['candlesticks']
+    ] == [(10, 11, 9, 10, 3), (10, 10, 10, 10, 0), (12, 13, 11, 12, 3), (12, 12, 12, 12, 0), (12, 12, 12, 12, 0)]
+
+    response = authenticated_api_client.get(f'/api/trade-price-chart-data?asset_pair={asset_pair.id}&time_range=1w')
+    assert response.status_code == 200
+    assert response.json()['candlesticks'] == []
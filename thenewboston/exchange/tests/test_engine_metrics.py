@@ -0,0 +1,39 @@
+import pytest
+
+from thenewboston.exchange.order_processing.engine import OrderProcessingEngine
+from thenewboston.exchange.order_processing.metrics import get_histogram_percentile, get_snapshots, render_prometheus
+
+from .factories.exchange_order import make_buy_order, make_sell_order
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('bucky_yyy_wallet', 'dmitry_tnb_wallet', 'lock_order_processing')
+def test_engine_metrics(bucky, dmitry, tnb_currency, yyy_currency, api_client_bucky_staff, api_client):
+    make_sell_order(dmitry, tnb_currency, yyy_currency, price=100, quantity=1)
+    make_sell_order(dmitry, tnb_currency, yyy_currency, price=101, quantity=1)
+    make_buy_order(bucky, tnb_currency, yyy_currency, price=101, quantity=2)
+
+    engine = OrderProcessingEngine(hook_signals=False)
+    assert not engine.run_iteration()
+    assert not engine.run_iteration()
+
+    metrics = engine.metrics
+    assert metrics.counters['iterations_total'] == 2
+    assert metrics.counters['trades_total'] == 2
+    assert metrics.counters['candidate_orders_total'] == 3
+    assert metrics.counters['db_queries_total'] > 0
+    assert metrics.histograms['trades_per_iteration'].counts[:2] == [1, 0]  # buckets: 0 and 1 trades
+    assert get_histogram_percentile(metrics.histograms['trades_per_iteration'].as_dict(), 99) == 2
+
+    metrics.export(force=True)
+    snapshots = get_snapshots()
+    assert [snapshot['counters']['trades_total'] for snapshot in snapshots] == [2]
+
+    text = render_prometheus(snapshots)
+    assert 'thenewboston_order_processing_trades_total{shard="0"} 2\n' in text
+    assert 'thenewboston_order_processing_trades_per_iteration_bucket{shard="0",le="+Inf"} 2\n' in text
+
+    response = api_client_bucky_staff.get('/api/order-processing-metrics')
+    assert response.status_code == 200
+    assert response.content.decode() == text
+    assert api_client.get('/api/order-processing-metrics').status_code == 401
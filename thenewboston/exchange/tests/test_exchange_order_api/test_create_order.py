@@ -1,3 +1,4 @@
+import json
 import uuid
 from datetime import timedelta
 from unittest.mock import patch
@@ -9,7 +10,7 @@ from model_bakery import baker
 from thenewboston.exchange.models import ExchangeOrder, OrderProcessingLock
 from thenewboston.general.clients.redis import get_redis_client
 from thenewboston.general.enums import MessageType
-from thenewboston.general.tests.any import ANY_INT
+from thenewboston.general.tests.any import ANY_INT, Any
 from thenewboston.general.tests.misc import model_to_dict_with_id
 from thenewboston.general.utils.datetime import to_iso_format
 from thenewboston.wallets.models.wallet import Wallet
@@ -325,7 +326,22 @@ def test_publish_new_order_message(authenticated_api_client, tnb_currency, yyy_c
         )
         message = pubsub.get_message(ignore_subscribe_messages=True, timeout=0.01)
         assert message
-        assert message.get('type') == 'message' and message.get('data') == 'new_order'
+        assert message.get('type') == 'message'
+        order = ExchangeOrder.objects.get()
+        assert json.loads(message['data']) == {
+            'sequence': ANY_INT,
+            'event': 'new_order',
+            'published_at': Any(type_=float),
+            'order': {
+                'id': order.id,
+                'asset_pair': asset_pair.id,
+                'side': 1,
+                'price': 101,
+                'quantity': 2,
+                'created_date': order.created_date.isoformat(),
+                'owner': order.owner_id,
+            },
+        }
     finally:
         pubsub.unsubscribe()
         pubsub.close()
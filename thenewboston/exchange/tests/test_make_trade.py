@@ -1,10 +1,13 @@
 from datetime import datetime, timezone
-from unittest.mock import call, patch
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
+from django.test import override_settings
 from pytest_parametrize_cases import Case, parametrize_cases
 
 from thenewboston.exchange.order_processing.engine import make_trade
 from thenewboston.general.enums import MessageType
+from thenewboston.general.models import OutboxEvent
+from thenewboston.general.outbox import dispatch_outbox_events
 from thenewboston.general.tests.any import ANY_DATETIME_STR, ANY_INT, ANY_STR
 from thenewboston.general.tests.misc import model_to_dict_with_id
 from thenewboston.general.utils.datetime import to_iso_format
@@ -547,3 +550,61 @@ def test_make_trade_with_partly_filled_orders(
     assert sell_order_credit_wallet.balance == expected_filled_quantity * sell_price  # received by trade price
     assert sell_order_credit_wallet.created_date == trade_at
     assert sell_order_credit_wallet.modified_date == trade_at
+
+
+def test_make_trade_streams_through_outbox(
+    bucky, bucky_yyy_wallet, yyy_currency, dmitry, dmitry_tnb_wallet, tnb_currency
+):
+    with (
+        patch('thenewboston.wallets.consumers.wallet.WalletConsumer.stream_wallet'),
+        patch('thenewboston.exchange.consumers.exchange_order.ExchangeOrderConsumer.stream_exchange_order'),
+    ):
+        buy_order = make_buy_order(bucky, tnb_currency, yyy_currency, quantity=2, price=105)
+        sell_order = make_sell_order(dmitry, tnb_currency, yyy_currency, quantity=2, price=101)
+
+    trade_at = datetime.now(timezone.utc)
+    channel_layer = MagicMock()
+    channel_layer.group_send = AsyncMock()
+    with (
+        override_settings(USE_ON_COMMIT_HOOK=True, USE_STREAMING_OUTBOX=True),
+        patch('thenewboston.general.utils.stream_buffer.get_channel_layer', return_value=channel_layer),
+    ):
+        make_trade(sell_order, buy_order, trade_at)
+
+        # Nothing is sent until the events are dispatched from the outbox
+        channel_layer.group_send.assert_not_called()
+        outbox_events_count = OutboxEvent.objects.count()
+        assert outbox_events_count
+        assert dispatch_outbox_events(batch_size=outbox_events_count) == outbox_events_count
+
+    assert not OutboxEvent.objects.exists()
+    events = [(args[0], args[1]) for args, _ in channel_layer.group_send.call_args_list]
+    trade = Trade.objects.get()
+    assert [event for group_name, event in events if group_name == 'trades_TNB'] == [
+        {
+            'payload': {
+                'id': trade.id,
+                'asset_pair': trade.asset_pair_id,
+                'created_date': to_iso_format(trade_at),
+                'modified_date': to_iso_format(trade_at),
+                'filled_quantity': 2,
+                'price': 101,
+                'overpayment_amount': 8,
+                'buy_order': buy_order.id,
+                'sell_order': sell_order.id,
+            },
+            'type': MessageType.CREATE_TRADE.value,
+        }
+    ]
+    order_events = [event for group_name, event in events if group_name == f'exchange_orders_{trade.asset_pair_id}']
+    assert [(event['payload']['id'], event['payload']['status']) for event in order_events] == [
+        (buy_order.id, 3),  # FILLED
+        (sell_order.id, 3),
+    ]
+    bucky_yyy_wallet.refresh_from_db()
+    assert bucky_yyy_wallet.balance == 1000 - 2 * 101  # overpayment is returned
+    assert {
+        event['payload']['id']: event['payload']['balance']
+        for group_name, event in events
+        if group_name == f'user_{bucky.id}_wallet'
+    }[bucky_yyy_wallet.id] == bucky_yyy_wallet.balance
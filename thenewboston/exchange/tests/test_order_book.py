@@ -0,0 +1,68 @@
+import pytest
+
+from thenewboston.exchange.models import ExchangeOrder, Trade
+from thenewboston.exchange.models.exchange_order import ExchangeOrderStatus
+from thenewboston.exchange.order_processing.engine import run_single_order_book_iteration, start_trade
+from thenewboston.exchange.order_processing.order_book import OrderBooks
+
+from .base import has_advisory_locks
+from .factories.exchange_order import make_buy_order, make_sell_order
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('bucky_yyy_wallet', 'dmitry_tnb_wallet', 'lock_order_processing')
+def test_order_book__price_time_priority(bucky, dmitry, tnb_currency, yyy_currency):
+    sell_order_1 = make_sell_order(dmitry, tnb_currency, yyy_currency, price=101)
+    sell_order_2 = make_sell_order(dmitry, tnb_currency, yyy_currency, price=100)
+    sell_order_3 = make_sell_order(dmitry, tnb_currency, yyy_currency, price=100)
+    buy_order_1 = make_buy_order(bucky, tnb_currency, yyy_currency, price=99)
+    buy_order_2 = make_buy_order(bucky, tnb_currency, yyy_currency, price=99)
+
+    order_books = OrderBooks()
+    order_books.sync(start_trade())
+    book = order_books.get_book(sell_order_1.asset_pair_id)
+    assert len(book) == 5
+    assert book.asks.peek().id == sell_order_2.id  # the best price, then the earliest order
+    assert book.bids.peek().id == buy_order_1.id
+    assert not book.is_crossed()
+    assert not order_books.get_crossed_books()
+
+    book.remove(sell_order_2.id)
+    assert book.asks.peek().id == sell_order_3.id
+    book.remove(sell_order_3.id)
+    assert book.asks.peek().id == sell_order_1.id
+    assert book.asks.prices == [101]
+    assert buy_order_2.id in book.entries
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('bucky_yyy_wallet', 'dmitry_tnb_wallet', 'lock_order_processing')
+def test_run_single_order_book_iteration(bucky, dmitry, tnb_currency, yyy_currency):
+    order_books = OrderBooks()
+    assert not run_single_order_book_iteration(order_books)
+    assert order_books.is_loaded()
+
+    # Orders created after the order books are loaded are picked up incrementally
+    buy_order = make_buy_order(bucky, tnb_currency, yyy_currency, price=102, quantity=5)
+    sell_order_1 = make_sell_order(dmitry, tnb_currency, yyy_currency, price=101, quantity=3)
+    sell_order_2 = make_sell_order(dmitry, tnb_currency, yyy_currency, price=100, quantity=1)
+    cancelled_sell_order = make_sell_order(dmitry, tnb_currency, yyy_currency, price=99, quantity=1)
+    cancelled_sell_order.cancel()
+
+    assert not run_single_order_book_iteration(order_books)
+    assert not has_advisory_locks()
+
+    assert list(Trade.objects.order_by('id').values_list('sell_order_id', 'price', 'filled_quantity')) == [
+        (sell_order_2.id, 100, 1),
+        (sell_order_1.id, 101, 3),
+    ]
+
+    buy_order.refresh_from_db()
+    assert (buy_order.status, buy_order.filled_quantity) == (ExchangeOrderStatus.PARTIALLY_FILLED.value, 4)
+    assert set(order_books.get_book(buy_order.asset_pair_id).entries) == {buy_order.id}
+
+    # Cancellation is applied to the order book incrementally
+    ExchangeOrder.objects.get(id=buy_order.id).cancel()
+    make_sell_order(dmitry, tnb_currency, yyy_currency, price=100, quantity=1)
+    assert not run_single_order_book_iteration(order_books)
+    assert Trade.objects.count() == 2
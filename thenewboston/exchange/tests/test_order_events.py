@@ -0,0 +1,77 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from thenewboston.exchange.models import Trade
+from thenewboston.exchange.order_processing.engine import OrderProcessingEngine
+from thenewboston.exchange.order_processing.events import (
+    CANCEL_ORDER_EVENT,
+    NEW_ORDER_EVENT,
+    OrderEventReader,
+    parse_order_event,
+    serialize_order,
+)
+from thenewboston.exchange.order_processing.order_book import OrderBooks
+
+from .base import has_advisory_locks
+from .factories.exchange_order import make_buy_order, make_sell_order
+
+
+def make_message(sequence, event, order_data):
+    return {'type': 'message', 'data': json.dumps({'sequence': sequence, 'event': event, 'order': order_data})}
+
+
+def test_order_event_reader():
+    order_data = {
+        'id': 1,
+        'asset_pair': 2,
+        'side': 1,
+        'price': 10**18,  # big integers must not lose precision
+        'quantity': 3,
+        'created_date': '2025-07-01T00:00:00+00:00',
+        'owner': 4,
+    }
+    reader = OrderEventReader()
+    events = reader.read(
+        [make_message(5, NEW_ORDER_EVENT, order_data), make_message(6, CANCEL_ORDER_EVENT, order_data)]
+    )
+    assert [(event.sequence, event.event, event.price) for event in events] == [
+        (5, NEW_ORDER_EVENT, 10**18),
+        (6, CANCEL_ORDER_EVENT, 10**18),
+    ]
+
+    assert reader.read([make_message(8, NEW_ORDER_EVENT, order_data)]) is None  # sequence gap
+    assert reader.read([make_message(9, NEW_ORDER_EVENT, order_data)])
+    assert reader.read([{'type': 'message', 'data': 'new_order'}]) is None  # legacy message format
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('bucky_yyy_wallet', 'dmitry_tnb_wallet', 'lock_order_processing')
+def test_run_iteration__order_events_fast_path(bucky, dmitry, tnb_currency, yyy_currency):
+    engine = OrderProcessingEngine(hook_signals=False, use_order_book=True)
+    assert not engine.run_iteration()  # initial reconciliation loads the order books
+    assert engine.order_books.is_loaded()
+
+    buy_order = make_buy_order(bucky, tnb_currency, yyy_currency, price=102, quantity=5)
+    sell_order = make_sell_order(dmitry, tnb_currency, yyy_currency, price=101, quantity=3)
+    cancelled_sell_order = make_sell_order(dmitry, tnb_currency, yyy_currency, price=100, quantity=1)
+    cancelled_sell_order.cancel()
+    events = [
+        parse_order_event(make_message(sequence, event, serialize_order(order))['data'])
+        for sequence, event, order in (
+            (1, NEW_ORDER_EVENT, buy_order),
+            (2, NEW_ORDER_EVENT, sell_order),
+            (3, NEW_ORDER_EVENT, cancelled_sell_order),
+            (4, CANCEL_ORDER_EVENT, cancelled_sell_order),
+        )
+    ]
+
+    with patch.object(OrderBooks, 'sync') as sync_mock:
+        assert not engine.run_iteration(events)
+
+    sync_mock.assert_not_called()
+    assert not has_advisory_locks()
+    assert list(Trade.objects.values_list('sell_order_id', 'buy_order_id', 'price', 'filled_quantity')) == [
+        (sell_order.id, buy_order.id, 101, 3)
+    ]
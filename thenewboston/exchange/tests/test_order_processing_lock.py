@@ -1,6 +1,15 @@
+import logging
+import threading
+from unittest.mock import patch
+
 import pytest
+from django.db import connection, transaction
 
-from thenewboston.exchange.models.order_processing_lock import OrderProcessingLock
+from thenewboston.exchange.models.order_processing_lock import (
+    OrderProcessingLock,
+    get_published_trade_at,
+    wait_for_trade_at_readers,
+)
 from thenewboston.exchange.order_processing.engine import order_processing_lock
 from thenewboston.general.exceptions import ThenewbostonRuntimeError
 
@@ -25,3 +34,50 @@ def test_order_processing_lock():
         with order_processing_lock(force=True):
             lock = OrderProcessingLock.objects.get()
             assert first_acquired_at < lock.acquired_at
+
+
+# Readers and the waiter run in separate threads (database connections)
+@pytest.mark.django_db(transaction=True)
+def test_wait_for_trade_at_readers_does_not_block_readers(caplog):
+    reader_ready = threading.Event()
+    release_reader = threading.Event()
+
+    def read():
+        try:
+            with transaction.atomic():
+                get_published_trade_at()
+                reader_ready.set()
+                release_reader.wait(5)
+        finally:
+            connection.close()
+
+    def wait():
+        try:
+            wait_for_trade_at_readers()
+        finally:
+            connection.close()
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    assert reader_ready.wait(5)
+    waiter = threading.Thread(target=wait)
+    with (
+        caplog.at_level(logging.WARNING, logger='thenewboston.exchange.models.order_processing_lock'),
+        patch('thenewboston.exchange.models.order_processing_lock.TRADE_AT_READERS_WARNING_SECONDS', 0.1),
+    ):
+        waiter.start()
+        waiter.join(0.2)
+
+    try:
+        assert waiter.is_alive()  # waits for the reader
+        assert 'Waiting for trade_at readers' in caplog.text  # slow readers are reported
+
+        with transaction.atomic():
+            get_published_trade_at()  # new readers are not blocked by the waiting
+            wait_for_trade_at_readers()  # the transaction's own lock is not waited for
+    finally:
+        release_reader.set()
+        reader.join(5)
+        waiter.join(5)
+
+    assert not waiter.is_alive()
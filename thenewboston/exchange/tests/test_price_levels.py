@@ -0,0 +1,119 @@
+from unittest.mock import patch
+
+import pytest
+from django.db import connection
+
+from thenewboston.exchange.models import AssetPair
+from thenewboston.exchange.order_processing.engine import run_single_iteration
+from thenewboston.exchange.price_levels import (
+    BUY,
+    apply_price_level_changes,
+    get_keys,
+    get_price_levels_snapshot,
+    load_price_levels,
+    replay_journal,
+)
+from thenewboston.general.clients.redis import get_redis_client
+from thenewboston.general.enums import MessageType
+
+from .factories.exchange_order import make_buy_order, make_sell_order
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('lock_order_processing', 'bucky_yyy_wallet', 'dmitry_tnb_wallet')
+def test_price_levels(api_client_bucky, bucky, dmitry, tnb_currency, yyy_currency):
+    asset_pair = AssetPair.objects.create(primary_currency=tnb_currency, secondary_currency=yyy_currency)
+    get_redis_client().delete(*get_keys(asset_pair.id))
+
+    make_sell_order(dmitry, tnb_currency, yyy_currency, price=10, quantity=1)
+    make_sell_order(dmitry, tnb_currency, yyy_currency, price=9, quantity=8)
+    make_sell_order(dmitry, tnb_currency, yyy_currency, price=9, quantity=2)
+    make_buy_order(bucky, tnb_currency, yyy_currency, price=7, quantity=12)
+    make_buy_order(bucky, tnb_currency, yyy_currency, price=6, quantity=3)
+
+    with patch('thenewboston.exchange.consumers.order_book.OrderBookConsumer.stream_order_book') as stream_mock:
+        response = api_client_bucky.get(f'/api/order-book?asset_pair={asset_pair.id}&depth=1')
+
+    assert response.status_code == 200
+    sequence = response.json()['sequence']
+    assert response.json() == {
+        'asset_pair': asset_pair.id,
+        'sequence': sequence,
+        'buy_levels': [{'price': 7, 'quantity': 12, 'count': 1}],
+        'sell_levels': [{'price': 9, 'quantity': 10, 'count': 2}],
+    }
+    stream_mock.assert_called_once_with(
+        message_type=MessageType.UPDATE_ORDER_BOOK,
+        asset_pair_id=asset_pair.id,
+        order_book_data={'asset_pair': asset_pair.id, 'sequence': sequence, 'changes': None},
+    )
+
+    response = api_client_bucky.get(f'/api/order-book?asset_pair={asset_pair.id}&sequence={sequence}')
+    assert response.status_code == 304
+
+    # Changes are applied incrementally and streamed as diffs
+    with patch('thenewboston.exchange.consumers.order_book.OrderBookConsumer.stream_order_book') as stream_mock:
+        make_buy_order(bucky, tnb_currency, yyy_currency, price=9, quantity=9)
+        run_single_iteration()
+
+    assert [call.kwargs['order_book_data']['sequence'] for call in stream_mock.call_args_list] == list(
+        range(sequence + 1, sequence + 1 + stream_mock.call_count)
+    )
+    assert stream_mock.call_args_list[0].kwargs['order_book_data']['changes'] == [
+        {'side': 1, 'price': 9, 'quantity': 9, 'count': 1}
+    ]
+
+    snapshot = get_price_levels_snapshot(asset_pair.id, depth=10)
+    assert snapshot['buy_levels'] == [{'price': 7, 'quantity': 12, 'count': 1}, {'price': 6, 'quantity': 3, 'count': 1}]
+    assert snapshot['sell_levels'] == [
+        {'price': 9, 'quantity': 1, 'count': 1},
+        {'price': 10, 'quantity': 1, 'count': 1},
+    ]
+
+    # Incrementally maintained levels are the same as loaded from the database
+    with patch('thenewboston.exchange.consumers.order_book.OrderBookConsumer.stream_order_book'):
+        load_price_levels(asset_pair.id)
+
+    reloaded_snapshot = get_price_levels_snapshot(asset_pair.id, depth=10)
+    assert reloaded_snapshot['buy_levels'] == snapshot['buy_levels']
+    assert reloaded_snapshot['sell_levels'] == snapshot['sell_levels']
+    get_redis_client().delete(*get_keys(asset_pair.id))
+
+    assert api_client_bucky.get('/api/order-book?asset_pair=0').status_code == 400
+    assert api_client_bucky.get(f'/api/order-book?asset_pair={asset_pair.id + 1000}').status_code == 404
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('bucky_yyy_wallet')
+def test_price_level_changes_are_journaled_while_loading(bucky, tnb_currency, yyy_currency):
+    asset_pair = AssetPair.objects.create(primary_currency=tnb_currency, secondary_currency=yyy_currency)
+    keys = get_keys(asset_pair.id)
+    redis_client = get_redis_client()
+    redis_client.delete(*keys)
+    make_buy_order(bucky, tnb_currency, yyy_currency, price=7, quantity=12)
+
+    with patch('thenewboston.exchange.consumers.order_book.OrderBookConsumer.stream_order_book'):
+        load_price_levels(asset_pair.id)
+
+        # Only one process loads the book at a time
+        redis_client.set(keys[-2], 'token')
+        assert load_price_levels(asset_pair.id) is None
+
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_current_snapshot()::text')
+            snapshot = cursor.fetchone()[0]
+
+        # Changes of the transactions visible in the snapshot are already counted in the loaded book (transactions
+        # below the snapshot `xmin` are finished before it was taken)
+        visible_xact_id = str(int(snapshot.split(':')[0]) - 1)
+        assert apply_price_level_changes(asset_pair.id, [(BUY, 7, 5, 1)], visible_xact_id) is None
+        assert apply_price_level_changes(asset_pair.id, [(BUY, 6, 3, 1)]) is None
+        assert redis_client.llen(keys[-1]) == 2
+        assert replay_journal(asset_pair.id, keys, 'token', snapshot)
+
+    assert not redis_client.exists(keys[-2], keys[-1])
+    assert get_price_levels_snapshot(asset_pair.id, depth=10)['buy_levels'] == [
+        {'price': 7, 'quantity': 12, 'count': 1},
+        {'price': 6, 'quantity': 3, 'count': 1},
+    ]
+    redis_client.delete(*keys)
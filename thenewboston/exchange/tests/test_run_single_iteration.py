@@ -90,6 +90,7 @@ def test_run_single_iteration__matching_by_price_exactly(
         'modified_date': ANY_DATETIME,
         'buy_order': buy_order.id,
         'sell_order': sell_order.id,
+        'asset_pair': buy_order.asset_pair_id,
         'filled_quantity': 3,
         'price': 100,
         'overpayment_amount': 6,  # 3 * (102 - 100)
@@ -231,19 +232,27 @@ def test_run_single_iteration__buy_order_exhaust_sell_and_another_pair_starts(
     assert {trade.modified_date for trade in trades} == {trades[0].modified_date}
 
     expected_trades = [
-        (buy_order.id, sell_order_3.id, 3, 99, (102 - 99) * 3),
-        (buy_order.id, sell_order_2.id, 2, 100, (102 - 100) * 2),
-        (buy_order.id, sell_order_1.id, 3, 101, (102 - 101) * 3),
-        (buy_order_other_currency.id, sell_order_other_currency.id, 1, 199, (200 - 199) * 1),
+        (buy_order.id, sell_order_3.id, buy_order.asset_pair_id, 3, 99, (102 - 99) * 3),
+        (buy_order.id, sell_order_2.id, buy_order.asset_pair_id, 2, 100, (102 - 100) * 2),
+        (buy_order.id, sell_order_1.id, buy_order.asset_pair_id, 3, 101, (102 - 101) * 3),
+        (
+            buy_order_other_currency.id,
+            sell_order_other_currency.id,
+            buy_order_other_currency.asset_pair_id,
+            1,
+            199,
+            (200 - 199) * 1,
+        ),
     ]
 
-    for trade, (buy_id, sell_id, qty, price, overpayment_amount) in zip(trades, expected_trades):
+    for trade, (buy_id, sell_id, asset_pair_id, qty, price, overpayment_amount) in zip(trades, expected_trades):
         assert model_to_dict_with_id(trade) == {
             'id': trade.id,
             'created_date': ANY_DATETIME,
             'modified_date': ANY_DATETIME,
             'buy_order': buy_id,
             'sell_order': sell_id,
+            'asset_pair': asset_pair_id,
             'filled_quantity': qty,
             'price': price,
             'overpayment_amount': overpayment_amount,
@@ -366,6 +375,7 @@ def test_multiple_calls(bucky, dmitry, tnb_currency, yyy_currency):
             'modified_date': ANY_DATETIME,
             'buy_order': buy_order_2.id,
             'sell_order': sell_order_3.id,
+            'asset_pair': buy_order_2.asset_pair_id,
             'filled_quantity': 3,
             'price': 8,
             'overpayment_amount': 9,
@@ -443,6 +453,7 @@ def test_multiple_calls(bucky, dmitry, tnb_currency, yyy_currency):
             'modified_date': ANY_DATETIME,
             'buy_order': buy_order_1.id,
             'sell_order': sell_order_3.id,
+            'asset_pair': buy_order_1.asset_pair_id,
             'filled_quantity': 7,
             'price': 8,
             'overpayment_amount': 14,
@@ -520,6 +531,7 @@ def test_multiple_calls(bucky, dmitry, tnb_currency, yyy_currency):
             'modified_date': ANY_DATETIME,
             'buy_order': buy_order_1.id,
             'sell_order': sell_order_2.id,
+            'asset_pair': buy_order_1.asset_pair_id,
             'filled_quantity': 5,
             'price': 9,
             'overpayment_amount': 5,
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.test import override_settings
+
+from thenewboston.exchange.models import OrderProcessingLock
+from thenewboston.exchange.order_processing.engine import get_potentially_matching_orders, order_processing_lock
+from thenewboston.exchange.order_processing.sharding import Shard, get_channel_name
+from thenewboston.general.exceptions import ThenewbostonRuntimeError
+
+from .factories.exchange_order import make_buy_order, make_sell_order
+
+
+def test_shard():
+    assert not Shard().is_sharded
+    assert Shard().owns(5)
+    assert Shard(index=1, count=2).owns(5)
+    assert not Shard(index=0, count=2).owns(5)
+
+    with pytest.raises(ValueError):
+        Shard(index=2, count=2)
+
+    with pytest.raises(ValueError):
+        Shard(count=0)
+
+
+@override_settings(ORDER_PROCESSING_CHANNEL_NAME='order_processing')
+def test_get_channel_name():
+    assert Shard().channel_name == get_channel_name() == 'order_processing'
+    assert Shard(index=1, count=3).channel_name == get_channel_name(1, 3) == 'order_processing_1'
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('bucky_yyy_wallet', 'bucky_zzz_wallet', 'dmitry_tnb_wallet')
+def test_get_potentially_matching_orders__sharded(bucky, dmitry, tnb_currency, yyy_currency, zzz_currency):
+    trade_at = datetime.now(timezone.utc) + timedelta(hours=1)
+    yyy_buy_order = make_buy_order(bucky, tnb_currency, yyy_currency, price=100)
+    yyy_sell_order = make_sell_order(dmitry, tnb_currency, yyy_currency, price=100)
+    zzz_buy_order = make_buy_order(bucky, tnb_currency, zzz_currency, price=100)
+    zzz_sell_order = make_sell_order(dmitry, tnb_currency, zzz_currency, price=100)
+    assert yyy_buy_order.asset_pair_id != zzz_buy_order.asset_pair_id
+
+    shards = [Shard(index=index, count=2) for index in range(2)]
+    yyy_shard, zzz_shard = (
+        next(shard for shard in shards if shard.owns(asset_pair_id))
+        for asset_pair_id in (yyy_buy_order.asset_pair_id, zzz_buy_order.asset_pair_id)
+    )
+    assert yyy_shard != zzz_shard
+
+    assert get_potentially_matching_orders(trade_at, yyy_shard) == [yyy_sell_order, yyy_buy_order]
+    assert get_potentially_matching_orders(trade_at, zzz_shard) == [zzz_sell_order, zzz_buy_order]
+
+
+@pytest.mark.django_db
+def test_order_processing_lock__sharded():
+    with order_processing_lock(shard=Shard(index=0, count=2)):
+        with order_processing_lock(shard=Shard(index=1, count=2)):
+            assert set(OrderProcessingLock.objects.values_list('shard', flat=True)) == {0, 1}
+            assert all(OrderProcessingLock.objects.values_list('acquired_at', flat=True))
+
+
+@pytest.mark.django_db
+def test_order_processing_lock__shard_count_mismatch():
+    with order_processing_lock():  # non-sharded engine processes all asset pairs
+        with pytest.raises(ThenewbostonRuntimeError, match='Shard count 2 differs from the one of running engines'):
+            with order_processing_lock(shard=Shard(index=1, count=2)):
+                pass
+
+        assert list(OrderProcessingLock.objects.values_list('shard', 'shard_count')) == [(0, 1)]
+
+    # Locks of stopped engines do not matter
+    with order_processing_lock(shard=Shard(index=1, count=2)):
+        assert set(OrderProcessingLock.objects.values_list('shard', 'shard_count')) == {(0, 1), (1, 2)}
+        with pytest.raises(ThenewbostonRuntimeError, match='Shard count 1 differs'):
+            with order_processing_lock():
+                pass
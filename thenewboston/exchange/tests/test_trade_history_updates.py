@@ -0,0 +1,77 @@
+from unittest.mock import patch
+
+import pytest
+
+from thenewboston.exchange.business_logic.trade_history_updates import (
+    DIRTY_ASSET_PAIRS_KEY,
+    FLUSH_SCHEDULED_KEY,
+    PENDING_REQUESTS_KEY,
+    flush_trade_history_updates,
+    get_trade_history_update_stats,
+    request_trade_history_update,
+)
+from thenewboston.exchange.models import TradeHistoryItem
+from thenewboston.general.clients.redis import get_redis_client
+
+from .test_update_trade_history import make_trade
+
+
+@pytest.mark.usefixtures('tnb_mint', 'yyy_mint', 'zzz_mint')
+def test_trade_history_updates_are_coalesced(tnb_currency, yyy_currency, zzz_currency):
+    get_redis_client().delete(DIRTY_ASSET_PAIRS_KEY, FLUSH_SCHEDULED_KEY, PENDING_REQUESTS_KEY)
+
+    with patch('thenewboston.exchange.tasks.flush_trade_history_updates_task.apply_async') as apply_async_mock:
+        make_trade(tnb_currency.id, yyy_currency.id, 7, 2)
+        make_trade(tnb_currency.id, yyy_currency.id, 8, 2)
+        make_trade(tnb_currency.id, zzz_currency.id, 11, 4)
+        assert not request_trade_history_update(())
+
+    apply_async_mock.assert_called_once_with(countdown=2)
+    assert not TradeHistoryItem.objects.exists()
+
+    stats_before = get_trade_history_update_stats()
+    assert flush_trade_history_updates() == (2, 1)
+    assert TradeHistoryItem.objects.count() == 2
+    assert TradeHistoryItem.objects.get(asset_pair__secondary_currency=yyy_currency).price == 8
+    stats = get_trade_history_update_stats()
+    assert stats['flushes'] - stats_before['flushes'] == 1
+    assert stats['recalculated'] - stats_before['recalculated'] == 2
+    assert stats['coalesced'] - stats_before['coalesced'] == 1
+
+    # Nothing is left to flush, the next request schedules a new flush
+    assert flush_trade_history_updates() == (0, 0)
+    with patch('thenewboston.exchange.tasks.flush_trade_history_updates_task.apply_async') as apply_async_mock:
+        assert request_trade_history_update((TradeHistoryItem.objects.first().asset_pair_id,))
+
+    apply_async_mock.assert_called_once_with(countdown=2)
+    get_redis_client().delete(DIRTY_ASSET_PAIRS_KEY, FLUSH_SCHEDULED_KEY, PENDING_REQUESTS_KEY)
+
+
+@pytest.mark.usefixtures('tnb_mint', 'yyy_mint')
+def test_failed_trade_history_flush_is_rescheduled(tnb_currency, yyy_currency):
+    get_redis_client().delete(DIRTY_ASSET_PAIRS_KEY, FLUSH_SCHEDULED_KEY, PENDING_REQUESTS_KEY)
+
+    with patch('thenewboston.exchange.tasks.flush_trade_history_updates_task.apply_async') as apply_async_mock:
+        make_trade(tnb_currency.id, yyy_currency.id, 7, 2)
+
+    apply_async_mock.assert_called_once_with(countdown=2)
+    asset_pair_ids = {int(asset_pair_id) for asset_pair_id in get_redis_client().smembers(DIRTY_ASSET_PAIRS_KEY)}
+    assert len(asset_pair_ids) == 1
+
+    with (
+        patch.object(TradeHistoryItem.objects, 'update_for_asset_pairs', side_effect=RuntimeError('Failure')),
+        patch('thenewboston.exchange.tasks.flush_trade_history_updates_task.apply_async') as apply_async_mock,
+        pytest.raises(RuntimeError, match='Failure'),
+    ):
+        flush_trade_history_updates()
+
+    apply_async_mock.assert_called_once_with(countdown=2)
+    assert {
+        int(asset_pair_id) for asset_pair_id in get_redis_client().smembers(DIRTY_ASSET_PAIRS_KEY)
+    } == asset_pair_ids
+    assert get_redis_client().exists(FLUSH_SCHEDULED_KEY)
+    assert not TradeHistoryItem.objects.exists()
+
+    assert flush_trade_history_updates() == (1, 0)
+    assert TradeHistoryItem.objects.get(asset_pair__secondary_currency=yyy_currency).price == 7
+    get_redis_client().delete(DIRTY_ASSET_PAIRS_KEY, FLUSH_SCHEDULED_KEY, PENDING_REQUESTS_KEY)
@@ -0,0 +1,54 @@
+from unittest.mock import patch
+
+import pytest
+from django.test import override_settings
+
+from thenewboston.exchange.models import Trade
+from thenewboston.exchange.order_processing.engine import run_single_iteration
+from thenewboston.wallets.models import Wallet
+
+from .base import has_advisory_locks
+from .factories.exchange_order import make_buy_order, make_sell_order
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('lock_order_processing')
+def test_run_single_iteration__batched_settlement(
+    bucky, bucky_yyy_wallet, dmitry, dmitry_tnb_wallet, tnb_currency, yyy_currency
+):
+    buy_order = make_buy_order(bucky, tnb_currency, yyy_currency, price=102, quantity=9)
+    sell_order_1 = make_sell_order(dmitry, tnb_currency, yyy_currency, price=101, quantity=3)
+    sell_order_2 = make_sell_order(dmitry, tnb_currency, yyy_currency, price=100, quantity=2)
+    sell_order_3 = make_sell_order(dmitry, tnb_currency, yyy_currency, price=99, quantity=3)
+
+    with (
+        override_settings(ORDER_PROCESSING_TRADE_BATCH_SIZE=10),
+        patch('thenewboston.exchange.consumers.trade.TradeConsumer.stream_trade') as stream_trade_mock,
+        patch('thenewboston.wallets.consumers.wallet.WalletConsumer.stream_wallet') as stream_wallet_mock,
+        patch(
+            'thenewboston.notifications.consumers.notification.NotificationConsumer.stream_notification'
+        ) as stream_notification_mock,
+    ):
+        assert not run_single_iteration()
+
+    assert not has_advisory_locks()
+    assert list(Trade.objects.order_by('price').values_list('sell_order_id', 'price', 'filled_quantity')) == [
+        (sell_order_3.id, 99, 3),
+        (sell_order_2.id, 100, 2),
+        (sell_order_1.id, 101, 3),
+    ]
+    assert stream_trade_mock.call_count == 3  # still one event per trade
+    assert stream_wallet_mock.call_count == 3  # one event per wallet (net deltas)
+    assert stream_notification_mock.call_count == 3  # filled sell orders
+
+    buy_order.refresh_from_db()
+    assert (buy_order.status, buy_order.filled_quantity) == (2, 8)  # PARTIALLY_FILLED
+    for sell_order in (sell_order_1, sell_order_2, sell_order_3):
+        sell_order.refresh_from_db()
+        assert sell_order.status == 3  # FILLED
+
+    assert Wallet.objects.get(owner=bucky, currency=tnb_currency).balance == 8
+    overpayment_amount = (102 - 99) * 3 + (102 - 100) * 2 + (102 - 101) * 3
+    bucky_yyy_wallet.refresh_from_db()
+    assert bucky_yyy_wallet.balance == 1000 - 102 * 9 + overpayment_amount
+    assert Wallet.objects.get(owner=dmitry, currency=yyy_currency).balance == 99 * 3 + 100 * 2 + 101 * 3
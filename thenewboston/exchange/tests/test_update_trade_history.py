@@ -35,6 +35,7 @@ def make_trade(primary_currency_id, secondary_currency_id, price, filled_quantit
     )
     baker.make(
         'exchange.Trade',
+        asset_pair=asset_pair,  # explicitly, because `Trade.save()` may be bypassed, the way `bulk_create()` does
         price=price,
         filled_quantity=filled_quantity,
         buy_order=buy_order,
@@ -608,3 +609,41 @@ def test_update_trade_history(api_client, tnb_currency, yyy_currency, zzz_curren
             ],
         },
     )
+
+
+@pytest.mark.usefixtures('tnb_mint', 'yyy_mint', 'zzz_mint')
+def test_update_trade_history_query_count(django_assert_num_queries, tnb_currency, yyy_currency, zzz_currency):
+    make_trade(tnb_currency.id, yyy_currency.id, 7, 2)
+    TradeHistoryItem.objects.all().delete()
+    with django_assert_num_queries(4):  # savepoint, rollup, upsert, release savepoint
+        update_trade_history()
+
+    make_trade(tnb_currency.id, zzz_currency.id, 11, 4)
+    make_trade(zzz_currency.id, yyy_currency.id, 3, 1)
+    TradeHistoryItem.objects.all().delete()
+    with django_assert_num_queries(4):
+        update_trade_history()
+
+    assert TradeHistoryItem.objects.count() == 3
+
+
+@pytest.mark.usefixtures('tnb_mint', 'yyy_mint', 'zzz_mint')
+def test_update_trade_history_isolates_asset_pair_errors(tnb_currency, yyy_currency, zzz_currency):
+    make_trade(tnb_currency.id, yyy_currency.id, 7, 2)
+    make_trade(tnb_currency.id, zzz_currency.id, 11, 4)
+    TradeHistoryItem.objects.all().delete()
+    bad_asset_pair = AssetPair.objects.get(primary_currency=tnb_currency, secondary_currency=yyy_currency)
+
+    manager_class = type(TradeHistoryItem.objects)
+    original_update_for_asset_pairs = manager_class.update_for_asset_pairs
+
+    def update_for_asset_pairs(self, asset_pair_ids=None):
+        if asset_pair_ids is None or bad_asset_pair.id in asset_pair_ids:
+            raise ValueError('Bad asset pair')
+
+        return original_update_for_asset_pairs(self, asset_pair_ids)
+
+    with patch.object(manager_class, 'update_for_asset_pairs', update_for_asset_pairs):
+        update_trade_history()
+
+    assert list(TradeHistoryItem.objects.values_list('asset_pair__secondary_currency', flat=True)) == [zzz_currency.id]
@@ -3,6 +3,8 @@ from rest_framework.routers import SimpleRouter
 
 from .views.asset_pair import AssetPairViewSet
 from .views.exchange_order import ExchangeOrderViewSet
+from .views.order_book import OrderBookView
+from .views.order_processing_metrics import OrderProcessingMetricsView
 from .views.trade import TradeViewSet
 from .views.trade_history_item import TradeHistoryItemViewSet
 from .views.trade_price_chart_data import TradePriceChartDataView
@@ -15,4 +17,6 @@ router.register('trade-history-items', TradeHistoryItemViewSet)
 
 urlpatterns = router.urls + [
     path('trade-price-chart-data', TradePriceChartDataView.as_view(), name='trade-price-chart-data'),
+    path('order-book', OrderBookView.as_view(), name='order-book'),
+    path('order-processing-metrics', OrderProcessingMetricsView.as_view(), name='order-processing-metrics'),
 ]
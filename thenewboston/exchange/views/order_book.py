@@ -0,0 +1,32 @@
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ..asset_pair_registry import asset_pair_registry
+from ..price_levels import get_price_levels_snapshot, get_sequence
+from ..serializers.order_book import OrderBookQuerySerializer, OrderBookSerializer
+
+
+class OrderBookView(APIView):
+    """
+    Aggregated order book (price levels) snapshot. Clients apply `OrderBookConsumer` diffs with greater sequence
+    numbers on top of it. If `sequence` is provided and the book has not changed since then, 304 is returned.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    @staticmethod
+    def get(request):
+        query_serializer = OrderBookQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        asset_pair_id = query_serializer.validated_data['asset_pair']
+        if asset_pair_registry.get_currency_ids(asset_pair_id) is None:
+            return Response({'error': 'Asset pair not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        sequence = query_serializer.validated_data.get('sequence')
+        if sequence is not None and sequence == get_sequence(asset_pair_id):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+
+        snapshot = get_price_levels_snapshot(asset_pair_id, query_serializer.validated_data['depth'])
+        return Response(OrderBookSerializer(snapshot).data)
@@ -0,0 +1,15 @@
+from django.http import HttpResponse
+from rest_framework.permissions import IsAdminUser
+from rest_framework.views import APIView
+
+from ..order_processing.metrics import get_snapshots, render_prometheus
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class OrderProcessingMetricsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    @staticmethod
+    def get(request):
+        return HttpResponse(render_prometheus(get_snapshots()), content_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,5 +1,6 @@
 from django.contrib import admin
 
-from .models import FrontendDeployment
+from .models import FrontendDeployment, OutboxEvent
 
 admin.site.register(FrontendDeployment)
+admin.site.register(OutboxEvent)
@@ -1,4 +1,4 @@
-from django.db import connection
+from django.db import DEFAULT_DB_ALIAS, connection, connections
 from django.db.models import BooleanField, Func, NullBooleanField
 from django.db.models.expressions import RawSQL
 
@@ -34,3 +34,37 @@ def make_advisory_lock_expression(lock_id: int, row_id='id') -> str:
 
 def make_advisory_lock_expression_raw_sql(lock_id: int, row_id='id') -> RawSQL:
     return RawSQL(make_advisory_lock_expression(lock_id, row_id=row_id), ())
+
+
+def _call_advisory_lock_function(function: str, ids, lock_id: int, using: str) -> list[tuple[int, bool | None]]:
+    if not (ids := sorted(set(ids))):  # sorted to acquire locks in the same order everywhere (avoid deadlocks)
+        return []
+
+    expression = make_advisory_lock_expression(lock_id, row_id='advisory_lock_ids.id')
+    with connections[using].cursor() as cursor:
+        # One statement (one round trip) for any number of ids
+        cursor.execute(
+            f'SELECT advisory_lock_ids.id, {function}({expression}) '
+            'FROM unnest(%s::bigint[]) WITH ORDINALITY AS advisory_lock_ids(id, ordinality) '
+            'ORDER BY advisory_lock_ids.ordinality',
+            [ids],
+        )
+        return cursor.fetchall()
+
+
+def advisory_lock_many(ids, lock_id: int, just_try: bool = False, using: str = DEFAULT_DB_ALIAS) -> dict[int, bool]:
+    """
+    Lock `ids` with session level advisory locks, return `{id: is_locked}` (always `True` unless `just_try=True`).
+    """
+    if just_try:
+        return dict(_call_advisory_lock_function('pg_try_advisory_lock', ids, lock_id, using))
+
+    # `pg_advisory_lock()` returns void, it just waits until the lock is acquired
+    return {id_: True for id_, _ in _call_advisory_lock_function('pg_advisory_lock', ids, lock_id, using)}
+
+
+def advisory_unlock_many(ids, lock_id: int, using: str = DEFAULT_DB_ALIAS) -> dict[int, bool]:
+    """
+    Unlock session level advisory locks for `ids`, return `{id: was_locked}`.
+    """
+    return dict(_call_advisory_lock_function('pg_advisory_unlock', ids, lock_id, using))
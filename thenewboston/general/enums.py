@@ -10,6 +10,7 @@ class MessageType(Enum):
     UPDATE_CONNECT_FIVE_MATCH = 'update.connect_five_match'
     UPDATE_EXCHANGE_ORDER = 'update.exchange_order'
     UPDATE_FRONTEND_DEPLOYMENT = 'update.frontend_deployment'
+    UPDATE_ORDER_BOOK = 'update.order_book'
     UPDATE_WALLET = 'update.wallet'
 
 
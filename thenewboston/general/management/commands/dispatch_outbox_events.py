@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from thenewboston.general.outbox import run_dispatcher
+
+
+class Command(BaseCommand):
+    help = 'Send realtime events from the transactional outbox to the channel layer'  # noqa: A003
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Number of events sent per transaction (default: OUTBOX_DISPATCH_BATCH_SIZE setting)',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=None,
+            help='Seconds to wait for new events (default: OUTBOX_DISPATCH_POLL_INTERVAL_SECONDS setting)',
+        )
+
+    def handle(self, *args, batch_size, poll_interval, **options):
+        run_dispatcher(batch_size=batch_size, poll_interval=poll_interval)
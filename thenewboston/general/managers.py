@@ -10,6 +10,8 @@ from thenewboston.general.advisory_locks import (
     PgAdvisoryUnlock,
     PgAdvisoryXactLock,
     PgTryAdvisoryLock,
+    advisory_lock_many,
+    advisory_unlock_many,
     make_advisory_lock_expression_raw_sql,
 )
 
@@ -57,7 +59,10 @@ class CustomQuerySet(QuerySet):
 
 
 class CustomManager(Manager.from_queryset(CustomQuerySet)):  # type: ignore
-    def advisory_unlock_by_pks(self, pks, lock_id: int):
+    def advisory_lock_by_pks(self, pks, lock_id: int, just_try: bool = False) -> dict[int, bool]:
+        logger.debug('Locking advisory lock %s for pks: %s', lock_id, pks)
+        return advisory_lock_many(pks, lock_id, just_try=just_try, using=self.db)
+
+    def advisory_unlock_by_pks(self, pks, lock_id: int) -> dict[int, bool]:
         logger.debug('Unlocking advisory lock %s for pks: %s', lock_id, pks)
-        for _ in self.filter(pk__in=pks).with_advisory_unlock(lock_id):
-            pass
+        return advisory_unlock_many(pks, lock_id, using=self.db)
@@ -1,3 +1,4 @@
 from .created_modified import CreatedModified  # noqa: F401
 from .frontend_deployment import FrontendDeployment  # noqa: F401
+from .outbox_event import OutboxEvent  # noqa: F401
 from .social_media import SocialMediaMixin  # noqa: F401
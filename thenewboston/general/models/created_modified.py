@@ -36,18 +36,17 @@ class AdjustableTimestampsModel(TrackerMixin, CustomModel):
         # While those were not accessible due technical reasons like database transaction isolation, API processing
         # time, etc while a later creation timestamp and therefore are not eligible for the running trade.
 
-        from thenewboston.exchange.models import OrderProcessingLock
+        from thenewboston.exchange.models.order_processing_lock import get_published_trade_at
 
         assert transaction.get_connection().in_atomic_block
-        # We do not update lock here, but select for update to make sure we are not in the middle of the update
-        if not (lock := OrderProcessingLock.objects.select_for_update().get_or_none()):
+        # We do not lock the `OrderProcessingLock` rows, so concurrent writers do not block each other. Instead, the
+        # engine waits for all transactions that have read `trade_at` to finish before it trades at a new one.
+        # In sharded setup there is a lock row per shard, so we take the latest `trade_at` of all shards
+        if (trade_at := get_published_trade_at()) is None:
             # there is nowhere we can get trade_at from (this may happen in tests or before the very first ran of
             # matching engine)
             return
 
-        if not (trade_at := lock.trade_at):  # in case trade has not started
-            return
-
         adjusted_moment = trade_at + MIN_TIME_INCREMENT
         # In most cases we will not make changes to timestamps, because orders probably come after trade has started
         if was_adding and self.created_date < adjusted_moment:
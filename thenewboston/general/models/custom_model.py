@@ -33,7 +33,7 @@ class CustomModel(models.Model):
         return self._state.adding
 
     def advisory_unlock(self, lock_id: int) -> bool:
-        return self.__class__.objects.with_advisory_unlock(lock_id).get(pk=self.pk)
+        return self.__class__.objects.advisory_unlock_by_pks((self.pk,), lock_id).get(self.pk, False)
 
     @classmethod
     def get_field_names(cls):
@@ -0,0 +1,21 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class OutboxEvent(models.Model):
+    """
+    Channel layer event written within the transaction that caused it and sent by the outbox dispatcher
+    (see `dispatch_outbox_events` management command) after commit.
+    """
+
+    group_name = models.CharField(max_length=100)  # channel layer limit
+    event = models.JSONField(encoder=DjangoJSONEncoder)
+    # Events with the same key supersede each other, so only the latest one is sent within a dispatched batch
+    dedupe_key = models.CharField(max_length=100, null=True, blank=True)
+    created_date = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ('id',)
+
+    def __str__(self):
+        return f'Outbox event ID: {self.pk} | Group: {self.group_name}'
@@ -0,0 +1,119 @@
+"""
+Transactional outbox for channel layer (websocket) events.
+
+Events are written to `OutboxEvent` table within the transaction that caused them, so they are sent if and only if
+the transaction is committed and request / order processing engine threads do not wait for the channel layer.
+The events are sent by the dispatcher process (see `dispatch_outbox_events` management command) in batches,
+preserving the order of events within a group.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from .models import OutboxEvent
+from .utils.stream_buffer import send_group_events
+
+DISPATCHER_LOCK_NAME = 'outbox_dispatcher'  # only one dispatcher sends events at a time to keep them ordered
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+def make_outbox_events(events, dedupe_key=None) -> list[OutboxEvent]:
+    if dedupe_key is not None and not isinstance(dedupe_key, str):
+        dedupe_key = ':'.join(map(str, dedupe_key))
+
+    return [OutboxEvent(group_name=group_name, event=event, dedupe_key=dedupe_key) for group_name, event in events]
+
+
+def add_outbox_events(events, dedupe_key=None, using=DEFAULT_DB_ALIAS):
+    outbox_events = make_outbox_events(events, dedupe_key=dedupe_key)
+    if (batches := getattr(_local, 'batches', None)) and batches[-1][0] == using:
+        batches[-1][1].extend(outbox_events)
+    elif outbox_events:
+        OutboxEvent.objects.using(using).bulk_create(outbox_events)
+
+
+@contextmanager
+def batch_outbox_events(using=DEFAULT_DB_ALIAS):
+    """
+    Write outbox events added within the block with a single `INSERT` on exit (useful for bulk operations).
+    """
+    batches = getattr(_local, 'batches', None)
+    if batches is None:
+        batches = _local.batches = []
+
+    outbox_events: list[OutboxEvent] = []
+    batches.append((using, outbox_events))
+    try:
+        yield outbox_events
+    finally:
+        batches.pop()
+
+    if outbox_events:
+        OutboxEvent.objects.using(using).bulk_create(outbox_events)
+
+
+def get_dispatched_events(rows) -> list[tuple[str, dict]]:
+    # The same object may be streamed to several groups, so events are superseded within a group only
+    latest_ids = {(dedupe_key, group_name): id_ for id_, group_name, _, dedupe_key in rows if dedupe_key is not None}
+    return [
+        (group_name, event)
+        for id_, group_name, event, dedupe_key in rows
+        if dedupe_key is None or latest_ids[(dedupe_key, group_name)] == id_
+    ]
+
+
+def dispatch_outbox_events(batch_size=None, using=DEFAULT_DB_ALIAS) -> int:
+    """
+    Send the oldest outbox events (one batch) to the channel layer and delete them. Return the number of
+    dispatched rows (including superseded events that were skipped).
+    """
+    if batch_size is None:
+        batch_size = settings.OUTBOX_DISPATCH_BATCH_SIZE
+
+    with transaction.atomic(using=using):
+        rows = list(
+            OutboxEvent.objects.using(using)
+            .select_for_update(skip_locked=True)
+            .order_by('id')
+            .values_list('id', 'group_name', 'event', 'dedupe_key')[:batch_size]
+        )
+        if not rows:
+            return 0
+
+        events = get_dispatched_events(rows)
+        # If sending fails the transaction is rolled back and the events are sent again (at least once delivery)
+        send_group_events(events)
+        OutboxEvent.objects.using(using).filter(id__in=[row[0] for row in rows]).delete()
+
+    logger.debug('Dispatched %s outbox event(s) (%s superseded)', len(events), len(rows) - len(events))
+    return len(rows)
+
+
+def run_dispatcher(batch_size=None, poll_interval=None, using=DEFAULT_DB_ALIAS):
+    if batch_size is None:
+        batch_size = settings.OUTBOX_DISPATCH_BATCH_SIZE
+    if poll_interval is None:
+        poll_interval = settings.OUTBOX_DISPATCH_POLL_INTERVAL_SECONDS
+
+    with connections[using].cursor() as cursor:
+        logger.info('Waiting for the outbox dispatcher lock')
+        cursor.execute('SELECT pg_advisory_lock(hashtext(%s))', [DISPATCHER_LOCK_NAME])
+
+    logger.info('Outbox dispatcher started')
+    while True:
+        try:
+            dispatched_count = dispatch_outbox_events(batch_size=batch_size, using=using)
+        except Exception:
+            logger.exception('Error while dispatching outbox events')
+            dispatched_count = 0
+
+        if dispatched_count < batch_size:
+            time.sleep(poll_interval)
@@ -2,6 +2,7 @@ import pytest
 from django.conf import settings
 from django.test import override_settings
 
+from thenewboston.currencies.currency_cache import currency_cache
 from thenewboston.general.advisory_locks import clear_all_advisory_locks
 
 
@@ -23,3 +24,4 @@ def unittest_settings():
 @pytest.fixture(autouse=True)
 def pre_cleanup(db, unittest_settings):
     clear_all_advisory_locks()
+    currency_cache.invalidate()  # currencies of the previous test have been rolled back
@@ -0,0 +1,93 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from django.db import transaction
+from django.test import override_settings
+
+from thenewboston.general.models import OutboxEvent
+from thenewboston.general.outbox import batch_outbox_events, dispatch_outbox_events
+
+
+def make_channel_layer():
+    channel_layer = MagicMock()
+    channel_layer.group_send = AsyncMock()
+    return channel_layer
+
+
+@override_settings(USE_ON_COMMIT_HOOK=True, USE_STREAMING_OUTBOX=True)
+def test_outbox_events_are_dispatched(bucky_tnb_wallet, bucky_yyy_wallet):
+    channel_layer = make_channel_layer()
+    with patch('thenewboston.general.utils.stream_buffer.get_channel_layer', return_value=channel_layer):
+        bucky_tnb_wallet.change_balance(1)
+        bucky_yyy_wallet.change_balance(1)
+        bucky_tnb_wallet.change_balance(1)
+
+        # Events are written to the outbox within the transaction instead of being sent
+        channel_layer.group_send.assert_not_called()
+        assert list(OutboxEvent.objects.values_list('dedupe_key', flat=True)) == [
+            f'wallet:{bucky_tnb_wallet.id}',
+            f'wallet:{bucky_yyy_wallet.id}',
+            f'wallet:{bucky_tnb_wallet.id}',
+        ]
+
+        assert dispatch_outbox_events(batch_size=2) == 2
+        assert dispatch_outbox_events(batch_size=2) == 1
+        assert dispatch_outbox_events(batch_size=2) == 0
+
+    assert not OutboxEvent.objects.exists()
+    group_name = f'user_{bucky_tnb_wallet.owner_id}_wallet'
+    # The superseded event is skipped within a batch only, so the event split into the next batch is sent too
+    assert [
+        (args[0], args[1]['payload']['id'], args[1]['payload']['balance'])
+        for args, _ in channel_layer.group_send.call_args_list
+    ] == [
+        (group_name, bucky_tnb_wallet.id, bucky_tnb_wallet.balance - 1),
+        (group_name, bucky_yyy_wallet.id, bucky_yyy_wallet.balance),
+        (group_name, bucky_tnb_wallet.id, bucky_tnb_wallet.balance),
+    ]
+
+
+@override_settings(USE_ON_COMMIT_HOOK=True, USE_STREAMING_OUTBOX=True)
+def test_superseded_outbox_events_are_skipped_within_batch(bucky_tnb_wallet, bucky_yyy_wallet):
+    channel_layer = make_channel_layer()
+    with patch('thenewboston.general.utils.stream_buffer.get_channel_layer', return_value=channel_layer):
+        bucky_tnb_wallet.change_balance(1)
+        bucky_yyy_wallet.change_balance(1)
+        bucky_tnb_wallet.change_balance(1)
+
+        assert dispatch_outbox_events(batch_size=3) == 3
+        assert dispatch_outbox_events(batch_size=3) == 0
+
+    group_name = f'user_{bucky_tnb_wallet.owner_id}_wallet'
+    assert [
+        (args[0], args[1]['payload']['id'], args[1]['payload']['balance'])
+        for args, _ in channel_layer.group_send.call_args_list
+    ] == [
+        (group_name, bucky_yyy_wallet.id, bucky_yyy_wallet.balance),
+        (group_name, bucky_tnb_wallet.id, bucky_tnb_wallet.balance),
+    ]
+
+
+@override_settings(USE_ON_COMMIT_HOOK=True, USE_STREAMING_OUTBOX=True)
+def test_outbox_events_are_rolled_back_or_batched(bucky_tnb_wallet, bucky_yyy_wallet):
+    with pytest.raises(ValueError), transaction.atomic():
+        bucky_tnb_wallet.change_balance(1)
+        raise ValueError
+
+    with batch_outbox_events():
+        bucky_yyy_wallet.stream()
+        bucky_yyy_wallet.stream()
+        assert not OutboxEvent.objects.exists()  # written on exit
+
+    assert list(OutboxEvent.objects.values_list('dedupe_key', flat=True)) == [f'wallet:{bucky_yyy_wallet.id}'] * 2
+
+
+def test_outbox_dispatch_keeps_failed_events():
+    OutboxEvent.objects.create(group_name='test', event={'type': 'test.event'})
+    channel_layer = make_channel_layer()
+    channel_layer.group_send.side_effect = ConnectionError
+    with patch('thenewboston.general.utils.stream_buffer.get_channel_layer', return_value=channel_layer):
+        with pytest.raises(ConnectionError):
+            dispatch_outbox_events()
+
+    assert OutboxEvent.objects.count() == 1
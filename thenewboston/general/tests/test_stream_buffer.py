@@ -0,0 +1,80 @@
+from unittest.mock import AsyncMock, MagicMock, call, patch
+
+from django.db import transaction
+from django.test import override_settings
+
+from thenewboston.general.enums import MessageType
+from thenewboston.general.utils.stream_buffer import send_group_event, stream_on_commit
+
+
+def run_in_transaction(django_capture_on_commit_callbacks, callable_):
+    channel_layer = MagicMock()
+    channel_layer.group_send = AsyncMock()
+    with (
+        override_settings(USE_ON_COMMIT_HOOK=True),
+        patch('thenewboston.general.utils.stream_buffer.get_channel_layer', return_value=channel_layer),
+        django_capture_on_commit_callbacks(execute=True) as callbacks,
+    ):
+        with transaction.atomic():
+            callable_()
+
+    return channel_layer.group_send, callbacks
+
+
+def get_balances(group_send_mock):
+    return [(args[0], args[1]['payload']['balance']) for args, _ in group_send_mock.call_args_list]
+
+
+def test_stream_on_commit_coalesces_wallet_updates(
+    bucky_tnb_wallet, bucky_yyy_wallet, django_capture_on_commit_callbacks
+):
+    def change_balances():
+        bucky_tnb_wallet.change_balance(1)
+        bucky_yyy_wallet.change_balance(1)
+        bucky_tnb_wallet.change_balance(1)
+        bucky_tnb_wallet.change_balance(1)
+
+    group_send_mock, callbacks = run_in_transaction(django_capture_on_commit_callbacks, change_balances)
+
+    assert len(callbacks) == 1  # a single flush for the whole transaction
+    group_name = f'user_{bucky_tnb_wallet.owner_id}_wallet'
+    # The latest state is streamed once, and it goes after the other wallet, because it was updated last
+    assert get_balances(group_send_mock) == [
+        (group_name, bucky_yyy_wallet.balance),
+        (group_name, bucky_tnb_wallet.balance),
+    ]
+    assert group_send_mock.call_args.args[1]['type'] == MessageType.UPDATE_WALLET.value
+
+
+def test_stream_on_commit_discards_rolled_back_savepoint(
+    bucky_tnb_wallet, bucky_yyy_wallet, django_capture_on_commit_callbacks
+):
+    class RollbackError(Exception):
+        pass
+
+    def change_balances():
+        bucky_yyy_wallet.change_balance(1)
+        try:
+            with transaction.atomic():
+                bucky_tnb_wallet.change_balance(1)
+                raise RollbackError
+        except RollbackError:
+            pass
+
+        bucky_yyy_wallet.change_balance(1)
+
+    group_send_mock, _ = run_in_transaction(django_capture_on_commit_callbacks, change_balances)
+    assert get_balances(group_send_mock) == [(f'user_{bucky_yyy_wallet.owner_id}_wallet', bucky_yyy_wallet.balance)]
+
+
+def test_stream_on_commit_without_dedupe_key(django_capture_on_commit_callbacks):
+    def stream():
+        for number in range(3):
+            stream_on_commit(lambda number=number: send_group_event(f'group_{number % 2}', {'number': number}))
+
+    group_send_mock, _ = run_in_transaction(django_capture_on_commit_callbacks, stream)
+    assert sorted(group_send_mock.call_args_list, key=lambda call_: call_.args[1]['number']) == [
+        call('group_0', {'number': 0}),
+        call('group_1', {'number': 1}),
+        call('group_0', {'number': 2}),
+    ]
@@ -0,0 +1,149 @@
+"""
+Transaction-scoped buffering of channel layer (websocket) events.
+
+Instead of streaming every change with a separate `group_send()` on commit, models call `stream_on_commit()`.
+Streaming callables are collected per transaction (savepoint) and run on commit, so superseded updates of the same
+object (identified by `dedupe_key`) are streamed only once with the latest state. Events sent by the callables are
+collected and sent to the channel layer in one event loop hop, groups are processed concurrently (see
+`send_group_events()`).
+
+With `USE_STREAMING_OUTBOX` the events are written to the transactional outbox instead (see `general/outbox.py`).
+"""
+
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from itertools import count
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+class StreamBuffer:
+    def __init__(self, key):
+        self.key = key
+        self.callables: dict = {}
+        self.superseded_count = 0
+        self._counter = count()
+
+    def add(self, callable_, dedupe_key=None):
+        if dedupe_key is None:
+            dedupe_key = next(self._counter)
+        elif self.callables.pop(dedupe_key, None) is not None:
+            self.superseded_count += 1  # the latest update goes last
+
+        self.callables[dedupe_key] = callable_
+
+    def flush(self):
+        get_buffers().pop(self.key, None)
+        with collect_group_events() as events:
+            for callable_ in self.callables.values():
+                try:
+                    callable_()
+                except Exception:
+                    logger.exception('Error while streaming')
+
+        logger.debug('Streaming %s event(s), %s superseded update(s) skipped', len(events), self.superseded_count)
+        send_group_events(events)
+
+
+def get_buffers() -> dict:
+    if (buffers := getattr(_local, 'buffers', None)) is None:
+        buffers = _local.buffers = {}
+
+    return buffers
+
+
+def get_stream_buffer(using=DEFAULT_DB_ALIAS) -> StreamBuffer:
+    connection = connections[using]
+    # Buffer per savepoint, because the savepoint rollback discards its on commit callbacks
+    key = (using, tuple(connection.savepoint_ids))
+    buffers = get_buffers()
+    pending_ids = {id(getattr(func, '__self__', None)) for _, func, _ in connection.run_on_commit}
+    if (buffer := buffers.get(key)) is not None and id(buffer) in pending_ids:
+        return buffer
+
+    # There is no buffer or it is left over from a rolled back transaction (savepoint), so prune leftovers
+    for stale_key in [key_ for key_, buffer in buffers.items() if key_[0] == using and id(buffer) not in pending_ids]:
+        del buffers[stale_key]
+
+    buffer = buffers[key] = StreamBuffer(key)
+    transaction.on_commit(buffer.flush, using=using)
+    return buffer
+
+
+def stream_on_commit(callable_, dedupe_key=None, using=DEFAULT_DB_ALIAS):
+    """
+    Stream events sent by `callable_` (with `send_group_event()`) once the transaction is committed. Only the latest
+    events are streamed for the same `dedupe_key`. `callable_` must not have side effects other than streaming,
+    because with the outbox (`USE_STREAMING_OUTBOX`) it is run right away to write the events within the transaction.
+    """
+    if not settings.USE_ON_COMMIT_HOOK:
+        callable_()
+        return
+
+    if settings.USE_STREAMING_OUTBOX:
+        from ..outbox import add_outbox_events
+
+        with collect_group_events() as events:
+            try:
+                callable_()
+            except Exception:
+                logger.exception('Error while streaming')
+
+        add_outbox_events(events, dedupe_key=dedupe_key, using=using)
+        return
+
+    if not transaction.get_connection(using).in_atomic_block:
+        # Autocommit mode: nothing to buffer
+        with collect_group_events() as events:
+            callable_()
+
+        send_group_events(events)
+        return
+
+    get_stream_buffer(using).add(callable_, dedupe_key=dedupe_key)
+
+
+@contextmanager
+def collect_group_events():
+    previous_events = getattr(_local, 'events', None)
+    events = _local.events = []
+    try:
+        yield events
+    finally:
+        _local.events = previous_events
+
+
+def send_group_event(group_name, event):
+    if (events := getattr(_local, 'events', None)) is not None:
+        events.append((group_name, event))
+    else:
+        async_to_sync(get_channel_layer().group_send)(group_name, event)
+
+
+async def _send_group_events(channel_layer, events_by_group):
+    async def send(group_name, events):
+        for event in events:  # keep the order within the group
+            await channel_layer.group_send(group_name, event)
+
+    await asyncio.gather(*(send(group_name, events) for group_name, events in events_by_group.items()))
+
+
+def send_group_events(events):
+    if not events:
+        return
+
+    events_by_group = defaultdict(list)
+    for group_name, event in events:
+        events_by_group[group_name].append(event)
+
+    async_to_sync(_send_group_events)(get_channel_layer(), events_by_group)
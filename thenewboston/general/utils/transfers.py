@@ -1,8 +1,11 @@
 from django.db import transaction
 
+from thenewboston.wallets.models import WalletLedgerReason
 
-def transfer_coins(*, sender_wallet, recipient_wallet, amount):
+
+def transfer_coins(*, sender_wallet, recipient_wallet, amount, reason=WalletLedgerReason.TRANSFER, reference=None):
     assert transaction.get_connection().in_atomic_block
 
-    sender_wallet.change_balance(-amount)
-    recipient_wallet.change_balance(amount)
+    # Balances are changed atomically, so the wallets do not need to be selected for update
+    sender_wallet.change_balance(-amount, reason=reason, reference=reference)
+    recipient_wallet.change_balance(amount, reason=reason, reference=reference)
@@ -2,6 +2,8 @@ from asgiref.sync import async_to_sync
 from channels.generic.websocket import JsonWebsocketConsumer
 from channels.layers import get_channel_layer
 
+from thenewboston.general.utils.stream_buffer import send_group_event
+
 from ..models import Notification
 
 
@@ -41,7 +43,6 @@ class NotificationConsumer(JsonWebsocketConsumer):
         Send notification details to the group associated with the notification owner.
         message_type indicates the type of the action and notification_data contains the notification details.
         """
-        channel_layer = get_channel_layer()
         notification_owner_id = notification_data['owner']
         notification_event = {'payload': notification_data, 'type': message_type.value}
-        async_to_sync(channel_layer.group_send)(cls.get_group_name(notification_owner_id), notification_event)
+        send_group_event(cls.get_group_name(notification_owner_id), notification_event)
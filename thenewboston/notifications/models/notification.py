@@ -2,7 +2,7 @@ from django.db import models
 
 from thenewboston.general.enums import MessageType
 from thenewboston.general.models import CreatedModified
-from thenewboston.general.utils.database import apply_on_commit
+from thenewboston.general.utils.stream_buffer import stream_on_commit
 
 
 class Notification(CreatedModified):
@@ -17,7 +17,7 @@ class Notification(CreatedModified):
         from ..consumers import NotificationConsumer
         from ..serializers.notification import NotificationReadSerializer
 
-        apply_on_commit(
+        stream_on_commit(
             lambda notification=self: NotificationConsumer.stream_notification(
                 message_type=MessageType.CREATE_NOTIFICATION,
                 notification_data=NotificationReadSerializer(notification).data,
@@ -4,5 +4,13 @@ from celery import Celery
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'thenewboston.project.settings')
 
-app = Celery('thenewboston.project', include=['thenewboston.connect_five.tasks', 'thenewboston.exchange.tasks'])
+app = Celery(
+    'thenewboston.project',
+    include=[
+        'thenewboston.connect_five.tasks',
+        'thenewboston.currencies.tasks',
+        'thenewboston.exchange.tasks',
+        'thenewboston.wallets.tasks',
+    ],
+)
 app.config_from_object('django.conf:settings', namespace='CELERY')
@@ -1,7 +1,7 @@
 from django.urls import re_path
 
 from thenewboston.connect_five.consumers import ConnectFiveChatConsumer, ConnectFiveConsumer, ConnectFivePublicConsumer
-from thenewboston.exchange.consumers import ExchangeOrderConsumer, TradeConsumer
+from thenewboston.exchange.consumers import ExchangeOrderConsumer, OrderBookConsumer, TradeConsumer
 from thenewboston.general.consumers.frontend_deployment import FrontendDeploymentConsumer
 from thenewboston.notifications.consumers import NotificationConsumer
 from thenewboston.wallets.consumers import WalletConsumer
@@ -13,6 +13,7 @@ websocket_urlpatterns = [
     re_path(r'^ws/exchange-orders$', ExchangeOrderConsumer.as_asgi()),
     re_path(r'^ws/frontend-deployments$', FrontendDeploymentConsumer.as_asgi()),
     re_path(r'^ws/notifications/(?P<user_id>\d+)$', NotificationConsumer.as_asgi()),
+    re_path(r'^ws/order-book$', OrderBookConsumer.as_asgi()),
     re_path(r'^ws/trades$', TradeConsumer.as_asgi()),
     re_path(r'^ws/wallet/(?P<user_id>\d+)$', WalletConsumer.as_asgi()),
 ]
@@ -19,4 +19,18 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'tasks.update_trade_history',
         'schedule': 60 * 10,  # 10 minutes
     },
+    'refresh_deposit_balances': {
+        'task': 'tasks.refresh_deposit_balances',
+        'schedule': 60,
+        'options': {'expires': 60},  # skip runs that could not start in time instead of piling them up
+    },
+    'refresh_currency_holders': {
+        'task': 'tasks.refresh_currency_holders',
+        'schedule': 60,
+        'options': {'expires': 60},
+    },
+    'take_wallet_balance_snapshots': {
+        'task': 'tasks.take_wallet_balance_snapshots',
+        'schedule': 60 * 60,  # 1 hour
+    },
 }
@@ -21,6 +21,46 @@ ORDER_PROCESSING_REDIS_URL = 'redis://localhost:6379'
 ORDER_PROCESSING_CHANNEL_NAME = 'order_processing'
 ORDER_PROCESSING_CHANNEL_GET_MESSAGE_TIMEOUT_SECONDS = 10  # None is an option for infinite timeout
 ONE_TRADE_PER_ITERATION = False
+ORDER_PROCESSING_TRADE_BATCH_SIZE = 1  # trades persisted per transaction (1 means a transaction per trade)
+ORDER_PROCESSING_USE_ORDER_BOOK = False  # keep in-memory order books instead of scanning orders on every iteration
+ORDER_PROCESSING_SHARD_COUNT = 1  # number of engine processes, each one handles `asset_pair_id % count == index` pairs
+ORDER_PROCESSING_METRICS_EXPORT_INTERVAL_SECONDS = 5
+ORDER_PROCESSING_METRICS_TTL_SECONDS = 300  # metrics of stopped engines disappear after this time
+ORDER_PROCESSING_METRICS_FILE = None  # path to write metrics in Prometheus text format to
+
+PRICE_LEVELS_KEY_PREFIX = 'order_book'  # Redis keys of the aggregated order books
+PRICE_LEVELS_MAX_DEPTH = 500
+# Loading lock expiration and how long snapshot requests wait for a book loaded by another process
+PRICE_LEVELS_LOADING_TIMEOUT_SECONDS = 30
+
+# Trade history updates requested within the window are coalesced into one recalculation per asset pair
+TRADE_HISTORY_UPDATE_WINDOW_SECONDS = 2
+
+# Realtime events are written to the outbox table within the transaction and sent by `dispatch_outbox_events` process
+# (opt-in: requires the dispatcher to be running, see `scripts/run-outbox-dispatcher.sh`)
+USE_STREAMING_OUTBOX = False
+OUTBOX_DISPATCH_BATCH_SIZE = 500
+OUTBOX_DISPATCH_POLL_INTERVAL_SECONDS = 0.2  # used when there are no more events to dispatch
+
+# Wallet balances are snapshotted periodically (see `take_wallet_balance_snapshots` task), so a balance as of any time
+# is reconstructed from the ledger entries created since the latest snapshot
+WALLET_BALANCE_SNAPSHOT_LAG_SECONDS = 5 * 60  # must be longer than any transaction that changes balances
+
+# HTTP client for external currency networks (see `thenewboston.api.client`)
+EXTERNAL_NETWORK_SCHEME = 'https'
+EXTERNAL_NETWORK_CONNECT_TIMEOUT_SECONDS = 3.05
+EXTERNAL_NETWORK_READ_TIMEOUT_SECONDS = 10
+EXTERNAL_NETWORK_RETRIES = 3
+EXTERNAL_NETWORK_RETRY_BACKOFF_FACTOR = 0.5  # seconds, doubled on every retry
+EXTERNAL_NETWORK_POOL_SIZE = 10  # connections per domain (also limits concurrency of batched requests)
+DEPOSIT_BALANCE_REFRESH_BATCH_SIZE = 200  # wallets fetched from the networks and updated at once
+
+# Currencies are cached in every process, changes made by other processes are picked up after this time
+CURRENCY_CACHE_TTL_SECONDS = 60
+
+# Holders of the currencies with wallet ledger entries created since the last refresh (minus this lag, because entries
+# are committed later than created) are refreshed by `refresh_currency_holders` task
+CURRENCY_HOLDERS_REFRESH_LAG_SECONDS = 5 * 60  # must be longer than any transaction that changes balances
 
 # Misc
 DEFAULT_CURRENCY_TICKER = 'TNB'
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.1 on 2026-10-18 16:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('social', '0006_comment_mentioned_users_post_mentioned_users'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(
+                condition=models.Q(('price_amount__isnull', False)),
+                fields=['price_currency', 'owner', 'created_date'],
+                name='comment_transfer_owner_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(
+                condition=models.Q(('price_amount__isnull', False)),
+                fields=['post', 'price_currency', 'created_date'],
+                name='comment_transfer_post_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(
+                condition=models.Q(('price_amount__isnull', False)),
+                fields=['price_currency', 'owner', 'created_date'],
+                name='post_transfer_owner_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(
+                condition=models.Q(('price_amount__isnull', False)),
+                fields=['price_currency', 'recipient', 'created_date'],
+                name='post_transfer_recipient_idx',
+            ),
+        ),
+    ]
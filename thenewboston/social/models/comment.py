@@ -11,5 +11,21 @@ class Comment(CreatedModified):
     price_currency = models.ForeignKey('currencies.Currency', blank=True, null=True, on_delete=models.SET_NULL)
     mentioned_users = models.ManyToManyField('users.User', related_name='mentioned_in_comments', blank=True)
 
+    class Meta:
+        # Transfers (comments with a price) sent by a user and received by the post owner are read by keyset
+        # (see `TransferListView`)
+        indexes = [
+            models.Index(
+                fields=['price_currency', 'owner', 'created_date'],
+                condition=models.Q(price_amount__isnull=False),
+                name='comment_transfer_owner_idx',
+            ),
+            models.Index(
+                fields=['post', 'price_currency', 'created_date'],
+                condition=models.Q(price_amount__isnull=False),
+                name='comment_transfer_post_idx',
+            ),
+        ]
+
     def __str__(self):
         return self.content[:20]
@@ -14,5 +14,20 @@ class Post(CreatedModified):
     price_currency = models.ForeignKey('currencies.Currency', blank=True, null=True, on_delete=models.SET_NULL)
     mentioned_users = models.ManyToManyField('users.User', related_name='mentioned_in_posts', blank=True)
 
+    class Meta:
+        # Transfers (posts with a price) sent and received by a user are read by keyset (see `TransferListView`)
+        indexes = [
+            models.Index(
+                fields=['price_currency', 'owner', 'created_date'],
+                condition=models.Q(price_amount__isnull=False),
+                name='post_transfer_owner_idx',
+            ),
+            models.Index(
+                fields=['price_currency', 'recipient', 'created_date'],
+                condition=models.Q(price_amount__isnull=False),
+                name='post_transfer_recipient_idx',
+            ),
+        ]
+
     def __str__(self):
         return self.content[:50]
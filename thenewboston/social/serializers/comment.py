@@ -4,7 +4,7 @@ from rest_framework import serializers
 from thenewboston.currencies.serializers.currency import CurrencyTinySerializer
 from thenewboston.general.utils.transfers import transfer_coins
 from thenewboston.users.serializers.user import UserReadSerializer
-from thenewboston.wallets.models import Wallet
+from thenewboston.wallets.models import Wallet, WalletLedgerReason
 
 from ..models import Comment
 from ..utils.mentions import sync_mentioned_users
@@ -89,16 +89,22 @@ class CommentWriteSerializer(serializers.ModelSerializer):
         price_currency = validated_data.get('price_currency')
 
         if price_amount is not None and price_currency is not None:
-            commenter_wallet = Wallet.objects.select_for_update().get(owner=request.user, currency=price_currency)
+            commenter_wallet = Wallet.objects.get(owner=request.user, currency=price_currency)
 
             if commenter_wallet.balance < price_amount:
                 raise serializers.ValidationError('Insufficient funds')
 
-            poster_wallet, _ = Wallet.objects.select_for_update().get_or_create(
+            poster_wallet, _ = Wallet.objects.get_or_create(
                 owner=post.owner, currency=price_currency, defaults={'balance': 0}
             )
 
-            transfer_coins(sender_wallet=commenter_wallet, recipient_wallet=poster_wallet, amount=price_amount)
+            transfer_coins(
+                sender_wallet=commenter_wallet,
+                recipient_wallet=poster_wallet,
+                amount=price_amount,
+                reason=WalletLedgerReason.TIP,
+                reference=post,
+            )
 
         comment = super().create({**validated_data, 'owner': request.user})
         mention_ids = raw_mentioned_user_ids if mentions_provided else None
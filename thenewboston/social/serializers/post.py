@@ -10,7 +10,7 @@ from thenewboston.general.utils.text import truncate_text
 from thenewboston.general.utils.transfers import transfer_coins
 from thenewboston.notifications.models import Notification
 from thenewboston.users.serializers.user import UserReadSerializer
-from thenewboston.wallets.models import Wallet
+from thenewboston.wallets.models import Wallet, WalletLedgerReason
 
 from ..models import Post, PostLike
 from ..serializers.comment import CommentReadSerializer
@@ -129,16 +129,21 @@ class PostWriteSerializer(serializers.ModelSerializer):
             validated_data['image'] = file
 
         if price_amount is not None and price_currency is not None and recipient is not None:
-            sender_wallet = Wallet.objects.select_for_update().get(owner=request.user, currency=price_currency)
+            sender_wallet = Wallet.objects.get(owner=request.user, currency=price_currency)
 
             if sender_wallet.balance < price_amount:
                 raise serializers.ValidationError('Insufficient funds')
 
-            recipient_wallet, _ = Wallet.objects.select_for_update().get_or_create(
+            recipient_wallet, _ = Wallet.objects.get_or_create(
                 owner=recipient, currency=price_currency, defaults={'balance': 0}
             )
 
-            transfer_coins(sender_wallet=sender_wallet, recipient_wallet=recipient_wallet, amount=price_amount)
+            transfer_coins(
+                sender_wallet=sender_wallet,
+                recipient_wallet=recipient_wallet,
+                amount=price_amount,
+                reason=WalletLedgerReason.TIP,
+            )
 
         post = super().create({**validated_data, 'owner': request.user})
         mention_ids = raw_mentioned_user_ids if mentions_provided else None
@@ -1,7 +1,9 @@
 from django.contrib import admin
 
-from .models import Block, Wallet, Wire
+from .models import Block, Wallet, WalletBalanceSnapshot, WalletLedgerEntry, Wire
 
 admin.site.register(Block)
 admin.site.register(Wallet)
+admin.site.register(WalletBalanceSnapshot)
+admin.site.register(WalletLedgerEntry)
 admin.site.register(Wire)
@@ -2,6 +2,8 @@ from asgiref.sync import async_to_sync
 from channels.generic.websocket import JsonWebsocketConsumer
 from channels.layers import get_channel_layer
 
+from thenewboston.general.utils.stream_buffer import send_group_event
+
 
 class WalletConsumer(JsonWebsocketConsumer):
     def connect(self):
@@ -28,13 +30,12 @@ class WalletConsumer(JsonWebsocketConsumer):
         Send wallet details to the group associated with the wallet owner.
         message_type indicates the type of the action and wallet_data contains the wallet details.
         """
-        channel_layer = get_channel_layer()
         wallet_owner_id = wallet_data['owner']
         wallet_event = {
             'payload': wallet_data,
             'type': message_type.value,
         }
-        async_to_sync(channel_layer.group_send)(cls.get_group_name(wallet_owner_id), wallet_event)
+        send_group_event(cls.get_group_name(wallet_owner_id), wallet_event)
 
     def update_wallet(self, event):
         """
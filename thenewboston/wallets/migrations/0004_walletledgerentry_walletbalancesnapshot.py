@@ -0,0 +1,79 @@
+# Generated by Django 5.2.1 on 2026-10-18 15:00
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('wallets', '0003_alter_wallet_created_date_alter_wallet_modified_date'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WalletLedgerEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('delta', models.BigIntegerField()),
+                (
+                    'reason',
+                    models.CharField(
+                        choices=[
+                            ('ADJUSTMENT', 'Adjustment'),
+                            ('DEPOSIT', 'Deposit'),
+                            ('ESCROW', 'Escrow'),
+                            ('MINT', 'Mint'),
+                            ('ORDER', 'Order'),
+                            ('TIP', 'Tip'),
+                            ('TRADE', 'Trade'),
+                            ('TRANSFER', 'Transfer'),
+                            ('WITHDRAW', 'Withdraw'),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ('reference', models.CharField(blank=True, default='', max_length=64)),
+                ('created_date', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                (
+                    'wallet',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='ledger_entries',
+                        to='wallets.wallet',
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name_plural': 'wallet ledger entries',
+                'indexes': [models.Index(fields=['wallet', 'created_date'], name='wallet_ledger_wallet_created')],
+            },
+        ),
+        migrations.CreateModel(
+            name='WalletBalanceSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('balance', models.PositiveBigIntegerField()),
+                ('as_of', models.DateTimeField()),
+                (
+                    'wallet',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='balance_snapshots',
+                        to='wallets.wallet',
+                    ),
+                ),
+            ],
+            options={
+                'constraints': [
+                    models.UniqueConstraint(fields=('wallet', 'as_of'), name='unique_wallet_balance_snapshot')
+                ],
+            },
+        ),
+        # Balances of the existing wallets become the opening snapshots, the ledger starts from them
+        migrations.RunSQL(
+            'INSERT INTO wallets_walletbalancesnapshot (wallet_id, balance, as_of) '
+            'SELECT id, balance, now() FROM wallets_wallet',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
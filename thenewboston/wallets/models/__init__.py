@@ -1,3 +1,4 @@
 from .block import Block  # noqa: F401
 from .wallet import Wallet  # noqa: F401
+from .wallet_ledger import WalletBalanceSnapshot, WalletLedgerEntry, WalletLedgerReason  # noqa: F401
 from .wire import Wire  # noqa: F401
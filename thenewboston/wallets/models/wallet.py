@@ -1,5 +1,6 @@
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import connections, models
+from django.utils import timezone
 from model_utils import FieldTracker
 
 from thenewboston.general.constants import ACCOUNT_NUMBER_LENGTH, SIGNING_KEY_LENGTH
@@ -7,17 +8,54 @@ from thenewboston.general.enums import MessageType
 from thenewboston.general.managers import CustomManager, CustomQuerySet
 from thenewboston.general.models.created_modified import AdjustableTimestampsModel
 from thenewboston.general.utils.cryptography import generate_key_pair
-from thenewboston.general.utils.database import apply_on_commit
+from thenewboston.general.utils.stream_buffer import stream_on_commit
 from thenewboston.general.validators import HexStringValidator
 
+from .wallet_ledger import WalletLedgerEntry, WalletLedgerReason, make_ledger_reference
+
+# Balances are changed with a single statement without reading wallets (and locking them) beforehand. The condition
+# guarantees the balance does not become negative even under concurrent updates, because PostgreSQL rechecks it
+# against the latest row version (`balance` database CHECK constraint is the last line of defense). Ledger entries
+# are written by the same statement. Like any `UPDATE` it locks the updated wallet rows until the end of the
+# transaction, so callers change balances as late in their transactions as possible to keep the locks short
+CHANGE_BALANCES_SQL = """
+WITH updated AS (
+    UPDATE wallets_wallet AS wallet
+    SET balance = wallet.balance + deltas.delta, modified_date = %(modified_date)s
+    FROM unnest(%(owner_ids)s::bigint[], %(currency_ids)s::bigint[], %(deltas)s::bigint[])
+        AS deltas(owner_id, currency_id, delta)
+    WHERE wallet.owner_id = deltas.owner_id
+      AND wallet.currency_id = deltas.currency_id
+      AND wallet.balance + deltas.delta >= 0
+    RETURNING wallet.owner_id, wallet.currency_id, wallet.id, wallet.balance, deltas.delta
+), entries AS (
+    INSERT INTO wallets_walletledgerentry (wallet_id, delta, reason, reference, created_date)
+    SELECT id, delta, %(reason)s, %(reference)s, %(modified_date)s FROM updated WHERE delta != 0
+)
+SELECT owner_id, currency_id, id, balance FROM updated
+"""
+
 
 class WalletQuerySet(CustomQuerySet):
-    def get_or_create(self, defaults=None, _for_update=False, **kwargs):
+    def get_or_create(
+        self,
+        defaults=None,
+        _for_update=False,
+        ledger_reason=WalletLedgerReason.ADJUSTMENT,
+        ledger_reference=None,
+        **kwargs,
+    ):
         # TODO(dmu) MEDIUM: Consider overriding create() as well
         defaults = defaults.copy() if defaults else {}
+        # The initial balance is added after the wallet is created, so it is recorded in the ledger with the reason
+        balance = defaults.pop('balance', 0)
 
         # Check if currency is provided to determine if we need deposit keys
         currency = kwargs.get('currency') or defaults.get('currency')
+        if currency is None and (currency_id := kwargs.get('currency_id') or defaults.get('currency_id')):
+            from thenewboston.currencies.currency_cache import currency_cache
+
+            currency = currency_cache.get_by_id(currency_id)
 
         if currency and currency.domain:
             # External currency - generate deposit keys if not provided
@@ -40,7 +78,42 @@ class WalletQuerySet(CustomQuerySet):
         if _for_update:
             qs = qs.select_for_update()
 
-        return super(WalletQuerySet, qs).get_or_create(defaults=defaults, **kwargs)
+        wallet, is_created = super(WalletQuerySet, qs).get_or_create(defaults=defaults, **kwargs)
+        if is_created and balance:
+            key = (wallet.owner_id, wallet.currency_id)
+            _, wallet.balance = self.change_balances(
+                {key: balance}, modified_date=wallet.modified_date, reason=ledger_reason, reference=ledger_reference
+            )[key]
+            wallet.tracker.set_saved_fields(fields=('balance',))
+
+        return wallet, is_created
+
+    def change_balances(
+        self, deltas, modified_date=None, reason=WalletLedgerReason.ADJUSTMENT, reference=None
+    ) -> dict[tuple[int, int], tuple[int, int]]:
+        """
+        Add `{(owner_id, currency_id): amount_delta}` to wallet balances and record them in the ledger with a single
+        statement. Return `{(owner_id, currency_id): (wallet_id, new_balance)}` for the updated wallets: wallets that
+        do not exist or do not have enough balance are not updated (so the caller decides whether to create them
+        or to fail). The updated wallets stay locked until the end of the transaction.
+        """
+        if not deltas:
+            return {}
+
+        owner_ids, currency_ids, amount_deltas = zip(*((*key, delta) for key, delta in deltas.items()))
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(
+                CHANGE_BALANCES_SQL,
+                {
+                    'modified_date': modified_date or timezone.now(),
+                    'owner_ids': list(owner_ids),
+                    'currency_ids': list(currency_ids),
+                    'deltas': list(amount_deltas),
+                    'reason': reason,
+                    'reference': make_ledger_reference(reference),
+                },
+            )
+            return {(owner_id, currency_id): (id_, balance) for owner_id, currency_id, id_, balance in cursor}
 
 
 class WalletManager(CustomManager.from_queryset(WalletQuerySet)):  # type: ignore
@@ -48,7 +121,7 @@ class WalletManager(CustomManager.from_queryset(WalletQuerySet)):  # type: ignor
 
 
 class Wallet(AdjustableTimestampsModel):
-    # TODO(dmu) HIGH: Make sure balance update always uses select from update
+    # Balance must be changed atomically with `.change_balance()` or `Wallet.objects.change_balances()`
     owner = models.ForeignKey('users.User', on_delete=models.CASCADE)
     currency = models.ForeignKey('currencies.Currency', on_delete=models.CASCADE)
     balance = models.PositiveBigIntegerField(default=0)
@@ -74,22 +147,64 @@ class Wallet(AdjustableTimestampsModel):
             f'Balance: {self.balance}'
         )
 
-    def change_balance(self, amount_delta, save=True, should_stream=True, should_adjust_timestamps=True):
-        if (new_balance := self.balance + amount_delta) < 0:
-            # this error message should be vague to be compatible with general context
+    def change_balance(
+        self,
+        amount_delta,
+        save=True,
+        should_stream=True,
+        should_adjust_timestamps=True,
+        reason=WalletLedgerReason.ADJUSTMENT,
+        reference=None,
+    ):
+        """
+        Change the balance atomically in the database (the wallet does not need to be selected for update) and
+        refresh `balance` and `modified_date` from it. Other changed fields are not saved. With `save=False` (or for
+        a new wallet) the balance is changed in memory only. `reason` and `reference` (a model instance or a string)
+        are recorded in the ledger.
+        """
+        if not save or self.is_adding():
+            if (new_balance := self.balance + amount_delta) < 0:
+                # this error message should be vague to be compatible with general context
+                raise ValidationError('Not enough wallet balance')
+            self.balance = new_balance
+            if save:
+                self.save(
+                    should_stream=should_stream,
+                    should_adjust_timestamps=should_adjust_timestamps,
+                    ledger_reason=reason,
+                    ledger_reference=reference,
+                )
+            return
+
+        original_modified_date = self.modified_date
+        if not self.has_changed('modified_date'):  # allow explicit modified_date
+            self.modified_date = timezone.now()
+
+        if should_adjust_timestamps:
+            self._adjust_timestamps(was_adding=False, had_changes=True)
+
+        key = (self.owner_id, self.currency_id)
+        result = Wallet.objects.change_balances(
+            {key: amount_delta}, modified_date=self.modified_date, reason=reason, reference=reference
+        )
+        if not result:
+            self.modified_date = original_modified_date
             raise ValidationError('Not enough wallet balance')
-        self.balance = new_balance
-        if save:
-            self.save(should_stream=should_stream, should_adjust_timestamps=should_adjust_timestamps)
+
+        _, self.balance = result[key]
+        self.tracker.set_saved_fields(fields=('balance', 'modified_date'))
+        if should_stream:
+            self.stream()
 
     def stream(self):
         from ..consumers import WalletConsumer
         from ..serializers.wallet import WalletReadSerializer
 
-        apply_on_commit(
+        stream_on_commit(
             lambda wallet=self: WalletConsumer.stream_wallet(
                 message_type=MessageType.UPDATE_WALLET, wallet_data=WalletReadSerializer(wallet).data
-            )
+            ),
+            dedupe_key=('wallet', self.pk),  # only the latest wallet state is streamed
         )
 
     def _adjust_timestamps(self, was_adding, had_changes):
@@ -98,10 +213,29 @@ class Wallet(AdjustableTimestampsModel):
 
         return super()._adjust_timestamps(was_adding, had_changes)  # return for forward compatibility
 
-    def save(self, *args, should_stream=False, should_adjust_timestamps=True, **kwargs):
+    def save(
+        self,
+        *args,
+        should_stream=False,
+        should_adjust_timestamps=True,
+        ledger_reason=WalletLedgerReason.ADJUSTMENT,
+        ledger_reference=None,
+        **kwargs,
+    ):
         has_balance_changed = self.has_changed('balance')
+        balance_delta = self.balance - (self.tracker.previous('balance') or 0)
         rv = super().save(*args, should_adjust_timestamps=should_adjust_timestamps, **kwargs)
 
+        if has_balance_changed and balance_delta:
+            # Balance changed in memory (not with `.change_balance()`) is recorded in the ledger on save
+            WalletLedgerEntry.objects.create(
+                wallet=self,
+                delta=balance_delta,
+                reason=ledger_reason,
+                reference=make_ledger_reference(ledger_reference),
+                created_date=self.modified_date,
+            )
+
         if has_balance_changed and should_stream:
             # TODO(dmu) HIGH: Rely on this code everywhere, remove `should_stream` argument and related code
             #                 Maybe we should stream in case of changes of other fields as well?
@@ -0,0 +1,110 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+# Snapshots roll up the entries created since the previous snapshot of the wallet (they are taken for the wallets
+# that have such entries only, so the last snapshot of any wallet is never older than the latest snapshot overall)
+TAKE_SNAPSHOTS_SQL = """
+WITH latest_snapshots AS (
+    SELECT DISTINCT ON (wallet_id) wallet_id, balance, as_of
+    FROM wallets_walletbalancesnapshot
+    ORDER BY wallet_id, as_of DESC
+)
+INSERT INTO wallets_walletbalancesnapshot (wallet_id, balance, as_of)
+SELECT entry.wallet_id, COALESCE(latest_snapshots.balance, 0) + SUM(entry.delta), %(as_of)s
+FROM wallets_walletledgerentry AS entry
+LEFT JOIN latest_snapshots ON latest_snapshots.wallet_id = entry.wallet_id
+WHERE entry.created_date > COALESCE((SELECT max(as_of) FROM wallets_walletbalancesnapshot), '-infinity')
+  AND entry.created_date > COALESCE(latest_snapshots.as_of, '-infinity')
+  AND entry.created_date <= %(as_of)s
+GROUP BY entry.wallet_id, latest_snapshots.balance
+"""
+
+
+class WalletLedgerReason(models.TextChoices):
+    ADJUSTMENT = 'ADJUSTMENT', _('Adjustment')
+    DEPOSIT = 'DEPOSIT', _('Deposit')
+    ESCROW = 'ESCROW', _('Escrow')
+    MINT = 'MINT', _('Mint')
+    ORDER = 'ORDER', _('Order')
+    TIP = 'TIP', _('Tip')
+    TRADE = 'TRADE', _('Trade')
+    TRANSFER = 'TRANSFER', _('Transfer')
+    WITHDRAW = 'WITHDRAW', _('Withdraw')
+
+
+def make_ledger_reference(reference) -> str:
+    if reference is None:
+        return ''
+
+    if isinstance(reference, models.Model):
+        return f'{reference._meta.label_lower}:{reference.pk}'
+
+    return reference
+
+
+class WalletLedgerEntry(models.Model):
+    """
+    Append-only journal of wallet balance changes. Entries are written by `Wallet.change_balance()` and
+    `Wallet.objects.change_balances()` within the same statement that changes the balance.
+    """
+
+    wallet = models.ForeignKey('wallets.Wallet', on_delete=models.CASCADE, related_name='ledger_entries')
+    delta = models.BigIntegerField()
+    reason = models.CharField(max_length=10, choices=WalletLedgerReason.choices)
+    reference = models.CharField(max_length=64, blank=True, default='')  # for instance, `exchange.exchangeorder:1`
+    created_date = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        indexes = [models.Index(fields=('wallet', 'created_date'), name='wallet_ledger_wallet_created')]
+        verbose_name_plural = 'wallet ledger entries'
+
+    def __str__(self):
+        return f'Wallet ledger entry ID: {self.pk} | Wallet ID: {self.wallet_id} | {self.reason}: {self.delta:+}'
+
+
+class WalletBalanceSnapshotQuerySet(models.QuerySet):
+    def take(self, as_of=None) -> int:
+        """
+        Snapshot balances of the wallets changed since their previous snapshots. Entries are created (and get
+        `created_date`) before they are committed, so the snapshot time lags behind to include all the entries
+        that may become visible later.
+        """
+        if as_of is None:
+            as_of = timezone.now() - timedelta(seconds=settings.WALLET_BALANCE_SNAPSHOT_LAG_SECONDS)
+
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(TAKE_SNAPSHOTS_SQL, {'as_of': as_of})
+            return cursor.rowcount
+
+    def get_balance(self, wallet_id, as_of) -> int:
+        """
+        Reconstruct the wallet balance as of the given time from the latest snapshot taken before it and the entries
+        created since then. Balances are known since the wallet creation or the opening snapshot (taken when the
+        ledger was introduced) whichever is later.
+        """
+        snapshot = self.filter(wallet_id=wallet_id, as_of__lte=as_of).order_by('-as_of').first()
+        entries = WalletLedgerEntry.objects.using(self.db).filter(wallet_id=wallet_id, created_date__lte=as_of)
+        if snapshot:
+            entries = entries.filter(created_date__gt=snapshot.as_of)
+
+        delta = entries.aggregate(delta=models.Sum('delta'))['delta'] or 0
+        return (snapshot.balance if snapshot else 0) + delta
+
+
+class WalletBalanceSnapshot(models.Model):
+    # Balance including all the ledger entries of the wallet created until (and including) `as_of`
+    wallet = models.ForeignKey('wallets.Wallet', on_delete=models.CASCADE, related_name='balance_snapshots')
+    balance = models.PositiveBigIntegerField()
+    as_of = models.DateTimeField()
+
+    objects = WalletBalanceSnapshotQuerySet.as_manager()
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=('wallet', 'as_of'), name='unique_wallet_balance_snapshot')]
+
+    def __str__(self):
+        return f'Wallet balance snapshot | Wallet ID: {self.wallet_id} | As of: {self.as_of} | {self.balance}'
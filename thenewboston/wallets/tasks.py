@@ -0,0 +1,15 @@
+from thenewboston.project.celery import app
+
+
+@app.task(name='tasks.take_wallet_balance_snapshots')
+def take_wallet_balance_snapshots_task():
+    from .models import WalletBalanceSnapshot
+
+    WalletBalanceSnapshot.objects.take()
+
+
+@app.task(name='tasks.refresh_deposit_balances')
+def refresh_deposit_balances_task():
+    from .utils.deposit_balances import refresh_deposit_balances
+
+    refresh_deposit_balances()
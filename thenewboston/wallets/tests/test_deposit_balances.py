@@ -0,0 +1,31 @@
+from unittest.mock import patch
+
+from thenewboston.wallets.utils.deposit_balances import refresh_deposit_balances
+
+
+def test_refresh_deposit_balances(bucky_tnb_wallet, dmitry_tnb_wallet, bucky_yyy_wallet):
+    bucky_tnb_wallet.deposit_account_number = 'a' * 64
+    bucky_tnb_wallet.save()
+    dmitry_tnb_wallet.deposit_account_number = 'b' * 64
+    dmitry_tnb_wallet.deposit_balance = 5
+    dmitry_tnb_wallet.save()
+    domain = bucky_tnb_wallet.currency.domain
+
+    with (
+        patch(
+            'thenewboston.wallets.utils.deposit_balances.fetch_balances', return_value={'a' * 64: 10, 'b' * 64: 5}
+        ) as fetch_balances_mock,
+        patch('thenewboston.wallets.consumers.wallet.WalletConsumer.stream_wallet') as stream_wallet_mock,
+    ):
+        assert refresh_deposit_balances(batch_size=1) == 1
+
+    # Wallets without deposit accounts are not refreshed, batches are fetched separately
+    assert [call.kwargs for call in fetch_balances_mock.call_args_list] == [
+        {'account_numbers': ['a' * 64], 'domain': domain},
+        {'account_numbers': ['b' * 64], 'domain': domain},
+    ]
+    bucky_tnb_wallet.refresh_from_db()
+    assert bucky_tnb_wallet.deposit_balance == 10
+    assert bucky_tnb_wallet.balance == 1000  # not overwritten
+    stream_wallet_mock.assert_called_once()
+    assert stream_wallet_mock.call_args.kwargs['wallet_data']['deposit_balance'] == 10
@@ -1,6 +1,11 @@
+from unittest.mock import patch
+
 import pytest
+import requests
 from model_bakery import baker
 
+from thenewboston.wallets.models import WalletLedgerEntry, WalletLedgerReason, Wire
+
 
 @pytest.mark.django_db
 def test_read_wallets_as_bucky(api_client_bucky):
@@ -88,3 +93,92 @@ def test_read_wallets_pagination_respects_page_size(api_client_bucky, bucky):
     assert page_1_data['count'] == 15
     assert len(page_1_data['results']) == 12
     assert len(page_2_data['results']) == 3
+
+
+@pytest.mark.django_db
+def test_read_transfers_with_keyset_pagination(api_client_bucky, bucky, dmitry, tnb_currency):
+    post_received = baker.make(
+        'social.Post', owner=dmitry, recipient=bucky, price_amount=10, price_currency=tnb_currency, content='a'
+    )
+    post_sent = baker.make(
+        'social.Post', owner=bucky, recipient=dmitry, price_amount=20, price_currency=tnb_currency, content='b'
+    )
+    comment_sent = baker.make(
+        'social.Comment', owner=bucky, post=post_received, price_amount=30, price_currency=tnb_currency, content='c'
+    )
+    comment_received = baker.make(
+        'social.Comment', owner=dmitry, post=post_sent, price_amount=40, price_currency=tnb_currency, content='d'
+    )
+    baker.make('social.Post', owner=bucky, content='no price')
+
+    url = f'/api/transfers?currency={tnb_currency.id}&page_size=3'
+    response = api_client_bucky.get(url)
+    assert response.status_code == 200
+    data = response.json()
+    assert [(item['post_id'], item['comment_id'], item['amount']) for item in data['results']] == [
+        (post_sent.id, comment_received.id, 40),
+        (post_received.id, comment_sent.id, -30),
+        (post_sent.id, None, -20),
+    ]
+    assert data['results'][0]['counterparty']['username'] == 'dmitry'
+
+    response = api_client_bucky.get(data['next'])
+    assert response.status_code == 200
+    data = response.json()
+    assert [(item['post_id'], item['comment_id'], item['amount']) for item in data['results']] == [
+        (post_received.id, None, 10)
+    ]
+    assert data['next'] is None
+
+    response = api_client_bucky.get(f'{url}&cursor=invalid')
+    assert response.status_code == 400
+
+
+def get_withdraw_ledger(wallet):
+    return list(
+        WalletLedgerEntry.objects.filter(wallet=wallet, reason=WalletLedgerReason.WITHDRAW)
+        .order_by('id')
+        .values_list('delta', 'reference')
+    )
+
+
+@pytest.mark.parametrize(
+    'wire_funds_kwargs, expected_status_code',
+    (
+        ({'side_effect': requests.ConnectionError}, 502),
+        ({'return_value': {'error': 'Insufficient balance'}}, 400),  # rejected by the network
+    ),
+)
+def test_withdraw_is_refunded_if_wire_fails(
+    api_client_bucky, bucky_tnb_wallet, wire_funds_kwargs, expected_status_code
+):
+    with patch('thenewboston.wallets.views.wallet.wire_funds', **wire_funds_kwargs) as wire_funds_mock:
+        response = api_client_bucky.post(
+            f'/api/wallets/{bucky_tnb_wallet.id}/withdraw', {'account_number': 'a' * 64, 'amount': 100}
+        )
+
+    assert response.status_code == expected_status_code
+    # The amount is debited before wiring (so concurrent withdrawals cannot spend it twice) and refunded
+    block_id = wire_funds_mock.call_args.kwargs['block_id']
+    assert get_withdraw_ledger(bucky_tnb_wallet) == [
+        (-100, f'wallets.wire:{block_id}'),
+        (100, f'wallets.wire:{block_id}'),
+    ]
+    bucky_tnb_wallet.refresh_from_db()
+    assert bucky_tnb_wallet.balance == 1_000
+    assert not Wire.objects.exists()
+
+
+def test_withdraw_is_not_refunded_if_wire_outcome_is_unknown(api_client_bucky, bucky_tnb_wallet):
+    with patch('thenewboston.wallets.views.wallet.wire_funds', side_effect=requests.ReadTimeout) as wire_funds_mock:
+        response = api_client_bucky.post(
+            f'/api/wallets/{bucky_tnb_wallet.id}/withdraw', {'account_number': 'a' * 64, 'amount': 100}
+        )
+
+    # The block may have been accepted, so the withdrawal is left to be reconciled by the block ID
+    assert response.status_code == 502
+    block_id = wire_funds_mock.call_args.kwargs['block_id']
+    assert response.json()['block_id'] == str(block_id)
+    assert get_withdraw_ledger(bucky_tnb_wallet) == [(-100, f'wallets.wire:{block_id}')]
+    bucky_tnb_wallet.refresh_from_db()
+    assert bucky_tnb_wallet.balance == 900
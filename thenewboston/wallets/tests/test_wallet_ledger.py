@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from thenewboston.wallets.models import Wallet, WalletBalanceSnapshot, WalletLedgerEntry, WalletLedgerReason
+
+
+def get_entries(wallet):
+    return list(wallet.ledger_entries.order_by('id').values_list('delta', 'reason', 'reference'))
+
+
+def test_change_balance_is_recorded_in_ledger(bucky_tnb_wallet, bucky_yyy_wallet):
+    bucky_tnb_wallet.change_balance(-100, should_stream=False, reason=WalletLedgerReason.TIP, reference='social.post:1')
+    Wallet.objects.change_balances(
+        {
+            (bucky_tnb_wallet.owner_id, bucky_tnb_wallet.currency_id): 10,
+            (bucky_yyy_wallet.owner_id, bucky_yyy_wallet.currency_id): -2000,  # not enough balance
+        },
+        reason=WalletLedgerReason.TRADE,
+    )
+
+    assert get_entries(bucky_tnb_wallet) == [
+        (1000, WalletLedgerReason.ADJUSTMENT, ''),  # the initial balance of the fixture
+        (-100, WalletLedgerReason.TIP, 'social.post:1'),
+        (10, WalletLedgerReason.TRADE, ''),
+    ]
+    assert get_entries(bucky_yyy_wallet) == [(1000, WalletLedgerReason.ADJUSTMENT, '')]
+
+
+def test_initial_balance_is_recorded_in_ledger(bucky, tnb_currency):
+    wallet, is_created = Wallet.objects.get_or_create(
+        owner=bucky, currency=tnb_currency, defaults={'balance': 50}, ledger_reason=WalletLedgerReason.MINT
+    )
+
+    assert is_created
+    assert wallet.balance == 50
+    wallet.refresh_from_db()
+    assert wallet.balance == 50
+    assert get_entries(wallet) == [(50, WalletLedgerReason.MINT, '')]
+
+
+def test_balance_is_reconstructed_from_snapshots(bucky_tnb_wallet):
+    start = timezone.now()
+    WalletLedgerEntry.objects.filter(wallet=bucky_tnb_wallet).update(created_date=start - timedelta(hours=2))
+    for hours, delta in ((1, -300), (0, 50)):
+        WalletLedgerEntry.objects.create(
+            wallet=bucky_tnb_wallet,
+            delta=delta,
+            reason=WalletLedgerReason.ADJUSTMENT,
+            created_date=start - timedelta(hours=hours, minutes=-1),
+        )
+
+    assert WalletBalanceSnapshot.objects.take(as_of=start - timedelta(minutes=30)) == 1
+    assert WalletBalanceSnapshot.objects.take(as_of=start - timedelta(minutes=20)) == 0  # no changes since then
+    assert WalletBalanceSnapshot.objects.get().balance == 1000 - 300
+
+    get_balance = WalletBalanceSnapshot.objects.get_balance
+    assert get_balance(bucky_tnb_wallet.id, start - timedelta(hours=3)) == 0
+    assert get_balance(bucky_tnb_wallet.id, start - timedelta(minutes=90)) == 1000
+    assert get_balance(bucky_tnb_wallet.id, start - timedelta(minutes=10)) == 1000 - 300
+    assert get_balance(bucky_tnb_wallet.id, start + timedelta(minutes=10)) == 1000 - 300 + 50
+
+    assert WalletBalanceSnapshot.objects.take(as_of=start + timedelta(minutes=10)) == 1
+    assert get_balance(bucky_tnb_wallet.id, start + timedelta(minutes=10)) == 1000 - 300 + 50
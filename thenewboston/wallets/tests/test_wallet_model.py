@@ -5,6 +5,7 @@ from django.core.exceptions import ValidationError
 
 from thenewboston.general.enums import MessageType
 from thenewboston.general.utils.datetime import to_iso_format
+from thenewboston.wallets.models import Wallet
 
 
 def test_wallet_change_balance(bucky_tnb_wallet):
@@ -160,3 +161,32 @@ def test_wallet_change_balance_validation(bucky_tnb_wallet):
     assert bucky_tnb_wallet.balance == 1000
     bucky_tnb_wallet.refresh_from_db()
     assert bucky_tnb_wallet.balance == 1000  # persistence assertion
+
+
+def test_wallet_change_balance_is_atomic(bucky_tnb_wallet):
+    stale_wallet = Wallet.objects.get(id=bucky_tnb_wallet.id)
+    bucky_tnb_wallet.change_balance(-600, should_stream=False)
+
+    # The balance is changed by delta in the database, so the stale in-memory balance does not matter
+    with pytest.raises(ValidationError, match='Not enough wallet balance'):
+        stale_wallet.change_balance(-600, should_stream=False)
+
+    stale_wallet.change_balance(100, should_stream=False)
+    assert stale_wallet.balance == 1000 - 600 + 100
+    bucky_tnb_wallet.refresh_from_db()
+    assert bucky_tnb_wallet.balance == 1000 - 600 + 100  # persistence assertion
+
+
+def test_wallet_change_balances(bucky_tnb_wallet, bucky_yyy_wallet):
+    tnb_key = (bucky_tnb_wallet.owner_id, bucky_tnb_wallet.currency_id)
+    yyy_key = (bucky_yyy_wallet.owner_id, bucky_yyy_wallet.currency_id)
+
+    assert Wallet.objects.change_balances({tnb_key: -100, yyy_key: 50, (bucky_tnb_wallet.owner_id, 0): 1}) == {
+        tnb_key: (bucky_tnb_wallet.id, 1000 - 100),
+        yyy_key: (bucky_yyy_wallet.id, 1000 + 50),
+    }
+
+    # Wallets that would go negative are not updated
+    assert Wallet.objects.change_balances({tnb_key: -1000, yyy_key: 1}) == {yyy_key: (bucky_yyy_wallet.id, 1000 + 51)}
+    bucky_tnb_wallet.refresh_from_db()
+    assert bucky_tnb_wallet.balance == 1000 - 100
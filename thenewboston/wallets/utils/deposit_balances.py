@@ -0,0 +1,98 @@
+"""
+Deposit balances of external currency wallets are refreshed in the background (see `refresh_deposit_balances` task),
+so API requests read the stored values instead of waiting for the external networks.
+"""
+
+import logging
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from thenewboston.api.accounts import fetch_balances
+from thenewboston.general.outbox import batch_outbox_events
+
+from ..models import Wallet
+
+REFRESH_LOCK_NAME = 'refresh_deposit_balances'  # runs must not overlap if refreshing takes longer than the interval
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def try_refresh_lock():
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_try_advisory_lock(hashtext(%s))', [REFRESH_LOCK_NAME])
+        is_locked = cursor.fetchone()[0]
+
+    try:
+        yield is_locked
+    finally:
+        if is_locked:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_unlock(hashtext(%s))', [REFRESH_LOCK_NAME])
+
+
+def refresh_deposit_balances_batch(wallets) -> list[Wallet]:
+    wallets_by_domain = defaultdict(list)
+    for wallet in wallets:
+        wallets_by_domain[wallet.currency.domain].append(wallet)
+
+    # Network requests are made outside of a transaction
+    changed_wallets = []
+    for domain, domain_wallets in wallets_by_domain.items():
+        account_numbers = [wallet.deposit_account_number for wallet in domain_wallets]
+        balances = fetch_balances(account_numbers=account_numbers, domain=domain)
+        for wallet in domain_wallets:
+            balance = balances.get(wallet.deposit_account_number)
+            if balance is not None and balance != wallet.deposit_balance:
+                wallet.deposit_balance = balance
+                changed_wallets.append(wallet)
+
+    if not changed_wallets:
+        return changed_wallets
+
+    modified_date = timezone.now()
+    with transaction.atomic(), batch_outbox_events():
+        for wallet in changed_wallets:
+            wallet.modified_date = modified_date
+
+        # Only the deposit balance is updated, so concurrent balance changes are not overwritten
+        Wallet.objects.bulk_update(changed_wallets, ('deposit_balance', 'modified_date'))
+        for wallet in changed_wallets:
+            wallet.tracker.set_saved_fields(fields=('deposit_balance', 'modified_date'))
+            wallet.stream()
+
+    return changed_wallets
+
+
+def refresh_deposit_balances(batch_size=None) -> int | None:
+    """
+    Fetch deposit balances of all external currency wallets from the networks (concurrently, in batches of
+    `batch_size` wallets) and update the changed ones. Return the number of updated wallets or `None` if
+    another refresh is running.
+    """
+    if batch_size is None:
+        batch_size = settings.DEPOSIT_BALANCE_REFRESH_BATCH_SIZE
+
+    with try_refresh_lock() as is_locked:
+        if not is_locked:
+            logger.info('Deposit balances are being refreshed by another process')
+            return None
+
+        queryset = (
+            Wallet.objects.filter(currency__domain__isnull=False, deposit_account_number__isnull=False)
+            .exclude(currency__domain='')
+            .select_related('currency')
+            .order_by('id')
+        )
+        updated_count = 0
+        last_id = 0
+        while wallets := list(queryset.filter(id__gt=last_id)[:batch_size]):
+            last_id = wallets[-1].id
+            updated_count += len(refresh_deposit_balances_batch(wallets))
+
+    logger.info('Refreshed deposit balances, %s wallet(s) updated', updated_count)
+    return updated_count
@@ -3,4 +3,4 @@ from thenewboston.wallets.models.wallet import Wallet
 
 
 def get_default_wallet(user):
-    return Wallet.objects.filter(owner=user, currency=get_default_currency()).first()
+    return Wallet.objects.filter(owner=user, currency_id=get_default_currency().id).first()
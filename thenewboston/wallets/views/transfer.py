@@ -1,18 +1,135 @@
-from django.db.models import Q
+import base64
+import binascii
+
+from django.db.models import BigIntegerField, CharField, ExpressionWrapper, F, Q, Value
+from django.db.models.functions import Cast
+from django.utils.dateparse import parse_datetime
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.views import APIView
 
-from thenewboston.general.pagination import CustomPageNumberPagination
+from thenewboston.general.constants import DEFAULT_PAGE_SIZE
 from thenewboston.social.models import Comment, Post
+from thenewboston.users.models import User
 
 from ..serializers.transfer import TransferSerializer
 
+MAX_PAGE_SIZE = 100
+COMMENT = 'comment'
+POST = 'post'
+TRANSFER_FIELDS = (
+    'transfer_timestamp',
+    'transfer_kind',
+    'transfer_id',
+    'transfer_post_id',
+    'transfer_comment_id',
+    'transfer_amount',
+    'transfer_content',
+    'transfer_counterparty_id',
+)
+
+
+def encode_cursor(timestamp, kind, id_):
+    return base64.urlsafe_b64encode(f'{timestamp.isoformat()}|{kind}|{id_}'.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        timestamp, kind, id_ = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        timestamp = parse_datetime(timestamp)
+        id_ = int(id_)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+    if timestamp is None or kind not in (COMMENT, POST):
+        return None
+
+    return timestamp, kind, id_
+
+
+def make_keyset_filter(kind, cursor):
+    # `(created_date, kind, id) < cursor`, the kind is constant within a queryset, so the filter is expanded for
+    # the `created_date` index to be used
+    if cursor is None:
+        return Q()
+
+    timestamp, cursor_kind, cursor_id = cursor
+    if kind < cursor_kind:
+        return Q(created_date__lte=timestamp)
+    if kind > cursor_kind:
+        return Q(created_date__lt=timestamp)
+
+    return Q(created_date__lt=timestamp) | Q(created_date=timestamp, id__lt=cursor_id)
+
+
+def annotate_transfers(queryset, *, kind, post_id, comment_id, is_sent, counterparty_id):
+    amount = F('price_amount')
+    return queryset.annotate(
+        transfer_timestamp=F('created_date'),
+        transfer_kind=Value(kind, output_field=CharField()),
+        transfer_id=F('id'),
+        transfer_post_id=post_id,
+        transfer_comment_id=comment_id,
+        transfer_amount=ExpressionWrapper(-amount if is_sent else amount, output_field=BigIntegerField()),
+        transfer_content=F('content'),
+        transfer_counterparty_id=counterparty_id,
+    ).values(*TRANSFER_FIELDS)
+
+
+def get_transfers(user, currency_id, cursor, limit):
+    """
+    Return transfers (posts and comments with a price sent or received by the user) older than the cursor ordered
+    by `(timestamp, kind, id)` descending. Every part of `UNION ALL` is limited and read by index, so the cost
+    of the query does not depend on the length of the history.
+    """
+    # Typed `NULL`, otherwise PostgreSQL resolves an untyped one to `text` in `UNION ALL` with bigint IDs
+    null_id = Cast(Value(None), BigIntegerField())
+    common_filter = Q(price_amount__isnull=False, price_currency_id=currency_id)
+    post_filter = common_filter & make_keyset_filter(POST, cursor)
+    comment_filter = common_filter & make_keyset_filter(COMMENT, cursor)
+    querysets = (
+        annotate_transfers(
+            Post.objects.filter(post_filter, owner=user),
+            kind=POST,
+            post_id=F('id'),
+            comment_id=null_id,
+            is_sent=True,
+            counterparty_id=F('recipient_id'),
+        ),
+        annotate_transfers(
+            Post.objects.filter(post_filter, recipient=user).exclude(owner=user),
+            kind=POST,
+            post_id=F('id'),
+            comment_id=null_id,
+            is_sent=False,
+            counterparty_id=F('owner_id'),
+        ),
+        annotate_transfers(
+            Comment.objects.filter(comment_filter, owner=user),
+            kind=COMMENT,
+            post_id=F('post_id'),
+            comment_id=F('id'),
+            is_sent=True,
+            counterparty_id=F('post__owner_id'),
+        ),
+        annotate_transfers(
+            Comment.objects.filter(comment_filter, post__owner=user).exclude(owner=user),
+            kind=COMMENT,
+            post_id=F('post_id'),
+            comment_id=F('id'),
+            is_sent=False,
+            counterparty_id=F('owner_id'),
+        ),
+    )
+    ordering = ('-transfer_timestamp', '-transfer_kind', '-transfer_id')
+    first, *others = (queryset.order_by(*ordering)[:limit] for queryset in querysets)
+    return list(first.union(*others, all=True).order_by(*ordering)[:limit])
+
 
 class TransferListView(APIView):
     permission_classes = [IsAuthenticated]
-    pagination_class = CustomPageNumberPagination
 
     def get(self, request):
         user = request.user
@@ -21,76 +138,45 @@ class TransferListView(APIView):
         if not currency_id:
             return Response({'error': 'currency parameter is required'}, status=status.HTTP_400_BAD_REQUEST)
 
-        transfers = []
-
-        # Get posts where user sent or received funds
-        posts = (
-            Post.objects.filter(
-                Q(owner=user) | Q(recipient=user), price_amount__isnull=False, price_currency_id=currency_id
-            )
-            .select_related('owner', 'recipient', 'price_currency')
-            .order_by('-created_date')
-        )
-
-        for post in posts:
-            is_sent = post.owner == user
-            transfer = {
-                'post_id': post.id,
-                'comment_id': None,
-                'amount': -post.price_amount if is_sent else post.price_amount,
-                'currency': post.price_currency_id,
-                'timestamp': post.created_date,
-                'content': post.content,
-                'counterparty': post.recipient if is_sent else post.owner,
-            }
-            transfers.append(transfer)
-
-        # Get comments where user sent funds
-        comments = (
-            Comment.objects.filter(owner=user, price_amount__isnull=False, price_currency_id=currency_id)
-            .select_related('owner', 'post__owner', 'price_currency')
-            .order_by('-created_date')
-        )
-
-        for comment in comments:
-            transfer = {
-                'post_id': comment.post_id,
-                'comment_id': comment.id,
-                'amount': -comment.price_amount,  # Negative for sent
-                'currency': comment.price_currency_id,
-                'timestamp': comment.created_date,
-                'content': comment.content,
-                'counterparty': comment.post.owner,
+        if not currency_id.isdigit():
+            return Response({'error': 'Invalid currency'}, status=status.HTTP_400_BAD_REQUEST)
+
+        cursor = None
+        if cursor_param := request.query_params.get('cursor'):
+            if (cursor := decode_cursor(cursor_param)) is None:
+                return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            page_size = int(request.query_params.get('page_size', DEFAULT_PAGE_SIZE))
+        except ValueError:
+            page_size = DEFAULT_PAGE_SIZE
+
+        page_size = min(max(page_size, 1), MAX_PAGE_SIZE)
+
+        rows = get_transfers(user, currency_id, cursor, page_size + 1)
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        counterparties = User.objects.in_bulk({row['transfer_counterparty_id'] for row in rows} - {None})
+        transfers = [
+            {
+                'post_id': row['transfer_post_id'],
+                'comment_id': row['transfer_comment_id'],
+                'amount': row['transfer_amount'],
+                'currency': int(currency_id),
+                'timestamp': row['transfer_timestamp'],
+                'content': row['transfer_content'],
+                'counterparty': counterparties.get(row['transfer_counterparty_id']),
             }
-            transfers.append(transfer)
-
-        # Get comments where user received funds (as post owner)
-        received_comments = (
-            Comment.objects.filter(post__owner=user, price_amount__isnull=False, price_currency_id=currency_id)
-            .exclude(owner=user)
-            .select_related('owner', 'price_currency')
-            .order_by('-created_date')
-        )
-
-        for comment in received_comments:
-            transfer = {
-                'post_id': comment.post_id,
-                'comment_id': comment.id,
-                'amount': comment.price_amount,  # Positive for received
-                'currency': comment.price_currency_id,
-                'timestamp': comment.created_date,
-                'content': comment.content,
-                'counterparty': comment.owner,
-            }
-            transfers.append(transfer)
-
-        transfers.sort(key=lambda x: x['timestamp'], reverse=True)
-        paginator = self.pagination_class()
-        page = paginator.paginate_queryset(transfers, request, view=self)
-
-        if page is not None:
-            serializer = TransferSerializer(page, many=True, context={'request': request})
-            return paginator.get_paginated_response(serializer.data)
+            for row in rows
+        ]
+
+        next_url = None
+        if has_next:
+            last_row = rows[-1]
+            next_cursor = encode_cursor(
+                last_row['transfer_timestamp'], last_row['transfer_kind'], last_row['transfer_id']
+            )
+            next_url = replace_query_param(request.build_absolute_uri(), 'cursor', next_cursor)
 
         serializer = TransferSerializer(transfers, many=True, context={'request': request})
-        return Response(serializer.data)
+        return Response({'next': next_url, 'results': serializer.data})
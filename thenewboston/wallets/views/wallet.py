@@ -1,4 +1,10 @@
+import logging
+import uuid
+
+import requests
 from django.conf import settings
+from django.db import transaction
+from django.utils.decorators import method_decorator
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
@@ -11,7 +17,7 @@ from thenewboston.general.pagination import CustomPageNumberPagination
 from thenewboston.general.permissions import IsObjectOwnerOrReadOnly
 
 from ..filters.wallet import WalletFilter
-from ..models import Wallet, Wire
+from ..models import Wallet, WalletLedgerReason, Wire
 from ..models.wire import WireType
 from ..serializers.block import BlockSerializer
 from ..serializers.wallet import WalletReadSerializer, WalletWriteSerializer
@@ -19,7 +25,19 @@ from ..serializers.wire import WireSerializer
 from ..serializers.withdraw import WithdrawSerializer
 from ..utils.wallet import get_default_wallet
 
+logger = logging.getLogger(__name__)
+
+
+def save_deposit_balance(wallet, deposit_balance):
+    wallet.deposit_balance = deposit_balance
+    with transaction.atomic():
+        # Only the deposit balance is saved, so concurrent balance changes are not overwritten
+        wallet.save(update_fields=('deposit_balance', 'modified_date'))
+
 
+# Requests to external currency networks are made outside of transactions, so their latency does not keep database
+# transactions open (actions that change the database start transactions explicitly)
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
 class WalletViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
     filter_backends = [DjangoFilterBackend]
     filterset_class = WalletFilter
@@ -27,6 +45,7 @@ class WalletViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, mixins.L
     permission_classes = [IsAuthenticated, IsObjectOwnerOrReadOnly]
     queryset = Wallet.objects.none()
 
+    @transaction.atomic
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data, context={'request': request})
         serializer.is_valid(raise_exception=True)
@@ -54,14 +73,16 @@ class WalletViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, mixins.L
         block_serializer = BlockSerializer(data=block)
 
         if block_serializer.is_valid(raise_exception=True):
-            wire = Wire.objects.create(
-                **block_serializer.validated_data,
-                currency=wallet.currency,
-                owner=wallet.owner,
-                wire_type=WireType.DEPOSIT,
-            )
-            wallet.balance += wire.amount
-            wallet.save()
+            with transaction.atomic():
+                wire = Wire.objects.create(
+                    **block_serializer.validated_data,
+                    currency=wallet.currency,
+                    owner=wallet.owner,
+                    wire_type=WireType.DEPOSIT,
+                )
+                wallet.change_balance(
+                    wire.amount, should_stream=False, reason=WalletLedgerReason.DEPOSIT, reference=wire
+                )
         else:
             return Response({'error': 'Invalid block'}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -70,8 +91,7 @@ class WalletViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, mixins.L
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        wallet.deposit_balance = deposit_balance
-        wallet.save()
+        save_deposit_balance(wallet, deposit_balance)
 
         response_data = {
             'wallet': WalletReadSerializer(wallet, context={'request': request}).data,
@@ -82,15 +102,8 @@ class WalletViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, mixins.L
 
     @action(detail=True, methods=['get'], url_path='deposit-balance')
     def deposit_balance(self, request, pk=None):
+        # The deposit balance is refreshed in the background (see `refresh_deposit_balances` task)
         wallet = self.get_object()
-
-        try:
-            deposit_balance = fetch_balance(account_number=wallet.deposit_account_number, domain=wallet.currency.domain)
-        except Exception as e:
-            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
-
-        wallet.deposit_balance = deposit_balance
-        wallet.save()
         read_serializer = WalletReadSerializer(wallet, context={'request': request})
 
         return Response(read_serializer.data, status=status.HTTP_200_OK)
@@ -125,25 +138,57 @@ class WalletViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, mixins.L
         account_number = serializer.validated_data['account_number']
         amount = serializer.validated_data['amount']
 
-        block = wire_funds(
-            amount=amount - TRANSACTION_FEE,
-            domain=wallet.currency.domain,
-            recipient_account_number_str=account_number,
-            sender_signing_key_str=settings.SIGNING_KEY,
-        )
+        # The amount is debited in its own transaction before wiring, so concurrent withdrawals cannot spend the same
+        # balance twice (the debit fails if there is not enough balance anymore). It is refunded only if the block
+        # was not accepted for sure
+        block_id = uuid.uuid4()
+        # The wire is created with the block ID once the block is accepted
+        ledger_reference = f'{Wire._meta.label_lower}:{block_id}'
+        with transaction.atomic():
+            wallet.change_balance(
+                -amount, should_stream=False, reason=WalletLedgerReason.WITHDRAW, reference=ledger_reference
+            )
+
+        def refund():
+            with transaction.atomic():
+                wallet.change_balance(
+                    amount, should_stream=False, reason=WalletLedgerReason.WITHDRAW, reference=ledger_reference
+                )
+
+        try:
+            block = wire_funds(
+                amount=amount - TRANSACTION_FEE,
+                domain=wallet.currency.domain,
+                recipient_account_number_str=account_number,
+                sender_signing_key_str=settings.SIGNING_KEY,
+                block_id=block_id,
+            )
+        except requests.ConnectionError:
+            refund()
+            return Response({'error': 'Could not connect to the network.'}, status=status.HTTP_502_BAD_GATEWAY)
+        except Exception:
+            # A timeout or a server error does not mean the block was not accepted by the network, so the amount
+            # stays debited until the withdrawal is reconciled by the block ID
+            # TODO(dmu) HIGH: Reconcile such withdrawals automatically by checking the block by its ID
+            logger.exception('Unknown outcome of withdrawal block %s from wallet %s', block_id, wallet.id)
+            return Response(
+                {'error': 'Could not confirm the withdrawal.', 'block_id': str(block_id)},
+                status=status.HTTP_502_BAD_GATEWAY,
+            )
+
         block_serializer = BlockSerializer(data=block)
+        if not block_serializer.is_valid():
+            # The network responded without an error status, but not with an accepted block, so it rejected the block
+            refund()
+            return Response({'error': 'Withdrawal was rejected by the network.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        if block_serializer.is_valid(raise_exception=True):
+        with transaction.atomic():
             wire = Wire.objects.create(
                 **block_serializer.validated_data,
                 currency=wallet.currency,
                 owner=wallet.owner,
                 wire_type=WireType.WITHDRAW,
             )
-            wallet.balance -= amount
-            wallet.save()
-        else:
-            return Response({'error': 'Invalid block'}, status=status.HTTP_400_BAD_REQUEST)
 
         response_data = {
             'wallet': WalletReadSerializer(wallet, context={'request': request}).data,